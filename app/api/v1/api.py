@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Request
-from app.api.v1.endpoints import status, review, chat
+from app.api.v1.endpoints import status, review, chat, workers, usage, metrics, traces
 from app.models.api_schema import ReviewRequest, ReviewResponse
 
 api_router = APIRouter()
 
 # Register the individual routers
 api_router.include_router(status.router, prefix="/v1", tags=["App Status"])
+api_router.include_router(workers.router, prefix="/v1", tags=["App Status"])
+api_router.include_router(usage.router, prefix="/v1", tags=["App Status"])
+api_router.include_router(metrics.router, prefix="/v1", tags=["App Status"])
+api_router.include_router(traces.router, prefix="/v1", tags=["App Status"])
 api_router.include_router(review.router, prefix="/v1/review", tags=["Architecture Design Review"])
 api_router.include_router(chat.router, prefix="/v1/chat", tags=["Follow-up Chat"])
 
@@ -7,7 +7,7 @@ from fastapi.responses import StreamingResponse
 from app.common.exception_handlers import ReviewSessionNotFoundException
 from app.models.api_schema import ChatMessageRequest, ChatRequest
 from app.services.chat_service import ChatService
-from app.services.review_store import get_review
+from app.services.review_store import aget_review
 from app.common.constants import STREAM_HEADERS
 
 router = APIRouter()
@@ -24,7 +24,7 @@ async def chat_followup(request: ChatRequest) -> StreamingResponse:
     The messages list should contain the full conversation history,
     with the last entry being the user's current question.
     """
-    session = get_review(request.correlation_id)
+    session = await aget_review(request.correlation_id)
     if session is None:
         raise ReviewSessionNotFoundException(request.correlation_id)
 
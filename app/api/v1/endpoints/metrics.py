@@ -0,0 +1,14 @@
+"""
+Metrics endpoint — the review pipeline's Prometheus metrics (see
+app/common/metrics.py) in the text exposition format, for scraping.
+"""
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=Response)
+async def metrics():
+    """Sessions, crew workers, queue depths, review and task latencies, LLM tokens, extraction and SQLite timings."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -9,13 +9,15 @@ from typing import Annotated, Literal, Optional
 
 from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
 from fastapi.params import Header
-from fastapi.responses import StreamingResponse
 
 from app.models.api_schema import ReviewRequest, ReviewResponse
 from app.services.document_extractor import ExtractionError
+from app.services.reviewer.reviewer_budget import ReviewEstimate
 from app.services.reviewer.reviewer_facade import ReviewerFacade
-from app.common.constants import STREAM_HEADERS
+from app.common.constants import REVIEW_ESTIMATE_HEADER, STREAM_HEADERS
 from app.common.exception_handlers import MissingInputException, DocumentExtractionException
+from app.common.streaming import ClosingStreamingResponse
+from app.common.tracing import review_tracer
 
 router = APIRouter()
 
@@ -38,6 +40,18 @@ def _resolve_correlation_id(x_correlation_id: Optional[str]) -> str:
     return x_correlation_id or str(uuid.uuid4())
 
 
+def _use_cache(x_skip_cache: Optional[bool]) -> bool:
+    """``X-Skip-Cache: true`` forces a fresh crew run instead of replaying a cached report."""
+    return not x_skip_cache
+
+
+def _stream_headers(estimate: Optional[ReviewEstimate]) -> dict:
+    """NDJSON headers, plus ``X-Review-Estimate`` when the pre-flight budget is enabled."""
+    if estimate is None:
+        return STREAM_HEADERS
+    return {**STREAM_HEADERS, REVIEW_ESTIMATE_HEADER: estimate.header_value()}
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -47,18 +61,23 @@ async def review_design_document(
     facade: ReviewerFacadeDep,
     data: ReviewRequest,
     x_correlation_id: Optional[str] = Header(None),
+    x_skip_cache: Optional[bool] = Header(None),
 ):
     """Submit a design document as JSON text for review."""
     request = ReviewRequest(
         design_doc=data.design_doc,
         correlation_id=_resolve_correlation_id(x_correlation_id),
         output_format=data.output_format,
+        previous_correlation_id=data.previous_correlation_id,
     )
-    
-    return StreamingResponse(
-        facade.start_review(request),
+    use_cache = _use_cache(x_skip_cache)
+    estimate = await facade.preflight(request, use_cache=use_cache)
+    events = await facade.start_review(request, use_cache=use_cache, estimate=estimate)
+
+    return ClosingStreamingResponse(
+        events,
         media_type="application/x-ndjson",
-        headers=STREAM_HEADERS,
+        headers=_stream_headers(estimate),
     )
 
 @router.post("/upload", response_model=ReviewResponse)
@@ -67,26 +86,37 @@ async def review_design_document_upload(
     file: Annotated[Optional[UploadFile], File()] = None,
     design_doc: Annotated[Optional[str], Form()] = None,
     output_format: Annotated[Literal["markdown", "plain", "json"], Form()] = "markdown",
+    previous_correlation_id: Annotated[Optional[str], Form()] = None,
     x_correlation_id: Optional[str] = Header(None),
+    x_skip_cache: Optional[bool] = Header(None),
 ):
     """Submit a design document as a file upload (multipart/form-data) for review.
 
     Supported file types: .txt, .md, .json, .pdf, .doc, .docx (max 5MB).
-    Optionally combine with inline text via the design_doc field.
+    Optionally combine with inline text via the design_doc field, and pass
+    previous_correlation_id for an incremental re-review.
     """
     if file is None and not design_doc:
         raise MissingInputException()
 
+    correlation_id = _resolve_correlation_id(x_correlation_id)
     try:
-        return StreamingResponse(
-            facade.review_upload(
+        with review_tracer.span("review_upload", correlation_id, filename=getattr(file, "filename", None) or ""):
+            request = await facade.prepare_upload(
                 file=file,
                 design_doc=design_doc,
                 output_format=output_format,
-                correlation_id=_resolve_correlation_id(x_correlation_id),
-            ),
-            media_type="application/x-ndjson",
-            headers=STREAM_HEADERS,
-        )
+                correlation_id=correlation_id,
+                previous_correlation_id=previous_correlation_id,
+            )
     except ExtractionError as exc:
         raise DocumentExtractionException(str(exc), exc.status_code) from exc
+    use_cache = _use_cache(x_skip_cache)
+    estimate = await facade.preflight(request, use_cache=use_cache)
+    events = await facade.start_review(request, use_cache=use_cache, estimate=estimate)
+
+    return ClosingStreamingResponse(
+        events,
+        media_type="application/x-ndjson",
+        headers=_stream_headers(estimate),
+    )
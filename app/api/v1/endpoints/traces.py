@@ -0,0 +1,20 @@
+"""
+Trace endpoint — the timeline of one review: timed spans of the upload,
+pre-flight estimate, queueing, crew job, each task, persistence and every
+chunk streamed to the client.
+"""
+from fastapi import APIRouter
+
+from app.common.exception_handlers import ReviewTraceNotFoundException
+from app.common.tracing import review_tracer
+
+router = APIRouter()
+
+
+@router.get("/traces/{correlation_id}")
+async def review_timeline(correlation_id: str):
+    """Finished spans of one recent review in start order, with offsets and durations in milliseconds."""
+    timeline = review_tracer.timeline(correlation_id)
+    if timeline is None:
+        raise ReviewTraceNotFoundException(correlation_id)
+    return timeline
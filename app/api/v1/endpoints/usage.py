@@ -0,0 +1,29 @@
+"""
+Usage endpoints — per-task token usage, LLM calls, retries, wall time and
+cost of review runs, aggregated by day, model and agent, or listed for one
+review.
+"""
+import time
+
+from fastapi import APIRouter, Query
+
+from app.common.exception_handlers import ReviewSessionNotFoundException
+from app.services.review_store import aget_task_usage, aget_usage_summary
+
+router = APIRouter()
+
+
+@router.get("/usage")
+async def usage_summary(days: int = Query(7, ge=1, le=365, description="Look-back window in days")):
+    """Token, call, retry, wall-time and cost totals of the last *days* days, per UTC day, per model and per agent."""
+    since = time.time() - days * 86400
+    return {"days": days, **await aget_usage_summary(since)}
+
+
+@router.get("/usage/{correlation_id}")
+async def review_usage(correlation_id: str):
+    """Per-task usage of one review run, in completion order."""
+    tasks = await aget_task_usage(correlation_id)
+    if not tasks:
+        raise ReviewSessionNotFoundException(correlation_id)
+    return {"correlation_id": correlation_id, "tasks": tasks}
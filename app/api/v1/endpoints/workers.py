@@ -0,0 +1,22 @@
+"""
+Worker pool endpoint — occupancy and queue statistics for the crew workers.
+"""
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Request
+
+from app.common.crew_pool import CrewWorkerPool
+
+router = APIRouter()
+
+
+def _get_crew_pool(request: Request) -> CrewWorkerPool:
+    return request.app.state.crew_pool
+
+CrewWorkerPoolDep = Annotated[CrewWorkerPool, Depends(_get_crew_pool)]
+
+
+@router.get("/workers")
+async def worker_pool_stats(pool: CrewWorkerPoolDep):
+    """Pool size, active and queued reviews, and queue wait-time percentiles."""
+    return pool.stats()
@@ -0,0 +1,153 @@
+"""
+Cooperative cancellation for crew jobs.
+
+A CancelToken is created per job and carried on a ContextVar into the
+kickoff thread (and, via ContextPropagatingTask, into concurrent task
+threads). Once cancelled:
+
+- a job still waiting in the worker pool never calls ``crew.kickoff()``;
+- tasks that have not started raise JobCancelledException instead of running;
+- the ``before_llm_call`` hook blocks any further LLM call of a running agent.
+
+An LLM request already on the wire cannot be interrupted from another
+thread; its response is discarded when the job unwinds.
+
+Feature-agnostic — used by the crew runner and the reviewer service alike.
+"""
+import threading
+from contextvars import ContextVar, Token
+from typing import Any, Optional
+
+from app.common.exception_handlers import JobCancelledException
+from app.common.logger import logger
+
+# Rough chars-per-token ratio for estimating prompts that were never sent.
+_CHARS_PER_TOKEN = 4
+
+
+class CancelToken:
+    """Thread-safe, one-way cancellation flag for a single job."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self.reason: Optional[str] = None
+        self.tasks_started = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "client disconnected") -> bool:
+        """Request cancellation. Returns False if the token was already cancelled."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+        return True
+
+    def task_started(self) -> None:
+        with self._lock:
+            self.tasks_started += 1
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelledException(self.reason or "cancelled")
+
+
+cancel_token_var: ContextVar[Optional[CancelToken]] = ContextVar("cancel_token", default=None)
+
+
+def get_cancel_token() -> Optional[CancelToken]:
+    """Return the cancel token of the job running in the current execution context."""
+    return cancel_token_var.get()
+
+
+def set_cancel_token(cancel_token: Optional[CancelToken]) -> Token:
+    """Set the cancel token for the current execution context. Returns a token for reset."""
+    return cancel_token_var.set(cancel_token)
+
+
+def reset_cancel_token(token: Token) -> None:
+    """Reset the cancel token to its previous value using the token from set_cancel_token."""
+    cancel_token_var.reset(token)
+
+
+class CancellationStats:
+    """
+    Process-wide counters of work avoided by cancellation.
+
+    Tokens saved are an estimate: every skipped task is valued at the mean
+    token usage per task of the runs that completed, and every blocked LLM
+    call at the size of the prompt it would have sent.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled_jobs = 0
+        self._skipped_tasks = 0
+        self._blocked_llm_calls = 0
+        self._blocked_prompt_tokens = 0
+        self._observed_tokens = 0
+        self._observed_tasks = 0
+
+    def record_run(self, total_tokens: int, tasks: int) -> None:
+        """Feed a completed run's token usage into the per-task estimate."""
+        if total_tokens <= 0 or tasks <= 0:
+            return
+        with self._lock:
+            self._observed_tokens += total_tokens
+            self._observed_tasks += tasks
+
+    def record_cancelled(self, skipped_tasks: int) -> None:
+        with self._lock:
+            self._cancelled_jobs += 1
+            self._skipped_tasks += max(0, skipped_tasks)
+
+    def record_blocked_call(self, prompt_tokens: int) -> None:
+        with self._lock:
+            self._blocked_llm_calls += 1
+            self._blocked_prompt_tokens += prompt_tokens
+
+    def stats(self) -> dict:
+        with self._lock:
+            per_task = self._observed_tokens / self._observed_tasks if self._observed_tasks else 0.0
+            return {
+                "cancelled_jobs": self._cancelled_jobs,
+                "skipped_tasks": self._skipped_tasks,
+                "blocked_llm_calls": self._blocked_llm_calls,
+                "avg_tokens_per_task": round(per_task, 1),
+                "estimated_tokens_saved": int(self._skipped_tasks * per_task) + self._blocked_prompt_tokens,
+            }
+
+
+cancellation_stats = CancellationStats()
+
+
+def block_cancelled_llm_calls(context: Any) -> Optional[bool]:
+    """CrewAI ``before_llm_call`` hook — refuse LLM calls for cancelled jobs.
+
+    Registered globally once at startup; jobs without a token are unaffected.
+    """
+    cancel_token = get_cancel_token()
+    if cancel_token is None or not cancel_token.cancelled:
+        return None
+    prompt_chars = sum(
+        len(str(message.get("content") or "") if isinstance(message, dict) else str(message))
+        for message in context.messages
+    )
+    cancellation_stats.record_blocked_call(prompt_chars // _CHARS_PER_TOKEN)
+    logger.info("[Cancellation] Blocked LLM call for cancelled job")
+    return False
+
+
+__all__ = [
+    "CancelToken",
+    "CancellationStats",
+    "block_cancelled_llm_calls",
+    "cancellation_stats",
+    "get_cancel_token",
+    "reset_cancel_token",
+    "set_cancel_token",
+]
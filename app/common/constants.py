@@ -10,6 +10,9 @@ STREAM_HEADERS: dict = {
     "X-Accel-Buffering": "no",
 }
 
+# Response header carrying a review's pre-flight token and cost estimate
+REVIEW_ESTIMATE_HEADER = "X-Review-Estimate"
+
 # Keywords that strongly suggest a system/software design document.
 # Used by DesignReviewerCrew to validate submitted documents.
 DESIGN_KEYWORDS: FrozenSet[str] = frozenset({
@@ -22,4 +25,4 @@ DESIGN_KEYWORDS: FrozenSet[str] = frozenset({
     "load balanc", "cdn", "latency", "throughput", "availability", "reliability",
 })
 
-__all__ = ["STREAM_HEADERS", "DESIGN_KEYWORDS"]
+__all__ = ["STREAM_HEADERS", "REVIEW_ESTIMATE_HEADER", "DESIGN_KEYWORDS"]
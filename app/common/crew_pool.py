@@ -0,0 +1,171 @@
+"""
+Bounded worker pool for CrewAI jobs.
+
+A fixed number of worker threads pull jobs from a bounded pending queue,
+capping how many ``crew.kickoff()`` runs execute at once. When every worker
+is busy, jobs wait in FIFO order and are told their queue position; when
+the queue is also full, ``submit`` raises CrewPoolFullException so the
+caller can answer 429 instead of piling up more LLM work.
+
+Feature-agnostic — jobs are plain callables.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Optional
+
+from app.common.exception_handlers import CrewPoolFullException
+from app.common.logger import logger
+from app.common.util import percentile
+
+_WAIT_SAMPLE_SIZE = 1000
+
+
+@dataclass
+class _PendingJob:
+    target: Callable[[], None]
+    on_position: Optional[Callable[[int], None]]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    position: int = 0
+
+
+class CrewWorkerPool:
+    """
+    Fixed-size thread pool with a bounded FIFO of pending jobs.
+
+    Args:
+        max_workers:          Number of jobs allowed to run concurrently.
+        max_queue_depth:      Jobs allowed to wait once all workers are busy.
+        retry_after_seconds:  Hint returned to rejected clients (Retry-After).
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int, retry_after_seconds: int = 30) -> None:
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max(0, max_queue_depth)
+        self.retry_after_seconds = retry_after_seconds
+
+        self._cond = threading.Condition()
+        self._pending: Deque[_PendingJob] = deque()
+        self._idle = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_samples: Deque[float] = deque(maxlen=_WAIT_SAMPLE_SIZE)
+
+        for index in range(self.max_workers):
+            threading.Thread(target=self._worker, name=f"CrewWorker-{index}", daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _waiting(self) -> int:
+        """Jobs that will not be picked up by an idle worker right away."""
+        return max(0, len(self._pending) - self._idle)
+
+    def _has_capacity_locked(self) -> bool:
+        return self._idle > len(self._pending) or self._waiting() < self.max_queue_depth
+
+    def has_capacity(self) -> bool:
+        """Return True if a job submitted now would be run or queued, not rejected."""
+        with self._cond:
+            return self._has_capacity_locked()
+
+    def submit(self, target: Callable[[], None], on_position: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Queue *target* for execution.
+
+        Args:
+            target:       Zero-argument callable run on a worker thread.
+            on_position:  Optional ``(position) -> None`` called with the job's
+                          1-based queue position while it waits, and whenever
+                          that position changes.
+
+        Returns:
+            The job's queue position — 0 if a worker picks it up immediately.
+
+        Raises:
+            CrewPoolFullException: every worker is busy and the queue is full.
+        """
+        with self._cond:
+            if not self._has_capacity_locked():
+                self._rejected += 1
+                logger.warning(
+                    "[CrewWorkerPool] Rejecting job: %d active, %d queued",
+                    self._active, self._waiting(),
+                )
+                raise CrewPoolFullException(self.retry_after_seconds)
+
+            job = _PendingJob(target, on_position)
+            self._pending.append(job)
+            self._submitted += 1
+            position = job.position = self._waiting()
+            self._cond.notify()
+
+        if position and on_position is not None:
+            on_position(position)
+        return position
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                self._idle += 1
+                while not self._pending:
+                    self._cond.wait()
+                self._idle -= 1
+                job = self._pending.popleft()
+                self._active += 1
+                self._wait_samples.append(time.monotonic() - job.enqueued_at)
+                moved = []
+                for index, waiting in enumerate(list(self._pending)[self._idle:], start=1):
+                    if waiting.position != index:
+                        waiting.position = index
+                        moved.append(waiting)
+
+            for waiting in moved:
+                if waiting.on_position is not None:
+                    waiting.on_position(waiting.position)
+
+            try:
+                job.target()
+            except Exception as exc:
+                logger.error("[CrewWorkerPool] Job raised: %s", exc)
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._completed += 1
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Snapshot of pool size, occupancy, queue depth and wait-time percentiles."""
+        with self._cond:
+            waits_ms = [w * 1000 for w in self._wait_samples]
+            return {
+                "workers": self.max_workers,
+                "active": self._active,
+                "idle": self._idle,
+                "queue_depth": self._waiting(),
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_time_ms": {
+                    "p50": round(percentile(waits_ms, 50), 1),
+                    "p95": round(percentile(waits_ms, 95), 1),
+                    "p99": round(percentile(waits_ms, 99), 1),
+                    "max": round(max(waits_ms, default=0.0), 1),
+                    "samples": len(waits_ms),
+                },
+            }
+
+
+__all__ = ["CrewWorkerPool"]
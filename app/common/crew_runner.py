@@ -1,50 +1,176 @@
 """
 Generic CrewAI job runner.
 
-Runs a crew.kickoff() in a daemon thread, dispatches events via the
-EventDispatcher, and signals stream completion via a poison pill.
+Runs a crew.kickoff() on a CrewWorkerPool worker (or a dedicated daemon
+thread when no pool is given), dispatches events via the EventDispatcher,
+and signals stream completion by closing the dispatcher session (a poison
+pill to every subscribed StreamBridge). An optional CancelToken stops the
+job cooperatively once nobody is listening any more. The crew is either
+given built or leased from a WarmCrewPool for the duration of the run.
+Tasks whose output is already known from an earlier run can be handed in
+as reused outputs; they complete without calling their agent. A job can
+also run a task with a different description (prompt) than its YAML one.
 
 Feature-specific logic (persistence, completion message) is injected
 via callbacks so this module stays feature-agnostic.
 """
-from queue import Queue
+import contextvars
+import time
+from concurrent.futures import Future
 from threading import Thread
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional, Union
 from datetime import datetime, timezone
 
+from crewai import Task, TaskOutput
+from crewai.events import TaskCompletedEvent, crewai_event_bus
+from pydantic import ValidationError
+
+from app.common.cancellation import CancelToken, cancellation_stats, get_cancel_token, reset_cancel_token, set_cancel_token
+from app.common.crew_pool import CrewWorkerPool
 from app.common.event_dispatcher import EventDispatcher
+from app.common.exception_handlers import JobCancelledException
 from app.common.logger import logger
+from app.common.metrics import REVIEW_DURATION
 from app.common.request_context import get_correlation_id, set_correlation_id, reset_correlation_id
+from app.common.tracing import review_tracer
+from app.common.warm_crew_pool import WarmCrewPool
+
+
+# A stored ``{"raw": str, "output": dict}``, or a callable deciding when the
+# task is about to run — given the task, it returns a stored output or None.
+ReusedOutput = Union[dict, Callable[[Task], Optional[dict]]]
+
+# Per-job task changes (by task name) of the job running in this context.
+_reused_outputs: contextvars.ContextVar[Optional[Dict[str, ReusedOutput]]] = contextvars.ContextVar(
+    "reused_outputs", default=None,
+)
+_task_descriptions: contextvars.ContextVar[Optional[Dict[str, str]]] = contextvars.ContextVar(
+    "task_descriptions", default=None,
+)
 
 
 def _ts() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+class ContextPropagatingTask(Task):
+    """
+    CrewAI Task whose ``async_execution`` thread inherits the caller's ContextVars.
+
+    ``Task.execute_async`` starts a bare Thread, so the correlation ID set by
+    run_crew_in_thread is lost in tasks that run concurrently. Running the
+    thread target inside a copy of the kickoff thread's context keeps logs
+    and dispatched events tied to the right review, whatever order the
+    parallel tasks finish in.
+
+    Both entry points also honour the job's CancelToken: a task of a
+    cancelled job raises JobCancelledException instead of starting. A task
+    the job was given a reused output for completes with that output, and
+    emits TaskCompletedEvent as usual, without running its agent. A task the
+    job was given a description for runs with it in place of its YAML one;
+    the next kickoff interpolates the original description again.
+    """
+
+    @staticmethod
+    def _check_cancelled() -> None:
+        cancel_token = get_cancel_token()
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+            cancel_token.task_started()
+
+    def _reuse_output(self, agent: Any) -> Optional[TaskOutput]:
+        """Complete with the job's reused output for this task, if it has a usable one."""
+        stored = (_reused_outputs.get() or {}).get(self.name)
+        if callable(stored):
+            stored = stored(self)
+        if stored is None:
+            return None
+        try:
+            pydantic_output = self.output_pydantic.model_validate(stored["output"]) if self.output_pydantic else None
+        except ValidationError as exc:
+            logger.warning("[ContextPropagatingTask] Stored %s output no longer validates; running it: %s", self.name, exc)
+            return None
+        self.agent = agent or self.agent
+        self.output = TaskOutput(
+            name=self.name,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=stored["raw"],
+            pydantic=pydantic_output,
+            agent=self.agent.role,
+            output_format=self._get_output_format(),
+        )
+        logger.info("TASK_REUSED | task=%s", self.name)
+        # Handled before the crew moves on, so the result precedes the next task's events.
+        future = crewai_event_bus.emit(self, TaskCompletedEvent(output=self.output, task=self))
+        if future is not None:
+            future.result()
+        return self.output
+
+    def _apply_description(self) -> None:
+        description = (_task_descriptions.get() or {}).get(self.name)
+        if description is not None:
+            self.description = description
+
+    def execute_sync(self, agent: Any = None, context: Optional[str] = None, tools: Optional[list] = None) -> Any:
+        self._check_cancelled()
+        reused = self._reuse_output(agent)
+        if reused is not None:
+            return reused
+        self._apply_description()
+        return super().execute_sync(agent, context, tools)
+
+    def execute_async(self, agent: Any = None, context: Optional[str] = None, tools: Optional[list] = None) -> Future:
+        self._check_cancelled()
+        future: Future = Future()
+        reused = self._reuse_output(agent)
+        if reused is not None:
+            future.set_result(reused)
+            return future
+        self._apply_description()
+        ctx = contextvars.copy_context()
+        # Kept on the task, as Task.execute_async does, so a WarmCrewPool can
+        # wait for it before leasing the crew again.
+        self._thread = Thread(
+            daemon=True,
+            target=ctx.run,
+            args=(self._execute_task_async, agent, context, tools, future),
+        )
+        self._thread.start()
+        return future
+
+
 def run_crew_in_thread(
     crew: Any,
     inputs: dict,
     correlation_id: str,
-    sync_queue: Queue,
     event_dispatcher: EventDispatcher,
     on_complete: Optional[Callable[[], None]] = None,
     on_error: Optional[Callable[[Exception], Any]] = None,
     label: str = "CrewRunner",
-) -> None:
+    pool: Optional[CrewWorkerPool] = None,
+    on_queued: Optional[Callable[[int], None]] = None,
+    on_finished: Optional[Callable[[], None]] = None,
+    cancel_token: Optional[CancelToken] = None,
+    warm_crews: Optional[WarmCrewPool] = None,
+    reused_outputs: Optional[Dict[str, ReusedOutput]] = None,
+    task_descriptions: Optional[Dict[str, str]] = None,
+) -> int:
     """
-    Spawn a daemon thread that runs ``crew.kickoff(inputs)`` and streams
-    results back via *sync_queue* and *event_dispatcher*.
+    Run ``crew.kickoff(inputs)`` off the event loop and stream results back
+    to every subscriber of the *correlation_id* session via *event_dispatcher*.
 
     The correlation ID is set on the thread's ContextVar so all downstream
     code (logger, dispatcher, callbacks) can read it implicitly via
     get_correlation_id().
 
     Args:
-        crew:             A CrewAI Crew instance (already built).
+        crew:             A CrewAI Crew instance (already built), or None
+                          when *warm_crews* is given.
         inputs:           Dict passed to ``crew.kickoff(inputs=...)``.
         correlation_id:   Session key — set on ContextVar for the thread lifetime.
-        sync_queue:       Thread-safe Queue shared with the async stream consumer.
         event_dispatcher: Singleton dispatcher for pushing events to the session.
+                          The session is closed when the job ends.
         on_complete:      Optional ``() -> None`` called after a successful kickoff.
                           Use for persistence, metrics, etc.
         on_error:         Optional ``(exc) -> Any`` called on failure. Return value
@@ -52,21 +178,83 @@ def run_crew_in_thread(
                           returned the default ``{"status": "error", "message": str(exc)}``
                           is used.
         label:            Log prefix for debug/error messages.
+        pool:             Optional bounded worker pool. When given the job is
+                          queued on it instead of spawning a new thread.
+        on_queued:        Optional ``(position) -> None`` called while the job
+                          waits in *pool*'s queue.
+        on_finished:      Optional ``() -> None`` called once the job has ended,
+                          successfully or not, just before the session closes.
+        cancel_token:     Optional token that stops the job cooperatively. A job
+                          cancelled while queued never starts; a running one
+                          skips its remaining tasks and LLM calls and ends
+                          without an error event. A run that finishes anyway
+                          still goes through *on_complete*.
+        warm_crews:       Optional pool to lease the crew from once the job
+                          starts on a worker; it is returned when the job ends.
+        reused_outputs:   Optional ``{task_name: {"raw": str, "output": dict}}``
+                          of outputs from an earlier run. Those
+                          ContextPropagatingTasks complete with the stored
+                          output instead of calling their agent. A value may
+                          be a callable ``(task) -> Optional[dict]`` instead,
+                          called when the task is about to run (e.g. to
+                          look at its context tasks' outputs).
+        task_descriptions: Optional ``{task_name: description}`` — fully
+                          interpolated prompts those ContextPropagatingTasks
+                          run with in this job instead of their own.
+
+    Returns:
+        The job's queue position (0 when it starts immediately).
+
+    Raises:
+        CrewPoolFullException: *pool* is saturated; nothing was started.
     """
 
+    def _cancelled() -> bool:
+        return cancel_token is not None and cancel_token.cancelled
+
+    submitted_at = time.perf_counter()
+    submitted_ns = time.time_ns()
+
     def _target() -> None:
+        status = "completed"
         token = set_correlation_id(correlation_id)
-        logger.info("REVIEW_START")
+        cancel_ctx_token = set_cancel_token(cancel_token)
+        reused_ctx_token = _reused_outputs.set(reused_outputs)
+        descriptions_ctx_token = _task_descriptions.set(task_descriptions)
+        review_tracer.record("crew_queued", correlation_id, submitted_ns, time.time_ns())
+        job_crew = crew
         try:
-            result = crew.kickoff(inputs=inputs)
-            logger.debug("[%s] crew.kickoff() returned", label)
+            with review_tracer.span("run_crew_in_thread", correlation_id, label=label):
+                if warm_crews is not None:
+                    job_crew = warm_crews.acquire()
+                if _cancelled():
+                    raise JobCancelledException(cancel_token.reason or "cancelled")
+                logger.info("REVIEW_START")
+                result = job_crew.kickoff(inputs=inputs)
+                logger.debug("[%s] crew.kickoff() returned", label)
+                if hasattr(result, "tasks_output"):
+                    # CrewAI keeps only the async outputs once async tasks are
+                    # gathered; rebuild the list in task order from the tasks.
+                    result.tasks_output = [task.output for task in job_crew.tasks if task.output is not None]
+
+                usage = getattr(result, "token_usage", None)
+                cancellation_stats.record_run(getattr(usage, "total_tokens", 0) or 0, len(getattr(job_crew, "tasks", [])))
 
-            if on_complete is not None:
-                on_complete(result)
+                if on_complete is not None:
+                    on_complete(result)
 
-            logger.info("REVIEW_END | status=completed")
+                logger.info("REVIEW_END | status=completed")
 
         except Exception as exc:
+            if _cancelled():
+                # Whatever the job raised while unwinding, nobody is listening.
+                skipped = len(getattr(job_crew, "tasks", [])) - cancel_token.tasks_started
+                cancellation_stats.record_cancelled(skipped)
+                status = "cancelled"
+                logger.info("REVIEW_END | status=cancelled | reason=%s | skipped_tasks=%d", cancel_token.reason, skipped)
+                return
+
+            status = "error"
             logger.error("REVIEW_END | status=error | error=%s", exc)
 
             error_event: Any = {"status": "error", "message": str(exc)}
@@ -76,13 +264,24 @@ def run_crew_in_thread(
                     error_event = custom
 
             event_dispatcher.dispatch(get_correlation_id(), error_event)
-            sync_queue.put(error_event)
 
         finally:
+            if warm_crews is not None and job_crew is not None:
+                warm_crews.release(job_crew)
+            _task_descriptions.reset(descriptions_ctx_token)
+            _reused_outputs.reset(reused_ctx_token)
+            reset_cancel_token(cancel_ctx_token)
             reset_correlation_id(token)
-            sync_queue.put(None)  # Poison pill — signals stream to close
+            if on_finished is not None:
+                on_finished()
+            REVIEW_DURATION.labels(status).observe(time.perf_counter() - submitted_at)
+            event_dispatcher.close_session(correlation_id)  # Poison pill — signals streams to close
+
+    if pool is not None:
+        return pool.submit(_target, on_position=on_queued)
 
     Thread(target=_target, daemon=True).start()
+    return 0
 
 
-__all__ = ["run_crew_in_thread"]
+__all__ = ["ContextPropagatingTask", "ReusedOutput", "run_crew_in_thread"]
@@ -1,15 +1,38 @@
-from queue import Queue
-from typing import Any, Dict
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List
 
 from app.common.logger import logger
+from app.common.streaming import StreamBridge
+
+# Most recent events kept per session so late subscribers can catch up.
+_MAX_HISTORY = 256
+
+
+@dataclass
+class _Session:
+    subscribers: List[StreamBridge] = field(default_factory=list)
+    history: Deque[Any] = field(default_factory=lambda: deque(maxlen=_MAX_HISTORY))
 
 
 class EventDispatcher:
     """
-    Process-wide singleton dispatcher that routes events to per-session queues.
+    Process-wide singleton dispatcher that fans each job's events out to
+    every StreamBridge subscribed to it. ``dispatch`` is called from crew
+    worker threads; each bridge hands the event to its consuming event loop
+    without polling.
+
+    A session lives from ``register_session`` until the job calls
+    ``close_session``. Clients may subscribe and unsubscribe in between —
+    a late subscriber (a coalesced duplicate submission or a client retrying
+    with the same correlation ID) first receives the events it missed,
+    except those dispatched with ``history=False``. Only the most recent
+    events are kept: a long session drops its oldest ones, so a late
+    subscriber still receives the latest results.
 
     The singleton is enforced via __new__ + an _initialized guard so that
-    __init__ only runs once, preventing active_queues from being reset on
+    __init__ only runs once, preventing sessions from being reset on
     subsequent EventDispatcher() calls.
     """
 
@@ -24,24 +47,91 @@ class EventDispatcher:
     def __init__(self) -> None:
         if self._initialized:
             return
-        self._active_queues: Dict[str, Queue] = {}
+        self._sessions: Dict[str, _Session] = {}
+        self._lock = threading.Lock()
         self._initialized = True
 
-    def register_session(self, session_id: str, queue: Queue) -> None:
+    def register_session(self, session_id: str, bridge: StreamBridge) -> None:
+        """Open a fresh session for a new job with *bridge* as its first subscriber."""
         logger.debug("[EventDispatcher] Registering session: %s", session_id)
-        self._active_queues[session_id] = queue
+        with self._lock:
+            self._sessions[session_id] = _Session(subscribers=[bridge])
+
+    def subscribe(self, session_id: str, bridge: StreamBridge) -> bool:
+        """Attach *bridge* to a running session, replaying its history first.
+
+        Returns False if no such session is open.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            logger.debug("[EventDispatcher] Subscribing to session: %s", session_id)
+            for event in session.history:
+                bridge.put(event)
+            session.subscribers.append(bridge)
+            return True
+
+    def unsubscribe(self, session_id: str, bridge: StreamBridge) -> int:
+        """Detach *bridge*. Returns the number of subscribers left on the session."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return 0
+            if bridge in session.subscribers:
+                session.subscribers.remove(bridge)
+            logger.debug(
+                "[EventDispatcher] Unsubscribed from session: %s (%d left)",
+                session_id, len(session.subscribers),
+            )
+            return len(session.subscribers)
 
     def unregister_session(self, session_id: str) -> None:
         logger.debug("[EventDispatcher] Unregistering session: %s", session_id)
-        self._active_queues.pop(session_id, None)
-
-    def dispatch(self, session_id: str, data: Any) -> None:
-        queue = self._active_queues.get(session_id)
-        if queue:
-            logger.debug("[EventDispatcher] Dispatching event to session: %s", session_id)
-            queue.put(data)
-        else:
-            logger.warning("[EventDispatcher] No active queue for session: %s", session_id)
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def has_session(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def dispatch(self, session_id: str, data: Any, history: bool = True) -> None:
+        """Send *data* to every subscriber of the session.
+
+        With *history* False the event is not replayed to later subscribers;
+        use it for high-volume events (streamed tokens) that would crowd the
+        bounded history out.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                logger.warning("[EventDispatcher] No active session: %s", session_id)
+                return
+            logger.debug(
+                "[EventDispatcher] Dispatching event to session: %s (%d subscribers)",
+                session_id, len(session.subscribers),
+            )
+            if history:
+                session.history.append(data)
+            for bridge in session.subscribers:
+                bridge.put(data)
+
+    def close_session(self, session_id: str) -> None:
+        """Send the poison pill to every subscriber and drop the session."""
+        logger.debug("[EventDispatcher] Closing session: %s", session_id)
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            for bridge in session.subscribers:
+                bridge.close()
+
+    def stats(self) -> dict:
+        """Snapshot of open sessions and the client streams subscribed to them."""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "subscribers": sum(len(session.subscribers) for session in self._sessions.values()),
+            }
 
 
 __all__ = ["EventDispatcher"]
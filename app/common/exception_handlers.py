@@ -3,7 +3,9 @@ import traceback
 from azure.core.exceptions import ResourceNotFoundError
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from .constants import REVIEW_ESTIMATE_HEADER
 from .logger import logger
 
 
@@ -26,6 +28,17 @@ class ReviewSessionNotFoundException(Exception):
         super().__init__(self.message)
 
 
+class ReviewTraceNotFoundException(Exception):
+    """No spans are kept for the review: unknown, evicted from the tracer, or tracing is disabled."""
+
+    def __init__(self, correlation_id: str) -> None:
+        self.message = (
+            f"No trace is available for review '{correlation_id}'. "
+            "Traces are kept only for recent reviews, and only while tracing is enabled."
+        )
+        super().__init__(self.message)
+
+
 class MissingInputException(Exception):
     def __init__(self) -> None:
         self.message = "Either 'file' or 'design_doc' must be provided."
@@ -39,6 +52,53 @@ class DocumentExtractionException(Exception):
         super().__init__(self.message)
 
 
+class CrewPoolFullException(Exception):
+    def __init__(self, retry_after_seconds: int) -> None:
+        self.retry_after_seconds = retry_after_seconds
+        self.message = (
+            "All reviewers are busy and the review queue is full. "
+            f"Please retry in {retry_after_seconds} seconds."
+        )
+        super().__init__(self.message)
+
+
+class ReviewBudgetExceededException(Exception):
+    def __init__(self, message: str, estimate: str) -> None:
+        self.message = message
+        # X-Review-Estimate header value of the rejected review
+        self.estimate = estimate
+        super().__init__(self.message)
+
+
+class UploadTooLargeException(StarletteHTTPException):
+    """Upload body exceeded the size limit while it was being received.
+
+    Subclasses HTTPException only so FastAPI's body parser re-raises it
+    instead of wrapping it in a generic 400 "error parsing the body".
+    """
+
+    def __init__(self, max_file_mb: int) -> None:
+        self.message = f"File exceeds maximum size of {max_file_mb}MB"
+        super().__init__(status_code=413, detail=self.message)
+
+
+class LLMCassetteMissException(Exception):
+    """Raised in replay mode when a review's cassette cannot answer an LLM call; fails the review."""
+
+    def __init__(self, correlation_id: str, reason: str) -> None:
+        self.message = f"Cassette replay of review '{correlation_id}' failed: {reason}"
+        super().__init__(self.message)
+
+
+class JobCancelledException(Exception):
+    """Raised inside a crew job whose cancel token was set; never reaches a client."""
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+        self.message = f"Job cancelled: {reason}"
+        super().__init__(self.message)
+
+
 # ---------------------------------------------------------------------------
 # Handler registration
 # ---------------------------------------------------------------------------
@@ -74,6 +134,14 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"success": False, "status_code": 404, "message": exc.message, "error_type": "REVIEW_SESSION_NOT_FOUND"},
         )
 
+    @app.exception_handler(ReviewTraceNotFoundException)
+    async def review_trace_not_found_handler(request: Request, exc: ReviewTraceNotFoundException):
+        logger.warning("Review trace not found: %s", exc.message)
+        return JSONResponse(
+            status_code=404,
+            content={"success": False, "status_code": 404, "message": exc.message, "error_type": "REVIEW_TRACE_NOT_FOUND"},
+        )
+
     @app.exception_handler(MissingInputException)
     async def missing_input_handler(request: Request, exc: MissingInputException):
         logger.error("Missing input: %s", exc.message)
@@ -90,6 +158,32 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"success": False, "status_code": exc.status_code, "message": exc.message, "error_type": "EXTRACTION_ERROR"},
         )
 
+    @app.exception_handler(UploadTooLargeException)
+    async def upload_too_large_handler(request: Request, exc: UploadTooLargeException):
+        logger.warning("Upload rejected while receiving: %s", exc.message)
+        return JSONResponse(
+            status_code=413,
+            content={"success": False, "status_code": 413, "message": exc.message, "error_type": "EXTRACTION_ERROR"},
+        )
+
+    @app.exception_handler(CrewPoolFullException)
+    async def crew_pool_full_handler(request: Request, exc: CrewPoolFullException):
+        logger.warning("Review rejected, worker pool full: %s", exc.message)
+        return JSONResponse(
+            status_code=429,
+            content={"success": False, "status_code": 429, "message": exc.message, "error_type": "REVIEW_QUEUE_FULL"},
+            headers={"Retry-After": str(exc.retry_after_seconds)},
+        )
+
+    @app.exception_handler(ReviewBudgetExceededException)
+    async def review_budget_exceeded_handler(request: Request, exc: ReviewBudgetExceededException):
+        logger.warning("Review rejected by pre-flight budget: %s", exc.message)
+        return JSONResponse(
+            status_code=422,
+            content={"success": False, "status_code": 422, "message": exc.message, "error_type": "REVIEW_BUDGET_EXCEEDED"},
+            headers={REVIEW_ESTIMATE_HEADER: exc.estimate},
+        )
+
     @app.exception_handler(ResourceNotFoundError)
     async def azure_resource_not_found_handler(request: Request, exc: ResourceNotFoundError):
         stack_trace = traceback.format_exc()
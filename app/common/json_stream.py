@@ -0,0 +1,130 @@
+"""
+Incremental JSON scanning — picks the items of chosen list fields out of a
+JSON object while it is still being streamed.
+
+An LLM writing a structured output produces the JSON a few characters at a
+time. ``JsonItemStream`` is fed those chunks and returns each object of a
+top-level list field (e.g. ``{"bottlenecks": [{...}, {...}]}``) as soon as
+its closing brace arrives, without waiting for the rest of the document.
+Text before the first ``{`` (a Markdown fence) is skipped. With a
+*start_marker* such as ReAct's ``Final Answer:``, the scan also restarts
+after the marker each time it appears, so braces in the reasoning before it
+cannot derail it. Each character is scanned once: only the nesting, the
+string state and the current key are tracked, and the item's text is
+parsed with ``json.loads`` once it is complete.
+"""
+import json
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+
+@dataclass
+class _Frame:
+    kind: str                  # "{" or "["
+    key: Optional[str] = None  # object: the key of the value being read
+    expect_key: bool = True    # object: the next string is a key
+    items: int = 0             # array: objects opened in it so far
+
+
+class JsonItemStream:
+    """
+    Scans one streamed JSON object and yields the objects of its *fields* lists as they close.
+
+    Args:
+        fields:        Top-level keys whose values are lists of objects to report.
+        start_marker:  Optional text after which the JSON starts; the scan restarts after it.
+    """
+
+    def __init__(self, fields: Iterable[str], start_marker: str = "") -> None:
+        self.fields = frozenset(fields)
+        self.start_marker = start_marker
+        # End of the text scanned so far, to find a marker split across chunks.
+        self._tail = ""
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        # (field, index, offset of its opening brace) of the item being read
+        self._item: Optional[Tuple[str, int, int]] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, int, dict]]:
+        """Scan *chunk*; returns ``(field, index, item)`` for every item it completed.
+
+        Text that is not valid JSON inside an item is dropped without error.
+        """
+        if self.start_marker:
+            window = self._tail + chunk
+            at = window.rfind(self.start_marker)
+            if at != -1:
+                self._reset()
+                chunk = window[at + len(self.start_marker):]
+            self._tail = window[-(len(self.start_marker) - 1):] if len(self.start_marker) > 1 else ""
+        self._text += chunk
+        completed: List[Tuple[str, int, dict]] = []
+        text, stack = self._text, self._stack
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    top = stack[-1]
+                    if top.kind == "{" and top.expect_key:
+                        top.key = text[self._string_start:pos]
+                        top.expect_key = False
+                continue
+            if not stack:
+                if char == "{":
+                    stack.append(_Frame("{"))
+                continue
+            top = stack[-1]
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos + 1
+            elif char == "{":
+                if top.kind == "[" and len(stack) == 2 and stack[0].key in self.fields:
+                    self._item = (stack[0].key, top.items, pos)
+                    top.items += 1
+                stack.append(_Frame("{"))
+            elif char == "[":
+                stack.append(_Frame("["))
+            elif char in "}]":
+                stack.pop()
+                if char == "}" and len(stack) == 2 and self._item is not None:
+                    field, index, start = self._item
+                    self._item = None
+                    try:
+                        completed.append((field, index, json.loads(text[start:pos + 1])))
+                    except ValueError:
+                        pass
+            elif char == "," and top.kind == "{":
+                top.expect_key = True
+        # Keep only the text still needed: the item being read, or a key cut off mid-string.
+        if self._item is not None:
+            keep = self._item[2]
+            self._item = (self._item[0], self._item[1], 0)
+        elif self._in_string:
+            keep = self._string_start
+        else:
+            keep = len(text)
+        self._string_start -= keep
+        self._text = text[keep:]
+        self._pos = len(text) - keep
+        return completed
+
+    def _reset(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._item = None
+
+
+__all__ = ["JsonItemStream"]
@@ -0,0 +1,186 @@
+"""
+Prometheus metrics for the review pipeline, served in the text exposition
+format by ``GET /api/v1/metrics``.
+
+Two kinds of collection, both cheap on the hot path:
+
+* Histograms and counters below are updated where the work happens — one
+  bucket increment under a per-metric lock, no I/O, no allocation beyond
+  the first use of a label set.
+* Occupancy (sessions, crew workers, queue depths, warm crews), and the
+  counters components keep anyway (cache hits, cancellations), cost
+  nothing extra: ``RuntimeCollector`` reads the components' ``stats()``
+  snapshots, once per scrape.
+
+Metrics live in prometheus_client's default registry, next to its process
+and Python runtime collectors. Nothing is pushed; a scrape (or a plain
+``curl``) is all it takes to read them.
+"""
+from typing import Any, Iterable, Optional
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+# ---------------------------------------------------------------------------
+# Reviews
+# ---------------------------------------------------------------------------
+
+REVIEW_TIME_TO_FIRST_EVENT = Histogram(
+    "review_time_to_first_event_seconds",
+    "Time from a review stream opening to its first event, queueing included.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+REVIEW_DURATION = Histogram(
+    "review_duration_seconds",
+    "Time from a crew job being submitted to its end, queueing included.",
+    ["status"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800),
+)
+TASK_DURATION = Histogram(
+    "review_task_duration_seconds",
+    "Wall time of crew tasks that ran, by agent.",
+    ["agent", "status"],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+# ---------------------------------------------------------------------------
+# LLM usage
+# ---------------------------------------------------------------------------
+
+LLM_TOKENS = Counter(
+    "llm_tokens",
+    "Tokens used by crew tasks, by model and kind (prompt, completion or cached_prompt).",
+    ["model", "kind"],
+)
+LLM_COST = Counter(
+    "llm_cost_usd",
+    "Cost of crew tasks in USD at LiteLLM list prices, by model (unpriced models are not counted).",
+    ["model"],
+)
+
+LLM_HTTP_REQUESTS = Counter(
+    "llm_http_requests",
+    "Requests sent on the shared LLM HTTP clients.",
+)
+LLM_HTTP_CONNECTIONS_OPENED = Counter(
+    "llm_http_connections_opened",
+    "Requests that had to open a connection first (pool misses); the hit rate is 1 - this / llm_http_requests.",
+)
+LLM_HTTP_CONNECT_DURATION = Histogram(
+    "llm_http_connect_seconds",
+    "Time to open a connection to the LLM endpoint, TCP and TLS, for requests that opened one.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+# ---------------------------------------------------------------------------
+# I/O
+# ---------------------------------------------------------------------------
+
+EXTRACTION_DURATION = Histogram(
+    "document_extraction_seconds",
+    "Time to hash and extract the text of an uploaded file, by file type; failures included.",
+    ["file_type"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+STORE_QUERY_DURATION = Histogram(
+    "review_store_query_seconds",
+    "Time spent in review_store transactions; writes include waiting for the writer lock.",
+    ["mode"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+
+# ---------------------------------------------------------------------------
+# Occupancy, read at scrape time
+# ---------------------------------------------------------------------------
+
+def _gauge(name: str, documentation: str, value: float) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, value=value)
+
+
+def _counter(name: str, documentation: str, value: float) -> CounterMetricFamily:
+    return CounterMetricFamily(name, documentation, value=value)
+
+
+class RuntimeCollector(Collector):
+    """
+    Reports the live state of the shared singletons on every scrape.
+
+    Args:
+        event_dispatcher: Open review sessions and their stream subscribers.
+        crew_pool:        Crew worker threads in flight and jobs waiting.
+        warm_crews:       Prebuilt crews idle and leased.
+        llm_cache:        LLM response cache hits and misses.
+        cancellation:     Work avoided by cancelling abandoned reviews.
+    """
+
+    def __init__(self, event_dispatcher: Any, crew_pool: Any, warm_crews: Any, llm_cache: Any, cancellation: Any) -> None:
+        self.event_dispatcher = event_dispatcher
+        self.crew_pool = crew_pool
+        self.warm_crews = warm_crews
+        self.llm_cache = llm_cache
+        self.cancellation = cancellation
+
+    def collect(self) -> Iterable[Metric]:
+        sessions = self.event_dispatcher.stats()
+        yield _gauge("review_sessions_active", "Review sessions open in the event dispatcher.", sessions["sessions"])
+        yield _gauge("review_stream_subscribers", "Client streams subscribed to open review sessions.", sessions["subscribers"])
+
+        pool = self.crew_pool.stats()
+        yield _gauge("crew_workers", "Crew worker threads.", pool["workers"])
+        yield _gauge("crew_workers_active", "Crew worker threads running a job.", pool["active"])
+        yield _gauge("crew_queue_depth", "Crew jobs waiting for a worker.", pool["queue_depth"])
+        yield _gauge("crew_queue_capacity", "Crew jobs allowed to wait before submissions are rejected.", pool["max_queue_depth"])
+        yield _counter("crew_jobs_submitted", "Crew jobs accepted by the worker pool.", pool["submitted"])
+        yield _counter("crew_jobs_completed", "Crew jobs that ran to an end.", pool["completed"])
+        yield _counter("crew_jobs_rejected", "Crew jobs rejected because the queue was full.", pool["rejected"])
+
+        warm = self.warm_crews.stats()
+        yield _gauge("warm_crews_idle", "Prebuilt crews waiting for a review.", warm["idle"])
+        yield _gauge("warm_crews_leased", "Prebuilt crews leased to a running review.", warm["leased"])
+        yield _counter("warm_crews_built", "Crews built by the warm pool, up front or on a miss.", warm["built"])
+        yield _counter("warm_crew_lease_hits", "Leases served by an idle prebuilt crew.", warm["hits"])
+        yield _counter("warm_crew_lease_misses", "Leases that had to build a crew first.", warm["misses"])
+
+        cache = self.llm_cache.stats()
+        yield _counter("llm_cache_hits", "LLM calls answered from the response cache.", cache["hits"])
+        yield _counter("llm_cache_misses", "Cacheable LLM calls that missed the response cache.", cache["misses"])
+
+        cancelled = self.cancellation.stats()
+        yield _counter("crew_jobs_cancelled", "Crew jobs cancelled because their last client disconnected.", cancelled["cancelled_jobs"])
+        yield _counter("crew_tasks_skipped", "Tasks of cancelled crew jobs that never started.", cancelled["skipped_tasks"])
+        yield _counter("llm_calls_blocked", "LLM calls refused because their job was cancelled.", cancelled["blocked_llm_calls"])
+        yield _gauge(
+            "cancellation_tokens_saved_estimate",
+            "Tokens not spent thanks to cancellations, valuing a skipped task at the average tokens per completed task.",
+            cancelled["estimated_tokens_saved"],
+        )
+
+
+_runtime_collector: Optional[RuntimeCollector] = None
+
+
+def register_runtime(event_dispatcher: Any, crew_pool: Any, warm_crews: Any, llm_cache: Any, cancellation: Any) -> None:
+    """Report these singletons on ``/metrics``, replacing any registered before."""
+    global _runtime_collector
+    if _runtime_collector is not None:
+        REGISTRY.unregister(_runtime_collector)
+    _runtime_collector = RuntimeCollector(event_dispatcher, crew_pool, warm_crews, llm_cache, cancellation)
+    REGISTRY.register(_runtime_collector)
+
+
+__all__ = [
+    "REVIEW_TIME_TO_FIRST_EVENT",
+    "REVIEW_DURATION",
+    "TASK_DURATION",
+    "LLM_TOKENS",
+    "LLM_COST",
+    "LLM_HTTP_REQUESTS",
+    "LLM_HTTP_CONNECTIONS_OPENED",
+    "LLM_HTTP_CONNECT_DURATION",
+    "EXTRACTION_DURATION",
+    "STORE_QUERY_DURATION",
+    "RuntimeCollector",
+    "register_runtime",
+]
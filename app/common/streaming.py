@@ -1,18 +1,51 @@
 """
 Generic async streaming utilities.
 
-Provides the queue-polling async generator used to bridge a synchronous
-worker thread with an async FastAPI streaming response. Feature-agnostic —
-any crew or LLM job can use this.
+Provides the thread → event-loop bridge used to stream events from a
+synchronous worker thread into an async FastAPI streaming response.
+Feature-agnostic — any crew or LLM job can use this.
 """
 import asyncio
 import json
-from queue import Empty, Queue
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Optional
 
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.common.logger import logger
+from app.common.tracing import review_tracer
+
+
+class StreamBridge:
+    """
+    Thread-safe bridge from a worker thread to an ``asyncio.Queue``.
+
+    Must be created on the event loop that consumes it. ``put()`` may be
+    called from any thread — items are handed to the loop with
+    ``loop.call_soon_threadsafe`` so the consumer wakes as soon as an event
+    is dispatched, and an idle stream holds no thread and never polls.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def put(self, event: Any) -> None:
+        """Enqueue *event* for the consumer. Safe to call from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            # The loop has been closed (server shutdown) — nobody is listening.
+            logger.debug("[StreamBridge] Event loop closed; dropping event.")
+
+    def close(self) -> None:
+        """Send the poison pill that tells the consumer to stop."""
+        self.put(None)
+
+    async def get(self) -> Any:
+        """Wait for the next event without blocking the event loop."""
+        return await self._queue.get()
 
 
 def serialize_event(event: object) -> str:
@@ -24,9 +57,11 @@ def serialize_event(event: object) -> str:
     return json.dumps({"data": str(event)})
 
 
-async def stream_queue(sync_queue: Queue, label: str = "stream") -> AsyncGenerator[str, None]:
+async def stream_queue(
+    bridge: StreamBridge, label: str = "stream", correlation_id: Optional[str] = None,
+) -> AsyncGenerator[str, None]:
     """
-    Poll a thread-safe Queue and yield serialised NDJSON chunks.
+    Await events from a StreamBridge and yield serialised NDJSON chunks.
 
     Terminates on:
     - None sentinel (poison pill from worker thread)
@@ -34,23 +69,24 @@ async def stream_queue(sync_queue: Queue, label: str = "stream") -> AsyncGenerat
     - asyncio.CancelledError (client disconnect — re-raised)
 
     Args:
-        sync_queue: Queue populated by a worker thread.
-        label:      Log label for debug messages.
+        bridge:         StreamBridge populated by a worker thread.
+        label:          Log label for debug messages.
+        correlation_id: When given, each chunk is traced as a ``stream_yield``
+                        span, from serialising it until the consumer asks
+                        for the next one (i.e. the write to the client).
 
     Yields:
         NDJSON lines: ``"<json>\\n\\n"``
     """
-    loop = asyncio.get_running_loop()
     while True:
         try:
-            event = await loop.run_in_executor(
-                None, lambda: sync_queue.get(timeout=0.2)
-            )
+            event = await bridge.get()
 
             if event is None:
                 logger.debug("[%s] Received shutdown signal. Closing stream.", label)
                 break
 
+            started_ns = time.time_ns()
             payload = serialize_event(event)
             yield f"{payload}\n\n"
 
@@ -58,12 +94,14 @@ async def stream_queue(sync_queue: Queue, label: str = "stream") -> AsyncGenerat
                 event.get("status") if isinstance(event, dict)
                 else getattr(event, "status", None)
             )
+            if correlation_id is not None:
+                review_tracer.record(
+                    "stream_yield", correlation_id, started_ns, time.time_ns(),
+                    status=str(status), bytes=len(payload),
+                )
             if status in ("complete", "completed", "error"):
                 break
 
-        except Empty:
-            await asyncio.sleep(0.1)
-            continue
         except asyncio.CancelledError:
             logger.debug("[%s] Stream cancelled by client.", label)
             raise
@@ -73,4 +111,57 @@ async def stream_queue(sync_queue: Queue, label: str = "stream") -> AsyncGenerat
             break
 
 
-__all__ = ["serialize_event", "stream_queue"]
+class StreamSubscription:
+    """
+    A subscriber's chunks, plus the unsubscribe to run when it goes away.
+
+    *on_close* runs exactly once: when the chunks end or fail, or on
+    ``aclose()`` — also if iteration never started, where an async
+    generator's ``finally`` would not run.
+    """
+
+    def __init__(self, chunks: AsyncGenerator[str, None], on_close: Callable[[], None]) -> None:
+        self._chunks = chunks
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            return await self._chunks.__anext__()
+        except BaseException:
+            self._close()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._chunks.aclose()
+        finally:
+            self._close()
+
+    def _close(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its body however the response ends.
+
+    Starlette only stops iterating the body when the client disconnects,
+    and skips ``background`` tasks when the disconnect surfaces as an
+    error, so neither can be relied on to release what the body holds.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+__all__ = ["StreamBridge", "serialize_event", "stream_queue", "StreamSubscription", "ClosingStreamingResponse"]
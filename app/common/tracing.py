@@ -0,0 +1,228 @@
+"""
+Review tracing — timed spans of each stage of a review, grouped by
+correlation_id, for finding where a slow review spent its time.
+
+Spans are OpenTelemetry spans from a private TracerProvider, so CrewAI's own
+telemetry is left alone. Every span of a review belongs to one trace whose
+ID is derived from the correlation ID (the UUID itself when it is one), so
+spans recorded on different threads and at different stages line up without
+passing a context around. A span started while another span of the same
+review is current on the thread becomes its child.
+
+Finished spans are kept in memory for the most recent
+``review_tracing.max_reviews`` reviews and served as a timeline by
+``GET /api/v1/traces/{correlation_id}``. With ``review_tracing.export_path`` set
+they are also appended to that file as JSON lines, off the calling thread.
+"""
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.trace import NonRecordingSpan, SpanContext, Status, StatusCode, TraceFlags
+
+from app.common.logger import logger
+from app.common.request_context import get_correlation_id
+from app.config.config import settings
+from app.config.config_keys import REVIEW_TRACING_ENABLED, REVIEW_TRACING_EXPORT_PATH, REVIEW_TRACING_MAX_REVIEWS
+
+# Spans kept per review; a review's stream yields beyond this are dropped.
+_MAX_SPANS_PER_REVIEW = 2000
+# Spans started and never ended (e.g. a task of a crashed run) are dropped after this long.
+_OPEN_MAX_AGE_SECONDS = 3600
+
+
+def trace_id_for(correlation_id: str) -> int:
+    """The trace ID of *correlation_id*'s spans: the UUID's value, else 128 bits of its SHA-256."""
+    try:
+        return uuid.UUID(correlation_id).int
+    except ValueError:
+        return int.from_bytes(hashlib.sha256(correlation_id.encode("utf-8")).digest()[:16], "big")
+
+
+def _review_context(correlation_id: str) -> otel_context.Context:
+    """Context to start a span of *correlation_id* in: the current span if it is one, else the review's trace root."""
+    trace_id = trace_id_for(correlation_id)
+    if trace.get_current_span().get_span_context().trace_id == trace_id:
+        return otel_context.get_current()
+    root = SpanContext(
+        trace_id=trace_id,
+        span_id=trace_id & 0xFFFFFFFFFFFFFFFF or 1,
+        is_remote=True,
+        trace_flags=TraceFlags(TraceFlags.SAMPLED),
+    )
+    return trace.set_span_in_context(NonRecordingSpan(root))
+
+
+def _ns(timestamp: Optional[datetime]) -> Optional[int]:
+    return int(timestamp.timestamp() * 1e9) if timestamp is not None else None
+
+
+class _ReviewSpanCollector(SpanProcessor):
+    """Keeps finished spans per correlation_id, for the most recent *max_reviews* reviews."""
+
+    def __init__(self, max_reviews: int) -> None:
+        self.max_reviews = max_reviews
+        self._lock = threading.Lock()
+        self._reviews: "OrderedDict[str, List[ReadableSpan]]" = OrderedDict()
+
+    def on_end(self, span: ReadableSpan) -> None:
+        correlation_id = span.attributes.get("correlation_id")
+        if not correlation_id:
+            return
+        with self._lock:
+            spans = self._reviews.get(correlation_id)
+            if spans is None:
+                spans = self._reviews[correlation_id] = []
+                while len(self._reviews) > self.max_reviews:
+                    self._reviews.popitem(last=False)
+            if len(spans) < _MAX_SPANS_PER_REVIEW:
+                spans.append(span)
+
+    def spans(self, correlation_id: str) -> List[ReadableSpan]:
+        with self._lock:
+            return list(self._reviews.get(correlation_id, ()))
+
+
+class ReviewTracer:
+    """
+    Records review spans and serves them as per-review timelines.
+
+    Every method is safe to call from any thread; when disabled they do
+    nothing.
+
+    Args:
+        enabled:      When False no span is recorded.
+        max_reviews:  Reviews whose spans are kept in memory.
+        export_path:  Optional JSON-lines file every finished span is appended to.
+    """
+
+    def __init__(self, enabled: bool, max_reviews: int, export_path: str = "") -> None:
+        self.enabled = enabled
+        self._collector = _ReviewSpanCollector(max(1, max_reviews))
+        self._provider = TracerProvider(resource=Resource.create({"service.name": "system-design-reviewer"}))
+        self._provider.add_span_processor(self._collector)
+        if enabled and export_path:
+            exporter = ConsoleSpanExporter(
+                out=open(export_path, "a", encoding="utf-8"),
+                formatter=lambda span: span.to_json(indent=None) + "\n",
+            )
+            self._provider.add_span_processor(BatchSpanProcessor(exporter))
+        self._tracer = self._provider.get_tracer("app.review")
+        self._lock = threading.Lock()
+        self._open: Dict[Hashable, Span] = {}
+
+    def _start(self, name: str, correlation_id: str, start_time: Optional[int], attributes: Dict[str, Any]) -> Span:
+        return self._tracer.start_span(
+            name,
+            context=_review_context(correlation_id),
+            attributes={"correlation_id": correlation_id, **attributes},
+            start_time=start_time,
+        )
+
+    @contextmanager
+    def span(self, name: str, correlation_id: Optional[str] = None, **attributes: Any) -> Iterator[None]:
+        """Time the block as a span, current on this thread while it runs; an exception marks it failed.
+
+        *correlation_id* defaults to the one of the current context.
+        """
+        correlation_id = correlation_id or get_correlation_id()
+        if not self.enabled or correlation_id == "-":
+            yield
+            return
+        span = self._start(name, correlation_id, None, attributes)
+        with trace.use_span(span, end_on_exit=True, record_exception=True, set_status_on_exception=True):
+            yield
+
+    def start(
+        self,
+        key: Hashable,
+        name: str,
+        correlation_id: str,
+        start_time: Optional[datetime] = None,
+        **attributes: Any,
+    ) -> None:
+        """Start a span ended later, possibly on another thread, by ``end(key)``. A second start of *key* is ignored."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if key in self._open:
+                return
+            cutoff = time.time_ns() - _OPEN_MAX_AGE_SECONDS * 10**9
+            for stale in [k for k, span in self._open.items() if span.start_time < cutoff]:
+                del self._open[stale]
+        span = self._start(name, correlation_id, _ns(start_time), attributes)
+        with self._lock:
+            self._open.setdefault(key, span)
+
+    def end(self, key: Hashable, end_time: Optional[datetime] = None, error: Optional[str] = None) -> None:
+        """End the span started under *key*, marking it failed with *error* if given."""
+        if not self.enabled:
+            return
+        with self._lock:
+            span = self._open.pop(key, None)
+        if span is None:
+            return
+        if error is not None:
+            span.set_status(Status(StatusCode.ERROR, error))
+        span.end(end_time=_ns(end_time))
+
+    def record(self, name: str, correlation_id: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+        """Record a span that has already happened, from ``time.time_ns()`` timestamps."""
+        if not self.enabled:
+            return
+        self._start(name, correlation_id, start_ns, attributes).end(end_time=end_ns)
+
+    def timeline(self, correlation_id: str) -> Optional[dict]:
+        """The review's finished spans in start order, with times relative to the first; None if there are none."""
+        spans = sorted(self._collector.spans(correlation_id), key=lambda s: s.start_time)
+        if not spans:
+            return None
+        origin = spans[0].start_time
+        entries = []
+        for span in spans:
+            parent = span.parent
+            entries.append({
+                "name": span.name,
+                "span_id": f"{span.context.span_id:016x}",
+                "parent_id": f"{parent.span_id:016x}" if parent is not None and not parent.is_remote else None,
+                "start_ms": round((span.start_time - origin) / 1e6, 1),
+                "duration_ms": round((span.end_time - span.start_time) / 1e6, 1),
+                "status": "error" if span.status.status_code is StatusCode.ERROR else "ok",
+                "error": span.status.description,
+                "attributes": {k: v for k, v in span.attributes.items() if k != "correlation_id"},
+            })
+        end = max(span.end_time for span in spans)
+        return {
+            "correlation_id": correlation_id,
+            "trace_id": f"{trace_id_for(correlation_id):032x}",
+            "started_at": datetime.fromtimestamp(origin / 1e9, timezone.utc).isoformat(),
+            "duration_ms": round((end - origin) / 1e6, 1),
+            "spans": entries,
+        }
+
+    def shutdown(self) -> None:
+        """Flush the file export, if any."""
+        try:
+            self._provider.shutdown()
+        except Exception as exc:
+            logger.error("[ReviewTracer] Failed to flush spans: %s", exc)
+
+
+review_tracer = ReviewTracer(
+    enabled=settings.get_bool(REVIEW_TRACING_ENABLED, True),
+    max_reviews=settings.get_int(REVIEW_TRACING_MAX_REVIEWS, 200),
+    export_path=settings.get(REVIEW_TRACING_EXPORT_PATH, "") or "",
+)
+
+
+__all__ = ["ReviewTracer", "review_tracer", "trace_id_for"]
@@ -0,0 +1,58 @@
+"""
+Request-body size limit for upload endpoints.
+
+Starlette buffers a whole multipart body into its spooled temp files
+before the endpoint runs, so an oversized upload would be received in full
+before DocumentExtractor could reject it. This ASGI middleware counts body
+bytes as the server receives them and fails the request with 413 as soon
+as the limit is crossed — or before reading anything when Content-Length
+already exceeds it.
+"""
+from typing import Iterable
+
+from app.common.exception_handlers import UploadTooLargeException
+
+# Room for the non-file multipart fields (Starlette caps each at 1 MiB),
+# part headers and boundaries on top of the file itself.
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024 + 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Pure ASGI middleware enforcing *max_body_bytes* on requests to *paths*.
+
+    The limit is enforced inside ``receive``, so the resulting
+    UploadTooLargeException reaches the registered exception handler like
+    any other domain error.
+    """
+
+    def __init__(self, app, max_body_bytes: int, max_file_mb: int, paths: Iterable[str]) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.max_file_mb = max_file_mb
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"].rstrip("/") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        declared = int(content_length) if content_length and content_length.isdigit() else None
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            if declared is not None and declared > self.max_body_bytes:
+                raise UploadTooLargeException(self.max_file_mb)
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise UploadTooLargeException(self.max_file_mb)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+__all__ = ["MULTIPART_OVERHEAD_BYTES", "UploadSizeLimitMiddleware"]
@@ -1,7 +1,11 @@
+import threading
 from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence
 
 from app.common.logger import logger
 
+_token_usage_warning = threading.Event()
+
 
 def log_task_done(output, agent_name: str = "") -> None:
     """Unified task completion log: timestamp, agent, task name, status, token usage."""
@@ -24,4 +28,34 @@ def log_task_done(output, agent_name: str = "") -> None:
         logger.error("Failed to log task completion: %s", exc)
 
 
-__all__ = ["log_task_done"]
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank *pct* percentile (0-100) of *samples*; 0.0 when there are none."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def llm_token_usage(llm: Any) -> Optional[Dict[str, int]]:
+    """The token counters a CrewAI LLM accumulates, or None if it has none.
+
+    CrewAI keeps them in the private ``BaseLLM._token_usage`` dict (as of
+    1.7); a release that renames or drops it is logged once, and callers
+    then skip their token accounting instead of failing.
+    """
+    # Imported here: app.common is also loaded by the extraction worker processes.
+    from crewai.llms.base_llm import BaseLLM
+
+    if not isinstance(llm, BaseLLM):
+        return None
+    usage = getattr(llm, "_token_usage", None)
+    if isinstance(usage, dict):
+        return usage
+    if not _token_usage_warning.is_set():
+        _token_usage_warning.set()
+        logger.warning("%s has no _token_usage dict; LLM token accounting is disabled", type(llm).__name__)
+    return None
+
+
+__all__ = ["llm_token_usage", "log_task_done", "percentile"]
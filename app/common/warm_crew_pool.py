@@ -0,0 +1,131 @@
+"""
+Warm pool of prebuilt CrewAI crews.
+
+Building a crew from its ``@CrewBase`` class loads the YAML configs and
+constructs every Agent, LLM and Task — about a quarter of a second — while
+the built Crew is memoized on its instance, so sharing one instance would
+share agents, fingerprints and task outputs between concurrent runs.
+
+The pool builds crews up front and leases each to one run at a time.
+Per-run state is cleared when a crew comes back: the correlation ID stamped
+on agent fingerprints, the LLMs' token counters (``CrewOutput.token_usage``
+is summed from them) and the task outputs. A crew whose async task threads
+are still running — a cancelled or failed run — rejoins the pool only once
+they have finished.
+
+Feature-agnostic — the pool is given a zero-argument crew factory.
+"""
+import threading
+import time
+from typing import Callable, List
+
+from crewai import Crew
+
+from app.common.logger import logger
+from app.common.util import llm_token_usage
+
+
+def _reset_run_state(crew: Crew) -> None:
+    """Clear everything a kickoff leaves behind that the next run must not see."""
+    for agent in crew.agents:
+        agent.fingerprint.metadata.pop("correlation_id", None)
+        usage = llm_token_usage(agent.llm)
+        if usage is not None:
+            # BaseLLM only ever accumulates; it has no public reset.
+            usage.update(dict.fromkeys(usage, 0))
+    for task in crew.tasks:
+        task.output = None
+
+
+def _running_task_threads(crew: Crew) -> List[threading.Thread]:
+    threads = (getattr(task, "_thread", None) for task in crew.tasks)
+    return [thread for thread in threads if thread is not None and thread.is_alive()]
+
+
+class WarmCrewPool:
+    """
+    Leases prebuilt crews to runs, one run per crew at a time.
+
+    Args:
+        factory:  Zero-argument callable returning a new, fully built Crew.
+        size:     Crews built up front — match the number of concurrent runs.
+
+    When every crew is leased, ``acquire`` builds another one (a miss) and
+    keeps it. Crews are never dropped: CrewAI memoizes agents and tasks by
+    ``id()`` of their crew instance, so a recycled id could hand a new crew
+    the agents of a discarded one.
+    """
+
+    def __init__(self, factory: Callable[[], Crew], size: int) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._idle: List[Crew] = []
+        self._built = 0
+        self._leased = 0
+        self._hits = 0
+        self._misses = 0
+        self._build_ms = 0.0
+
+        started = time.perf_counter()
+        for _ in range(max(0, size)):
+            self._idle.append(self._build())
+        logger.info(
+            "[WarmCrewPool] Prebuilt %d crews in %.0fms", len(self._idle), (time.perf_counter() - started) * 1000,
+        )
+
+    def _build(self) -> Crew:
+        started = time.perf_counter()
+        crew = self._factory()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._built += 1
+            self._build_ms += elapsed_ms
+        return crew
+
+    def acquire(self) -> Crew:
+        """Lease a crew for one run, building a new one if none is idle."""
+        with self._lock:
+            self._leased += 1
+            if self._idle:
+                self._hits += 1
+                return self._idle.pop()
+            self._misses += 1
+        logger.warning("[WarmCrewPool] No idle crew; building one on demand")
+        return self._build()
+
+    def release(self, crew: Crew) -> None:
+        """Return a leased crew once its run is over, whatever the outcome."""
+        running = _running_task_threads(crew)
+        if running:
+            logger.debug("[WarmCrewPool] Waiting for %d task threads before reusing crew", len(running))
+            threading.Thread(target=self._release_after, args=(crew, running), daemon=True).start()
+            return
+        self._return(crew)
+
+    def _release_after(self, crew: Crew, threads: List[threading.Thread]) -> None:
+        for thread in threads:
+            thread.join()
+        self._return(crew)
+
+    def _return(self, crew: Crew) -> None:
+        _reset_run_state(crew)
+        with self._lock:
+            self._leased -= 1
+            self._idle.append(crew)
+
+    def stats(self) -> dict:
+        """Snapshot of pool occupancy, lease hit rate and build cost."""
+        with self._lock:
+            acquired = self._hits + self._misses
+            return {
+                "built": self._built,
+                "idle": len(self._idle),
+                "leased": self._leased,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / acquired, 3) if acquired else None,
+                "avg_build_ms": round(self._build_ms / self._built, 1) if self._built else 0.0,
+            }
+
+
+__all__ = ["WarmCrewPool"]
@@ -55,6 +55,7 @@ class Settings:
             # OpenAI — third-party convention, no prefix change
             "openai_api_key": ("OPENAI_API_KEY", "openai.api_key", "", str),
             "openai_model_name": ("OPENAI_MODEL_NAME", "openai.model_name", "", str),
+            "openai_base_url": ("OPENAI_BASE_URL", "openai.base_url", "", str),
 
             # Azure OpenAI — third-party convention, no prefix change
             "use_azure_openai": ("USE_AZURE_OPENAI", "azure.use_azure_openai", False, bool),
@@ -73,12 +74,62 @@ class Settings:
             "chat_temperature": ("CHAT_TEMPERATURE", "chat.temperature", 0.3, float),
             "chat_max_tokens": ("CHAT_MAX_TOKENS", "chat.max_tokens", 1024, int),
 
+            # LLM response cache (agents opt in via llm_params.cache in YAML)
+            "llm_cache_enabled": ("LLM_CACHE_ENABLED", "llm_cache.enabled", True, bool),
+            "llm_cache_max_mb": ("LLM_CACHE_MAX_MB", "llm_cache.max_mb", 64, int),
+
+            # Record/replay of crew LLM calls per review
+            "llm_cassette_mode": ("LLM_CASSETTE_MODE", "llm_cassette.mode", "off", str),
+            "llm_cassette_dir": ("LLM_CASSETTE_DIR", "llm_cassette.dir", "cassettes", str),
+            "llm_cassette_time_scale": ("LLM_CASSETTE_TIME_SCALE", "llm_cassette.time_scale", 0.0, float),
+
+            # Shared LLM HTTP connection pool
+            "llm_http_max_connections": ("LLM_HTTP_MAX_CONNECTIONS", "llm_http.max_connections", 20, int),
+            "llm_http_max_keepalive_connections": ("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "llm_http.max_keepalive_connections", 10, int),
+            "llm_http_keepalive_expiry_seconds": ("LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS", "llm_http.keepalive_expiry_seconds", 60, float),
+            "llm_http2": ("LLM_HTTP2", "llm_http.http2", True, bool),
+
             # Reviewer configuration
             "reviewer_max_file_size_mb": ("REVIEWER_MAX_FILE_SIZE_MB", "reviewer.max_file_size_mb", 5, int),
+            "reviewer_extraction_workers": ("REVIEWER_EXTRACTION_WORKERS", "reviewer.extraction_workers", 2, int),
+            "reviewer_extraction_timeout_seconds": ("REVIEWER_EXTRACTION_TIMEOUT_SECONDS", "reviewer.extraction_timeout_seconds", 30, int),
+            "reviewer_pdf_pages_per_task": ("REVIEWER_PDF_PAGES_PER_TASK", "reviewer.pdf_pages_per_task", 16, int),
+            "reviewer_page_cache_max_mb": ("REVIEWER_PAGE_CACHE_MAX_MB", "reviewer.page_cache_max_mb", 64, int),
+            "reviewer_worker_pool_size": ("REVIEWER_WORKER_POOL_SIZE", "reviewer.worker_pool_size", 4, int),
+            "reviewer_worker_queue_depth": ("REVIEWER_WORKER_QUEUE_DEPTH", "reviewer.worker_queue_depth", 16, int),
+            "reviewer_retry_after_seconds": ("REVIEWER_RETRY_AFTER_SECONDS", "reviewer.retry_after_seconds", 30, int),
+            "reviewer_parallel_specialists": ("REVIEWER_PARALLEL_SPECIALISTS", "reviewer.parallel_specialists", True, bool),
+            "reviewer_cancel_on_disconnect": ("REVIEWER_CANCEL_ON_DISCONNECT", "reviewer.cancel_on_disconnect", True, bool),
+            "reviewer_incremental_max_changed_ratio": ("REVIEWER_INCREMENTAL_MAX_CHANGED_RATIO", "reviewer.incremental_max_changed_ratio", 0.3, float),
+            "reviewer_max_document_chars": ("REVIEWER_MAX_DOCUMENT_CHARS", "reviewer.max_document_chars", 200000, int),
+            "reviewer_chunk_chars": ("REVIEWER_CHUNK_CHARS", "reviewer.chunk_chars", 50000, int),
+            "reviewer_chunk_workers": ("REVIEWER_CHUNK_WORKERS", "reviewer.chunk_workers", 4, int),
+            "reviewer_stream_tokens": ("REVIEWER_STREAM_TOKENS", "reviewer.stream_tokens", True, bool),
+            "reviewer_stream_flush_ms": ("REVIEWER_STREAM_FLUSH_MS", "reviewer.stream_flush_ms", 50, int),
+            "reviewer_stream_partials": ("REVIEWER_STREAM_PARTIALS", "reviewer.stream_partials", True, bool),
+
+            # Pre-flight token budget for reviews
+            "review_budget_enabled": ("REVIEW_BUDGET_ENABLED", "review_budget.enabled", True, bool),
+            "review_budget_warn_cost_usd": ("REVIEW_BUDGET_WARN_COST_USD", "review_budget.warn_cost_usd", 0.10, float),
+            "review_budget_max_cost_usd": ("REVIEW_BUDGET_MAX_COST_USD", "review_budget.max_cost_usd", 1.00, float),
+            "review_budget_completion_tokens_per_call": ("REVIEW_BUDGET_COMPLETION_TOKENS_PER_CALL", "review_budget.completion_tokens_per_call", 2000, int),
+
+            # Per-task usage accounting
+            "usage_retention_days": ("USAGE_RETENTION_DAYS", "usage.retention_days", 90, int),
+
+            # Per-review tracing spans
+            "review_tracing_enabled": ("REVIEW_TRACING_ENABLED", "review_tracing.enabled", True, bool),
+            "review_tracing_max_reviews": ("REVIEW_TRACING_MAX_REVIEWS", "review_tracing.max_reviews", 200, int),
+            "review_tracing_export_path": ("REVIEW_TRACING_EXPORT_PATH", "review_tracing.export_path", "", str),
 
             # Storage
             "db_path": ("STORAGE_DB_PATH", "storage.db_path", "", str),
 
+            # Review result cache
+            "review_cache_enabled": ("REVIEW_CACHE_ENABLED", "review_cache.enabled", True, bool),
+            "review_cache_ttl_seconds": ("REVIEW_CACHE_TTL_SECONDS", "review_cache.ttl_seconds", 604800, int),
+            "review_cache_max_entries": ("REVIEW_CACHE_MAX_ENTRIES", "review_cache.max_entries", 500, int),
+
             # Tracing
             "crewai_tracing_enabled": ("CREWAI_TRACING_ENABLED", "tracing.enabled", False, bool),
         }
@@ -100,7 +151,7 @@ class Settings:
                 prop_value = self._get_from_dynaconf(prop_key)
 
                 #print(f"Loading config for {key}: env_var={env_var}, prop_key={prop_key}, prop_value={prop_value}, default_val={default_val}\n")
-                if prop_value:
+                if prop_value is not None:
                     self._config[key] = self._convert_value(prop_value, val_type)
                 else:
                     # Use default
@@ -23,6 +23,7 @@ CORS_HEADERS = "cors_headers"
 # CrewAI configuration
 OPENAI_API_KEY = "openai_api_key"
 OPENAI_MODEL_NAME = "openai_model_name"
+OPENAI_BASE_URL = "openai_base_url"
 
 CREWAI_MANAGER_LLM = "crewai_manager_llm"
 
@@ -42,9 +43,62 @@ CHAT_MODEL = "chat_model"
 CHAT_TEMPERATURE = "chat_temperature"
 CHAT_MAX_TOKENS = "chat_max_tokens"
 
+# LLM response cache
+LLM_CACHE_ENABLED = "llm_cache_enabled"
+LLM_CACHE_MAX_MB = "llm_cache_max_mb"
+
+# LLM cassettes
+LLM_CASSETTE_MODE = "llm_cassette_mode"
+LLM_CASSETTE_DIR = "llm_cassette_dir"
+LLM_CASSETTE_TIME_SCALE = "llm_cassette_time_scale"
+
+# Shared LLM HTTP connection pool
+LLM_HTTP_MAX_CONNECTIONS = "llm_http_max_connections"
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = "llm_http_max_keepalive_connections"
+LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS = "llm_http_keepalive_expiry_seconds"
+LLM_HTTP2 = "llm_http2"
+
+# Reviewer configuration
+REVIEWER_MAX_FILE_SIZE_MB = "reviewer_max_file_size_mb"
+REVIEWER_EXTRACTION_WORKERS = "reviewer_extraction_workers"
+REVIEWER_EXTRACTION_TIMEOUT_SECONDS = "reviewer_extraction_timeout_seconds"
+REVIEWER_PDF_PAGES_PER_TASK = "reviewer_pdf_pages_per_task"
+REVIEWER_PAGE_CACHE_MAX_MB = "reviewer_page_cache_max_mb"
+REVIEWER_WORKER_POOL_SIZE = "reviewer_worker_pool_size"
+REVIEWER_WORKER_QUEUE_DEPTH = "reviewer_worker_queue_depth"
+REVIEWER_RETRY_AFTER_SECONDS = "reviewer_retry_after_seconds"
+REVIEWER_PARALLEL_SPECIALISTS = "reviewer_parallel_specialists"
+REVIEWER_CANCEL_ON_DISCONNECT = "reviewer_cancel_on_disconnect"
+REVIEWER_INCREMENTAL_MAX_CHANGED_RATIO = "reviewer_incremental_max_changed_ratio"
+REVIEWER_MAX_DOCUMENT_CHARS = "reviewer_max_document_chars"
+REVIEWER_CHUNK_CHARS = "reviewer_chunk_chars"
+REVIEWER_CHUNK_WORKERS = "reviewer_chunk_workers"
+REVIEWER_STREAM_TOKENS = "reviewer_stream_tokens"
+REVIEWER_STREAM_FLUSH_MS = "reviewer_stream_flush_ms"
+REVIEWER_STREAM_PARTIALS = "reviewer_stream_partials"
+
+# Pre-flight token budget
+REVIEW_BUDGET_ENABLED = "review_budget_enabled"
+REVIEW_BUDGET_WARN_COST_USD = "review_budget_warn_cost_usd"
+REVIEW_BUDGET_MAX_COST_USD = "review_budget_max_cost_usd"
+REVIEW_BUDGET_COMPLETION_TOKENS_PER_CALL = "review_budget_completion_tokens_per_call"
+
+# Per-task usage accounting
+USAGE_RETENTION_DAYS = "usage_retention_days"
+
+# Per-review tracing spans
+REVIEW_TRACING_ENABLED = "review_tracing_enabled"
+REVIEW_TRACING_MAX_REVIEWS = "review_tracing_max_reviews"
+REVIEW_TRACING_EXPORT_PATH = "review_tracing_export_path"
+
 # Storage
 DB_PATH = "db_path"
 
+# Review result cache
+REVIEW_CACHE_ENABLED = "review_cache_enabled"
+REVIEW_CACHE_TTL_SECONDS = "review_cache_ttl_seconds"
+REVIEW_CACHE_MAX_ENTRIES = "review_cache_max_entries"
+
 # Logging
 LOG_LEVEL = "log_level"
 NOISY_LOGGERS = "noisy_loggers"
@@ -14,6 +14,8 @@ class ReviewRequest(BaseModel):
     design_doc: Optional[str] = None
     correlation_id: Optional[str] = None
     output_format: Literal["markdown", "plain", "json"] = "markdown"
+    # correlation_id of the review of a previous version, for an incremental re-review
+    previous_correlation_id: Optional[str] = None
 
 
 class ReviewResponse(BaseModel):
@@ -22,6 +24,8 @@ class ReviewResponse(BaseModel):
     status: Optional[str] = None
     message: Optional[str] = None
     report: Optional[Dict[str, Any]] = None
+    queue_position: Optional[int] = None
+    cached: Optional[bool] = None
 
 
 class ChatMessageRequest(BaseModel):
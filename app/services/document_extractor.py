@@ -4,13 +4,54 @@ Document text extraction service.
 Responsibility: Extract plain text from uploaded files.
 Does NOT handle HTTP concerns — raises plain Python exceptions.
 The caller (endpoint) is responsible for mapping these to HTTP responses.
+
+UploadSizeLimitMiddleware cuts off an oversized request body while it is
+received; its limit includes multipart overhead, so the extractor checks
+the spooled file's exact size before parsing. Parsers read the file
+Starlette has already spooled:
+one rolled over to disk is opened by the worker through its descriptor,
+a small one still in memory is passed as bytes. Nothing is copied again.
+
+PDF and DOCX parsing is CPU-bound, so it runs in a ProcessPoolExecutor
+with a per-file timeout and never on the event loop. The parse functions
+are module-level so they can be pickled into the worker processes; they
+receive a path or bytes (see ``_parse_source``).
+
+PDFs are extracted page by page: pages are split into batches parsed in
+parallel, and each page's text is cached under a hash of the page's own
+content, so a lightly edited resubmission only re-parses the pages that
+changed. A byte-identical resubmission is answered from the cache by the
+file's SHA-256 without parsing at all.
 """
+import asyncio
+import hashlib
 import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
 from fastapi import UploadFile
 
+from app.common.logger import logger
+from app.common.metrics import EXTRACTION_DURATION
 from app.config.config import settings
+from app.config.config_keys import (
+    REVIEWER_MAX_FILE_SIZE_MB, REVIEWER_EXTRACTION_WORKERS, REVIEWER_EXTRACTION_TIMEOUT_SECONDS,
+    REVIEWER_PDF_PAGES_PER_TASK, REVIEWER_PAGE_CACHE_MAX_MB,
+)
+
+
+# Bytes read at a time while hashing an upload.
+_CHUNK_SIZE = 64 * 1024
+
+# What a worker parses: a path it can open, or the file's bytes.
+ParseSource = Union[str, bytes]
 
 
 class ExtractionError(Exception):
@@ -20,19 +61,70 @@ class ExtractionError(Exception):
         self.status_code = status_code
 
 
+class _TextLRU:
+    """Thread-safe LRU of extracted text, bounded by total characters held."""
+
+    def __init__(self, max_chars: int) -> None:
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous)
+            self._entries[key] = text
+            self._chars += len(text)
+            while self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+
 class DocumentExtractor:
-    """Extracts plain text from uploaded design document files."""
+    """Extracts plain text from uploaded design document files.
+
+    Binary formats are parsed in a lazily started process pool of
+    ``reviewer.extraction_workers`` processes. A parse that exceeds
+    ``reviewer.extraction_timeout_seconds`` fails with 422 and the pool is
+    recycled, since a running task cannot be cancelled inside its process;
+    the other parses it was running are retried on the new pool.
+
+    PDF pages are parsed in one batch per worker (of at least
+    ``reviewer.pdf_pages_per_task`` pages) and cached — whole documents by
+    file hash, pages by page-content hash — in an LRU holding up to
+    ``reviewer.page_cache_max_mb`` of text.
+    """
 
     TEXT_EXTENSIONS = {'.txt', '.md', '.json'}
     SUPPORTED_EXTENSIONS = TEXT_EXTENSIONS | {'.pdf', '.doc', '.docx'}
 
     def __init__(self):
-        max_mb = settings.get_int("reviewer_max_file_size_mb", 5)
+        max_mb = settings.get_int(REVIEWER_MAX_FILE_SIZE_MB, 5)
         self.max_file_size_bytes = max_mb * 1024 * 1024
+        self.max_workers = max(1, settings.get_int(REVIEWER_EXTRACTION_WORKERS, 2))
+        self.timeout_seconds = settings.get_int(REVIEWER_EXTRACTION_TIMEOUT_SECONDS, 30)
+        self.pages_per_task = max(1, settings.get_int(REVIEWER_PDF_PAGES_PER_TASK, 16))
+        self._text_cache = _TextLRU(settings.get_int(REVIEWER_PAGE_CACHE_MAX_MB, 64) * 1024 * 1024)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     async def extract(self, file: UploadFile) -> str:
         """Validate and extract text content from an uploaded file.
 
+        UploadSizeLimitMiddleware has already rejected request bodies well
+        past the limit; the file itself is measured here.
+
         Raises:
             ExtractionError: with status_code 400 for unsupported type,
                              413 for file too large, 422 for extraction failure.
@@ -46,52 +138,266 @@ class DocumentExtractor:
                 status_code=400,
             )
 
-        content = await file.read()
-
-        if len(content) > self.max_file_size_bytes:
+        if _file_size(file.file) > self.max_file_size_bytes:
             max_mb = self.max_file_size_bytes // (1024 * 1024)
             raise ExtractionError(
                 f"File exceeds maximum size of {max_mb}MB",
                 status_code=413,
             )
 
+        timeout = self.timeout_seconds
+        started = time.perf_counter()
         try:
-            return self._extract_content(content, extension)
+            if extension in self.TEXT_EXTENSIONS:
+                return await asyncio.to_thread(_read_text, file.file)
+            source, file_hash = await asyncio.to_thread(_parse_source, file.file)
+            return await self._parse_in_pool(extension, source, file_hash, timeout)
+        except ExtractionError:
+            raise
         except Exception as exc:
             raise ExtractionError(
                 "Could not extract text from file. The file may be corrupted or password-protected.",
             ) from exc
+        finally:
+            EXTRACTION_DURATION.labels(extension).observe(time.perf_counter() - started)
 
-    def _extract_content(self, content: bytes, extension: str) -> str:
-        if extension in self.TEXT_EXTENSIONS:
-            return content.decode('utf-8')
+    async def _parse_in_pool(self, extension: str, source: ParseSource, file_hash: str, timeout: float) -> str:
+        """Parse *source* in the process pool, giving up after *timeout* seconds.
+
+        A parse that times out recycles the pool. Parses of other uploads
+        running in it then fail with BrokenProcessPool; those, like a parse
+        whose worker crashed, are retried once on the new pool.
+        """
+        retried = False
+        while True:
+            executor = self._get_executor()
+            try:
+                return await asyncio.wait_for(self._parse(extension, source, file_hash), timeout=timeout)
+            except asyncio.TimeoutError as exc:
+                logger.warning("[DocumentExtractor] %s extraction timed out after %ss", extension, timeout)
+                self._recycle_executor(executor)
+                raise ExtractionError(f"Text extraction took longer than {timeout}s and was aborted.") from exc
+            except BrokenProcessPool as exc:
+                self._recycle_executor(executor)
+                if retried:
+                    raise ExtractionError(
+                        "The extraction worker stopped unexpectedly while parsing the file. Please try again.",
+                    ) from exc
+                retried = True
+                logger.warning("[DocumentExtractor] Extraction pool broke during a %s parse; retrying once", extension)
+
+    def _parse(self, extension: str, source: ParseSource, file_hash: str) -> Awaitable[str]:
         if extension == '.pdf':
-            return self._extract_pdf(content)
-        return self._extract_docx(content)
+            return self._extract_pdf(source, file_hash)
+        return self._run_in_pool(_extract_docx, source)
+
+    async def _run_in_pool(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
 
-    def _extract_pdf(self, content: bytes) -> str:
-        from pypdf import PdfReader
+    async def _extract_pdf(self, source: ParseSource, file_hash: str) -> str:
+        """Extract a PDF from the cache where possible, parsing missing pages in parallel batches."""
+        document_key = f"file:{file_hash}"
+        text = self._text_cache.get(document_key)
+        if text is not None:
+            logger.debug("[DocumentExtractor] PDF served from cache by file hash")
+            return text
 
-        reader = PdfReader(io.BytesIO(content))
-        pages = [page.extract_text() or '' for page in reader.pages]
-        text = '\n\n'.join(p for p in pages if p.strip())
+        page_keys = await self._run_in_pool(_pdf_page_keys, source)
+        pages: Dict[int, str] = {}
+        for index, page_key in enumerate(page_keys):
+            cached = self._text_cache.get(f"page:{page_key}")
+            if cached is not None:
+                pages[index] = cached
+
+        missing = [index for index in range(len(page_keys)) if index not in pages]
+        # Each task re-opens the PDF, so use as few batches as keep every worker busy.
+        batch_size = max(self.pages_per_task, -(-len(missing) // self.max_workers))
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        results = await asyncio.gather(*(self._run_in_pool(_extract_pdf_pages, source, batch) for batch in batches))
+        for batch, texts in zip(batches, results):
+            for index, page_text in zip(batch, texts):
+                pages[index] = page_text
+                self._text_cache.put(f"page:{page_keys[index]}", page_text)
+        logger.info(
+            "[DocumentExtractor] PDF pages=%d cached=%d parsed=%d batches=%d",
+            len(page_keys), len(page_keys) - len(missing), len(missing), len(batches),
+        )
+
+        text = '\n\n'.join(p for p in (pages[i] for i in range(len(page_keys))) if p.strip())
         if not text.strip():
             raise ExtractionError(
                 "Could not extract text from PDF. The file may be scanned or image-based.",
             )
+        self._text_cache.put(document_key, text)
         return text
 
-    def _extract_docx(self, content: bytes) -> str:
-        from docx import Document
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn, not fork: the server process already runs crew and I/O threads.
+                # Spawned children re-import the launching script, so production
+                # should start via `uvicorn main:app` rather than `python main.py`.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
 
-        doc = Document(io.BytesIO(content))
-        paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-        text = '\n\n'.join(paragraphs)
-        if not text.strip():
-            raise ExtractionError(
-                "Could not extract text from document. The file may be empty.",
-            )
-        return text
+    def _recycle_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Replace *executor* and kill its processes so a stuck parse cannot hold a slot.
+
+        Its other tasks, running or queued, fail with BrokenProcessPool rather
+        than being cancelled, so their callers can retry them.
+        """
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        # ProcessPoolExecutor has no public way to stop a running task.
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Stop the extraction worker processes (called on application shutdown)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _file_size(upload: BinaryIO) -> int:
+    upload.seek(0, os.SEEK_END)
+    size = upload.tell()
+    upload.seek(0)
+    return size
+
+
+def _read_text(upload: BinaryIO) -> str:
+    upload.seek(0)
+    return upload.read().decode('utf-8')
+
+
+def _parse_source(upload: BinaryIO) -> Tuple[ParseSource, str]:
+    """Return what the workers parse *upload* from, and the upload's SHA-256.
+
+    Starlette spools an upload over 1 MB to an unnamed temp file. Its
+    descriptor is only valid in this process, so workers open the file
+    through ``/proc/<pid>/fd``. A smaller upload is still in memory and is
+    passed as bytes, as is any file on a platform without ``/proc``.
+    """
+    upload.seek(0)
+    digest = hashlib.sha256()
+    while chunk := upload.read(_CHUNK_SIZE):
+        digest.update(chunk)
+    # A SpooledTemporaryFile has a name (its descriptor) only once rolled to disk.
+    name = getattr(upload, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return name, digest.hexdigest()
+    if isinstance(name, int):
+        fd_path = f"/proc/{os.getpid()}/fd/{name}"
+        if os.path.exists(fd_path):
+            return fd_path, digest.hexdigest()
+    upload.seek(0)
+    return upload.read(), digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Parsers — run inside the extraction worker processes
+# ---------------------------------------------------------------------------
+
+def _open(source: ParseSource) -> Union[str, BinaryIO]:
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+class _ObjectHasher:
+    """Hashes PDF objects by their resolved content, never by object numbers.
+
+    Indirect objects are hashed once per document and looked up afterwards,
+    so resources shared by many pages (fonts, embedded font files) are read
+    once. A reference back into an object still being hashed (a cycle)
+    hashes as a fixed marker.
+    """
+
+    # Keys that point out of a resource tree, or only describe the stored encoding.
+    _SKIPPED_KEYS = frozenset({"/Parent", "/Length"})
+
+    def __init__(self) -> None:
+        self._digests: Dict[Tuple[int, int], bytes] = {}
+
+    def digest(self, obj: Any) -> bytes:
+        from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+        if isinstance(obj, IndirectObject):
+            ref = (obj.idnum, obj.generation)
+            digest = self._digests.get(ref)
+            if digest is None:
+                self._digests[ref] = b"cycle"
+                digest = self._digests[ref] = self.digest(obj.get_object())
+            return digest
+
+        hasher = hashlib.sha256(type(obj).__name__.encode("utf-8"))
+        if isinstance(obj, StreamObject):
+            try:
+                hasher.update(obj.get_data())
+            except Exception:
+                # A filter pypdf cannot decode: the stored bytes identify the stream as well.
+                hasher.update(obj._data)
+        if isinstance(obj, DictionaryObject):
+            for key in sorted(k for k in obj.keys() if k not in self._SKIPPED_KEYS):
+                hasher.update(key.encode("utf-8"))
+                hasher.update(self.digest(obj.raw_get(key)))
+        elif isinstance(obj, ArrayObject):
+            for item in obj:
+                hasher.update(self.digest(item))
+        else:
+            hasher.update(repr(obj).encode("utf-8"))
+        return hasher.digest()
+
+
+def _page_key(page: Any, hasher: _ObjectHasher) -> str:
+    """Hash of what a page's extracted text depends on: its content streams and resources.
+
+    Resources are hashed in full, including fonts with their encodings and
+    form XObjects with their own resources, so pages drawing text through
+    different forms get different keys. Object numbers are left out, so an
+    unchanged page keeps its key when an edit elsewhere renumbers the
+    file's objects.
+    """
+    node = page
+    # Resources may be inherited from an ancestor in the page tree.
+    while "/Resources" not in node and "/Parent" in node:
+        node = node["/Parent"]
+    digest = hashlib.sha256()
+    digest.update(hasher.digest(page.raw_get("/Contents") if "/Contents" in page else None))
+    digest.update(hasher.digest(node.raw_get("/Resources") if "/Resources" in node else None))
+    return digest.hexdigest()
+
+
+def _pdf_page_keys(source: ParseSource) -> List[str]:
+    from pypdf import PdfReader
+
+    hasher = _ObjectHasher()
+    return [_page_key(page, hasher) for page in PdfReader(_open(source)).pages]
+
+
+def _extract_pdf_pages(source: ParseSource, indices: List[int]) -> List[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(_open(source))
+    return [reader.pages[index].extract_text() or '' for index in indices]
+
+
+def _extract_docx(source: ParseSource) -> str:
+    from docx import Document
+
+    doc = Document(_open(source))
+    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+    text = '\n\n'.join(paragraphs)
+    if not text.strip():
+        raise ExtractionError(
+            "Could not extract text from document. The file may be empty.",
+        )
+    return text
 
 
-__all__ = ['DocumentExtractor', 'ExtractionError']
+__all__ = ['DocumentExtractor', 'ExtractionError', 'ParseSource']
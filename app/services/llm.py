@@ -1,22 +1,93 @@
+"""
+LLM Service — builds the LLMs used by the crew agents and resolves the
+LiteLLM parameters used by the chat service, for OpenAI or Azure OpenAI.
 
+Every LLM call goes through the process-wide pooled HTTP clients owned by
+``llm_http_pool``: CrewAI's native OpenAI client is rebuilt on the shared
+``httpx.Client``, and LiteLLM (Azure agents and chat) is pointed at the
+shared clients through its ``client_session`` / ``aclient_session`` hooks.
+
+Agents whose YAML ``llm_params`` set ``cache: true`` get an LLM that answers
+repeated calls from ``llm_response_cache``.
+
+``llm_params.stream`` makes the LLM stream its responses, emitting
+CrewAI's ``LLMStreamChunkEvent`` per chunk; the call still returns the
+whole response.
+
+With ``llm_cassette.mode`` set, every agent LLM also records its calls per
+review to a cassette file, or replays them from one without calling the
+LLM (see llm_cassette.py).
+
+``OPENAI_BASE_URL`` points the OpenAI agents and chat at another
+OpenAI-compatible server, such as the benchmarks' fake LLM.
+
+``model_pricing`` looks up a model's token prices and context window in
+LiteLLM's bundled model table, for cost estimates and usage accounting.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import litellm
 from crewai import LLM
+from openai import OpenAI
 
 from app.config.config_keys import (
+    OPENAI_BASE_URL,
     USE_AZURE_OPENAI, AZURE_API_VERSION,
     AZURE_ENDPOINT, AZURE_API_KEY,
     AZURE_DEPLOYMENT_NAME,
     AZURE_LLM_TEMPERATURE, AZURE_LLM_TOP_P, AZURE_LLM_MAX_COMPLETION_TOKENS,
 )
 from app.config.config import settings
+from app.common.logger import logger
+from app.services.llm_cache import LLMResponseCache, llm_response_cache
+from app.services.llm_cassette import LLMCassettes, llm_cassettes
+from app.services.llm_http import LLMHttpPool, llm_http_pool
+
+@lru_cache(maxsize=None)
+def model_pricing(model: str) -> Tuple[Optional[float], Optional[float], Optional[int]]:
+    """(input cost per token, output cost per token, context window), None where LiteLLM does not know the model."""
+    try:
+        info = litellm.get_model_info(model)
+    except Exception:
+        logger.warning("[LLMService] No price or context window known for model %s", model)
+        return None, None, None
+    return info.get("input_cost_per_token"), info.get("output_cost_per_token"), info.get("max_input_tokens")
+
 
 class LLMService():
+    http_pool: LLMHttpPool = llm_http_pool
+    response_cache: LLMResponseCache = llm_response_cache
+    cassettes: LLMCassettes = llm_cassettes
+
+    @classmethod
+    def install_http_pool(cls) -> None:
+        """Route LiteLLM through the shared pooled clients. Call once at startup."""
+        litellm.client_session = cls.http_pool.client
+        litellm.aclient_session = cls.http_pool.async_client
+
     def create_llm(self, llm_params: dict) -> LLM:
         """Helper to build an LLM from YAML config"""
         use_azure = settings.get(USE_AZURE_OPENAI, False)
         if use_azure:
-            return self._azure_llm()
+            llm = self._azure_llm(llm_params)
         else:
-            return self._openai_llm(llm_params)
+            llm = self._openai_llm(llm_params)
+        if llm_params.get('cache'):
+            llm = self.response_cache.wrap(llm)
+        # Outermost, so a replay reproduces cache hits too.
+        return self.cassettes.wrap(llm)
+
+    def _use_pooled_client(self, llm: LLM) -> LLM:
+        """Move a native CrewAI OpenAI LLM onto the shared HTTP client.
+
+        Only the sync client is replaced — agents call the LLM synchronously,
+        and the shared async client is bound to the application's event loop.
+        """
+        client = getattr(llm, "client", None)
+        if isinstance(client, OpenAI):
+            llm.client = client.with_options(http_client=self.http_pool.client)
+        return llm
 
     def get_litellm_params(self, llm_params: dict) -> dict:
         """
@@ -33,23 +104,34 @@ class LLMService():
                 "api_base": settings.get(AZURE_ENDPOINT),
                 "api_version": settings.get(AZURE_API_VERSION),
             }
-        return {
-            "model": llm_params.get("model"),
-        }
+        params = {"model": llm_params.get("model")}
+        base_url = settings.get(OPENAI_BASE_URL)
+        if base_url:
+            params["api_base"] = base_url
+        return params
 
     def _openai_llm(self, llm_params: dict) -> LLM:
         """Helper to build an OpenAI LLM from YAML config"""
         
-        return LLM(
+        return self._use_pooled_client(LLM(
             model=llm_params.get('model'),
             temperature=llm_params.get('temperature', 1.0),
-            top_p=llm_params.get('top_p')
-        )
+            top_p=llm_params.get('top_p'),
+            base_url=settings.get(OPENAI_BASE_URL) or None,
+            stream=bool(llm_params.get('stream', False)),
+        ))
     
-    def _azure_llm(self) -> LLM:
-        """Helper to build an Azure LLM from config."""
+    def _azure_llm(self, llm_params: dict) -> LLM:
+        """Helper to build an Azure LLM from config.
+
+        Routed through LiteLLM (``is_litellm``), which the drop_params options
+        below are written for, so the call uses the shared pooled client; the
+        native Azure AI Inference client has no way to share one. Of the YAML
+        params only ``stream`` applies; the rest come from ``[azure_llm]``.
+        """
         return LLM(
             model='azure/' + settings.get(AZURE_DEPLOYMENT_NAME),
+            is_litellm=True,
             api_version=settings.get(AZURE_API_VERSION),
             base_url=settings.get(AZURE_ENDPOINT),
             api_key=settings.get(AZURE_API_KEY),
@@ -58,6 +140,7 @@ class LLMService():
             max_completion_tokens=settings.get_int(AZURE_LLM_MAX_COMPLETION_TOKENS, 4096),
             temperature=settings.get(AZURE_LLM_TEMPERATURE, 1.0),
             top_p=settings.get(AZURE_LLM_TOP_P, 1.0),
+            stream=bool(llm_params.get('stream', False)),
         )
     
-__all__ = ["LLMService"]
+__all__ = ["LLMService", "model_pricing"]
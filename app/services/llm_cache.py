@@ -0,0 +1,135 @@
+"""
+LLM Response Cache — disk-backed cache of raw LLM responses for agents that
+opt in with ``llm_params.cache: true`` in their YAML.
+
+Meant for deterministic agents (temperature 0) such as the librarian: the
+same document yields the same prompt, so a resubmitted document's blueprint
+extraction is answered from disk without an LLM call. Entries are keyed on
+the model, the normalised messages (roles and whitespace-collapsed content),
+the sampling params and the structured-output schema. Calls with tools are
+never cached.
+
+Persistence lives in review_store (same SQLite database); entries are
+evicted least-recently-used once their total size exceeds the bound.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+from app.common.logger import logger
+from app.config.config import settings
+from app.config.config_keys import LLM_CACHE_ENABLED, LLM_CACHE_MAX_MB
+from app.services.review_store import get_llm_response, save_llm_response
+
+# Sampling params that change what an LLM returns for the same messages.
+_SAMPLING_PARAMS = (
+    "temperature", "top_p", "max_tokens", "max_completion_tokens", "seed",
+    "frequency_penalty", "presence_penalty", "stop", "reasoning_effort",
+)
+
+
+def _normalize_messages(messages: Any) -> List[dict]:
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    return [
+        {"role": message.get("role"), "content": " ".join(str(message.get("content") or "").split())}
+        for message in messages
+    ]
+
+
+class LLMResponseCache:
+    """
+    Size-bounded LRU of LLM responses, shared by every cached LLM.
+
+    Args:
+        max_bytes:  Total response size kept; least-recently-hit entries beyond it are evicted.
+        enabled:    When False every lookup misses and nothing is stored, whatever the YAML says.
+    """
+
+    def __init__(self, max_bytes: int, enabled: bool = True) -> None:
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def make_key(self, llm: Any, messages: Any, response_model: Optional[type] = None) -> str:
+        params = {name: getattr(llm, name, None) for name in _SAMPLING_PARAMS}
+        schema = None
+        if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+            schema = response_model.model_json_schema()
+        payload = {
+            "model": getattr(llm, "model", None),
+            "messages": _normalize_messages(messages),
+            "params": params,
+            "response_schema": schema,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """Return the cached response, or None on miss. Storage errors count as a miss."""
+        if not self.enabled:
+            return None
+        try:
+            response = get_llm_response(cache_key)
+        except Exception as exc:
+            logger.error("[LLMResponseCache] Lookup failed: %s", exc)
+            response = None
+        with self._lock:
+            if response is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return response
+
+    def put(self, cache_key: str, response: str) -> None:
+        """Store a response; logs but does not raise on failure."""
+        if not self.enabled:
+            return
+        try:
+            save_llm_response(cache_key, response, self.max_bytes)
+        except Exception as exc:
+            logger.error("[LLMResponseCache] Failed to store response: %s", exc)
+
+    def wrap(self, llm: Any) -> Any:
+        """Make *llm* answer repeated tool-free calls from the cache. Returns *llm*."""
+        call = llm.call
+
+        def cached_call(messages: Any, tools: Optional[list] = None, *args: Any, **kwargs: Any) -> Any:
+            if tools or not self.enabled:
+                return call(messages, tools, *args, **kwargs)
+            cache_key = self.make_key(llm, messages, kwargs.get("response_model"))
+            cached = self.get(cache_key)
+            if cached is not None:
+                logger.info("[LLMResponseCache] Hit for %s (key=%s)", getattr(llm, "model", "?"), cache_key[:12])
+                return cached
+            response = call(messages, tools, *args, **kwargs)
+            if isinstance(response, str) and response.strip():
+                self.put(cache_key, response)
+            return response
+
+        llm.call = cached_call
+        return llm
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "max_mb": self.max_bytes // (1024 * 1024),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            }
+
+
+llm_response_cache = LLMResponseCache(
+    max_bytes=settings.get_int(LLM_CACHE_MAX_MB, 64) * 1024 * 1024,
+    enabled=settings.get_bool(LLM_CACHE_ENABLED, True),
+)
+
+
+__all__ = ["LLMResponseCache", "llm_response_cache"]
@@ -0,0 +1,260 @@
+"""
+LLM Cassettes — record every LLM call of a review to a file, and replay
+them later without an LLM.
+
+``llm_cassette.mode`` picks what the crew LLMs do:
+
+* ``record`` — calls go to the LLM as usual. Each prompt, its response and
+  its timing are kept per correlation_id. When the review ends they are
+  written to ``<llm_cassette.dir>/<correlation_id>.json.gz``, together
+  with the document and output format needed to submit it again.
+* ``replay`` — no LLM is called. The cassette named after the review's
+  correlation_id answers every call, sleeping the recorded call time
+  multiplied by ``llm_cassette.time_scale`` (1 for the original timing,
+  0 for none).
+
+Replay is deterministic whatever order parallel tasks call in. Calls are
+matched on the same key as the response cache: model, normalised messages,
+sampling params and output schema. A call whose prompt is not in the
+cassette gets the next unused response recorded for the same system
+prompt (the same agent), in recording order. So a cassette also replays
+against a slightly different document or an edited task description. A
+call with nothing left to answer it fails the review with
+``LLMCassetteMissException``.
+
+Only the crew LLMs built by LLMService are covered; follow-up chat is not.
+"""
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.common.exception_handlers import LLMCassetteMissException
+from app.common.logger import logger
+from app.common.request_context import get_correlation_id
+from app.config.config import settings
+from app.config.config_keys import LLM_CASSETTE_DIR, LLM_CASSETTE_MODE, LLM_CASSETTE_TIME_SCALE
+from app.services.llm_cache import LLMResponseCache, llm_response_cache
+
+CASSETTE_MODES = ("off", "record", "replay")
+_CASSETTE_VERSION = 1
+# Correlation IDs come from a client header; anything else is hashed into the file name.
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+def _system_key(messages: Any) -> str:
+    """Hash of the call's system prompt, which identifies the agent; empty when there is none."""
+    if isinstance(messages, list):
+        for message in messages:
+            if isinstance(message, dict) and message.get("role") == "system":
+                return hashlib.sha256(str(message.get("content") or "").encode("utf-8")).hexdigest()[:16]
+    return ""
+
+
+@dataclass
+class _Recording:
+    started_ns: int = field(default_factory=time.perf_counter_ns)
+    calls: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class _Replay:
+    by_key: Dict[str, Deque[dict]]
+    by_agent: Dict[str, Deque[dict]]
+    served: int = 0
+
+    @classmethod
+    def from_calls(cls, calls: List[dict]) -> "_Replay":
+        by_key: Dict[str, Deque[dict]] = {}
+        by_agent: Dict[str, Deque[dict]] = {}
+        for call in calls:
+            call["used"] = False
+            by_key.setdefault(call["key"], deque()).append(call)
+            by_agent.setdefault(call["agent"], deque()).append(call)
+        return cls(by_key, by_agent)
+
+    def take(self, key: str, agent: str) -> Optional[dict]:
+        """The call recorded for *key*, else the next unused one of *agent*; None when there is neither."""
+        for queue in (self.by_key.get(key), self.by_agent.get(agent)):
+            while queue:
+                call = queue.popleft()
+                if not call["used"]:
+                    call["used"] = True
+                    self.served += 1
+                    return call
+        return None
+
+    def unused(self) -> int:
+        return sum(1 for queue in self.by_agent.values() for call in queue if not call["used"])
+
+
+class LLMCassettes:
+    """
+    Records and replays the LLM calls of reviews, one cassette per correlation_id.
+
+    Args:
+        mode:        ``off``, ``record`` or ``replay``.
+        directory:   Where cassettes are written and read.
+        time_scale:  Replay sleeps each call's recorded duration times this.
+        cache:       Response cache whose keys calls are matched on.
+    """
+
+    def __init__(self, mode: str, directory: str, time_scale: float = 0.0, cache: LLMResponseCache = llm_response_cache) -> None:
+        if mode not in CASSETTE_MODES:
+            logger.warning("[LLMCassettes] Unknown mode %r; cassettes are off", mode)
+            mode = "off"
+        self.mode = mode
+        self.directory = Path(directory)
+        self.time_scale = max(0.0, time_scale)
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, _Recording] = {}
+        self._replays: Dict[str, _Replay] = {}
+
+    def path_for(self, correlation_id: str) -> Path:
+        name = correlation_id if _SAFE_NAME.match(correlation_id) else hashlib.sha256(correlation_id.encode("utf-8")).hexdigest()
+        return self.directory / f"{name}.json.gz"
+
+    @staticmethod
+    def load(path: Path) -> dict:
+        """Read a cassette file."""
+        with gzip.open(path, "rt", encoding="utf-8") as cassette:
+            return json.load(cassette)
+
+    # ------------------------------------------------------------------
+    # Wrapping
+    # ------------------------------------------------------------------
+
+    def wrap(self, llm: Any) -> Any:
+        """Make *llm* record or replay its calls, per ``mode``. Returns *llm*."""
+        if self.mode == "off":
+            return llm
+        call = llm.call
+
+        def cassette_call(messages: Any, tools: Optional[list] = None, *args: Any, **kwargs: Any) -> Any:
+            correlation_id = get_correlation_id()
+            if correlation_id == "-":
+                return call(messages, tools, *args, **kwargs)
+            response_model = kwargs.get("response_model")
+            key = self._cache.make_key(llm, messages, response_model)
+            if self.mode == "replay":
+                return self._replay(correlation_id, key, _system_key(messages), response_model)
+            started_ns = time.perf_counter_ns()
+            response = call(messages, tools, *args, **kwargs)
+            self._record(correlation_id, {
+                "key": key,
+                "agent": _system_key(messages),
+                "model": getattr(llm, "model", None),
+                "messages": messages,
+                "response": response.model_dump_json() if isinstance(response, BaseModel) else response,
+                "structured": isinstance(response, BaseModel),
+            }, started_ns)
+            return response
+
+        llm.call = cassette_call
+        return llm
+
+    # ------------------------------------------------------------------
+    # Record
+    # ------------------------------------------------------------------
+
+    def _record(self, correlation_id: str, entry: dict, started_ns: int) -> None:
+        if not isinstance(entry["response"], str):
+            logger.warning("[LLMCassettes] Not recording a %s response", type(entry["response"]).__name__)
+            return
+        ended_ns = time.perf_counter_ns()
+        with self._lock:
+            recording = self._recordings.setdefault(correlation_id, _Recording(started_ns=started_ns))
+            entry["offset_ms"] = round((started_ns - recording.started_ns) / 1e6, 1)
+            entry["duration_ms"] = round((ended_ns - started_ns) / 1e6, 1)
+            recording.calls.append(entry)
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def _replay(self, correlation_id: str, key: str, agent: str, response_model: Any) -> Any:
+        with self._lock:
+            replay = self._replays.get(correlation_id)
+        if replay is None:
+            replay = self._open(correlation_id)
+        with self._lock:
+            entry = replay.take(key, agent)
+        if entry is None:
+            raise LLMCassetteMissException(correlation_id, "no recorded response left for this call")
+        if entry["key"] != key:
+            logger.debug("[LLMCassettes] Prompt not recorded; serving the agent's next response (%s)", correlation_id)
+        if self.time_scale:
+            time.sleep(entry["duration_ms"] / 1000 * self.time_scale)
+        if entry["structured"] and isinstance(response_model, type) and issubclass(response_model, BaseModel):
+            return response_model.model_validate_json(entry["response"])
+        return entry["response"]
+
+    def _open(self, correlation_id: str) -> _Replay:
+        path = self.path_for(correlation_id)
+        try:
+            cassette = self.load(path)
+        except FileNotFoundError:
+            raise LLMCassetteMissException(correlation_id, f"no cassette at {path}") from None
+        except (OSError, ValueError) as exc:
+            raise LLMCassetteMissException(correlation_id, f"cannot read {path}: {exc}") from exc
+        replay = _Replay.from_calls(cassette.get("calls", []))
+        with self._lock:
+            # Another task of the same review may have opened it meanwhile.
+            return self._replays.setdefault(correlation_id, replay)
+
+    # ------------------------------------------------------------------
+    # End of a review
+    # ------------------------------------------------------------------
+
+    def finish(self, correlation_id: str, design_doc: str = "", output_format: str = "") -> None:
+        """End *correlation_id*'s cassette: write what was recorded, or forget what was replayed.
+
+        Called once the review's run has ended, whatever its outcome. Logs
+        but does not raise on failure.
+        """
+        if self.mode == "off":
+            return
+        with self._lock:
+            recording = self._recordings.pop(correlation_id, None)
+            replay = self._replays.pop(correlation_id, None)
+        if replay is not None:
+            logger.info("CASSETTE_REPLAYED | job=%s | calls=%d | unused=%d", correlation_id, replay.served, replay.unused())
+        if recording is None or not recording.calls:
+            return
+        path = self.path_for(correlation_id)
+        cassette = {
+            "version": _CASSETTE_VERSION,
+            "correlation_id": correlation_id,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "design_doc": design_doc,
+            "output_format": output_format,
+            "calls": recording.calls,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(path, "wt", encoding="utf-8") as out:
+                json.dump(cassette, out, separators=(",", ":"), default=str)
+        except Exception as exc:
+            logger.error("[LLMCassettes] Failed to write cassette %s: %s", path, exc)
+            return
+        logger.info("CASSETTE_RECORDED | job=%s | calls=%d | path=%s", correlation_id, len(recording.calls), path)
+
+
+llm_cassettes = LLMCassettes(
+    mode=(settings.get(LLM_CASSETTE_MODE, "off") or "off").lower(),
+    directory=settings.get(LLM_CASSETTE_DIR, "cassettes") or "cassettes",
+    time_scale=settings.get(LLM_CASSETTE_TIME_SCALE, 0.0),
+)
+
+
+__all__ = ["CASSETTE_MODES", "LLMCassettes", "llm_cassettes"]
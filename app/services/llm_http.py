@@ -0,0 +1,138 @@
+"""
+Process-wide pooled HTTP clients for every LLM call.
+
+One ``httpx.Client`` (crew agents, which call the LLM synchronously from
+their worker threads) and one ``httpx.AsyncClient`` (follow-up chat on the
+event loop) are shared by all LLMs, so TLS connections to the OpenAI or
+Azure endpoint are kept alive and reused across reviews instead of being
+opened per client. HTTP/2 is negotiated when the ``h2`` package is installed.
+
+Reuse is measured with httpcore's trace extension: a request that had to
+open a connection first is a pool miss, and the time from the start of the
+TCP connect to the first request header written (TCP + TLS) is recorded as
+its connect time. Both are reported on ``GET /api/v1/metrics``.
+"""
+import importlib.util
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from app.common.logger import logger
+from app.common.metrics import LLM_HTTP_CONNECT_DURATION, LLM_HTTP_CONNECTIONS_OPENED, LLM_HTTP_REQUESTS
+from app.config.config import settings
+from app.config.config_keys import (
+    LLM_HTTP2, LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS, LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+)
+
+# Same as the OpenAI SDK's defaults; each SDK call may still override them.
+_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+def _record(connect_seconds: Optional[float]) -> None:
+    LLM_HTTP_REQUESTS.inc()
+    if connect_seconds is not None:
+        LLM_HTTP_CONNECTIONS_OPENED.inc()
+        LLM_HTTP_CONNECT_DURATION.observe(connect_seconds)
+
+
+class _RequestTrace:
+    """Per-request httpcore trace state: did this request open a connection, and how long did it take?"""
+
+    def __init__(self) -> None:
+        self._connect_started: Optional[float] = None
+        self._counted = False
+
+    def on_event(self, name: str) -> None:
+        if name == "connection.connect_tcp.started":
+            self._connect_started = time.perf_counter()
+        elif name.endswith(".send_request_headers.started") and not self._counted:
+            self._counted = True
+            connect_seconds = None
+            if self._connect_started is not None:
+                connect_seconds = time.perf_counter() - self._connect_started
+            _record(connect_seconds)
+
+    def sync_trace(self, name: str, info: dict) -> None:
+        self.on_event(name)
+
+    async def async_trace(self, name: str, info: dict) -> None:
+        self.on_event(name)
+
+
+class LLMHttpPool:
+    """
+    Owns the shared LLM HTTP clients.
+
+    Clients are created on first use. Limits come from the ``[llm_http]``
+    settings.
+    """
+
+    def __init__(self) -> None:
+        self.max_connections = settings.get_int(LLM_HTTP_MAX_CONNECTIONS, 20)
+        self.max_keepalive_connections = settings.get_int(LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS, 10)
+        self.keepalive_expiry_seconds = settings.get(LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS, 60.0)
+        self.http2 = settings.get_bool(LLM_HTTP2, True)
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.info("[LLMHttpPool] HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            self.http2 = False
+
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+    def _attach_trace(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = _RequestTrace().sync_trace
+
+    async def _attach_async_trace(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = _RequestTrace().async_trace
+
+    @property
+    def client(self) -> httpx.Client:
+        """The shared synchronous client."""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    limits=self._limits(),
+                    http2=self.http2,
+                    timeout=_TIMEOUT,
+                    event_hooks={"request": [self._attach_trace]},
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """The shared asynchronous client. Use it from the application's event loop only."""
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    limits=self._limits(),
+                    http2=self.http2,
+                    timeout=_TIMEOUT,
+                    event_hooks={"request": [self._attach_async_trace]},
+                )
+            return self._async_client
+
+    async def aclose(self) -> None:
+        """Close both clients and their pooled connections (application shutdown)."""
+        with self._lock:
+            client, self._client = self._client, None
+            async_client, self._async_client = self._async_client, None
+        if client is not None:
+            client.close()
+        if async_client is not None:
+            await async_client.aclose()
+
+
+llm_http_pool = LLMHttpPool()
+
+
+__all__ = ["LLMHttpPool", "llm_http_pool"]
@@ -0,0 +1,107 @@
+"""
+Review Cache — content-addressed cache of completed review reports.
+
+Resubmitting the same design document (byte-identical or with whitespace-only
+edits) returns the stored ReviewReport instead of running the crew again.
+Entries are keyed on a SHA-256 of the whitespace-normalised document, the
+output format and the agents/tasks YAML version, so editing a prompt
+invalidates every entry automatically.
+
+The cache also keeps the outputs of individual tasks (the DocBlueprint and
+the specialist reviews) keyed on the document alone, plus the output format
+for tasks whose output depends on it. A review the report cache cannot
+answer — the same document in another output format — reuses the stored
+blueprint instead of running the librarian again.
+
+Persistence lives in review_store (same SQLite database).
+"""
+import hashlib
+from typing import Optional
+
+from app.common.logger import logger
+from app.services.review_store import (
+    aget_cached_report, aget_task_output, save_cached_report, save_task_output,
+)
+
+
+def normalize_design_doc(design_doc: str) -> str:
+    """Collapse all whitespace runs to a single space so whitespace-only edits hash equal."""
+    return " ".join(design_doc.split())
+
+
+class ReviewCache:
+    """
+    TTL + size-bounded cache of final review reports.
+
+    Args:
+        config_version:  Hash of the crew's agents/tasks YAML.
+        ttl_seconds:     Entries older than this are treated as misses and evicted.
+        max_entries:     Least-recently-hit entries beyond this count are evicted
+                         (for task outputs: documents beyond this count).
+        enabled:         When False every lookup misses and nothing is stored.
+    """
+
+    def __init__(self, config_version: str, ttl_seconds: int, max_entries: int, enabled: bool = True) -> None:
+        self.config_version = config_version
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+    def make_key(self, design_doc: str, output_format: str) -> str:
+        digest = hashlib.sha256()
+        for part in (normalize_design_doc(design_doc), output_format, self.config_version):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def make_doc_key(self, design_doc: str) -> str:
+        """Key for task outputs of *design_doc* — independent of the output format."""
+        digest = hashlib.sha256()
+        for part in (normalize_design_doc(design_doc), self.config_version):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def aget(self, cache_key: str) -> Optional[dict]:
+        """Return the cached report, or None on miss. Storage errors count as a miss.
+
+        The lookup runs on the store's I/O threads, off the event loop.
+        """
+        if not self.enabled:
+            return None
+        try:
+            return await aget_cached_report(cache_key, self.ttl_seconds)
+        except Exception as exc:
+            logger.error("[ReviewCache] Lookup failed: %s", exc)
+            return None
+
+    def put(self, cache_key: str, final_report: dict) -> None:
+        """Store a report; logs but does not raise on failure."""
+        if not self.enabled:
+            return
+        try:
+            save_cached_report(cache_key, final_report, self.ttl_seconds, self.max_entries)
+        except Exception as exc:
+            logger.error("[ReviewCache] Failed to store report: %s", exc)
+
+    async def aget_task_output(self, doc_key: str, task_name: str, output_format: str = "") -> Optional[dict]:
+        """Return a stored ``{"raw", "output"}`` task output, or None on miss. Storage errors count as a miss."""
+        if not self.enabled:
+            return None
+        try:
+            return await aget_task_output(doc_key, task_name, output_format, self.ttl_seconds)
+        except Exception as exc:
+            logger.error("[ReviewCache] Task output lookup failed: %s", exc)
+            return None
+
+    def put_task_output(self, doc_key: str, task_name: str, raw: str, output: dict, output_format: str = "") -> None:
+        """Store one task's output; logs but does not raise on failure."""
+        if not self.enabled:
+            return
+        try:
+            save_task_output(doc_key, task_name, output_format, raw, output, self.ttl_seconds, self.max_entries)
+        except Exception as exc:
+            logger.error("[ReviewCache] Failed to store %s output: %s", task_name, exc)
+
+
+__all__ = ["ReviewCache", "normalize_design_doc"]
@@ -3,14 +3,34 @@ Review Store — SQLite-backed persistence for review sessions.
 
 Stores the original design document and final report keyed by correlation_id.
 Used by the chat service to provide context for follow-up conversations.
+
+Also holds the review result cache (see review_cache.py): final reports keyed
+by a content hash of the normalised document, with TTL and LRU eviction;
+the per-task outputs of those reviews (blueprint and specialist reviews),
+keyed by document hash so a re-review can reuse them;
+and the LLM response cache (see llm_cache.py): raw responses of opted-in
+agents, evicted least-recently-used once their total size exceeds a bound.
+Per-task token usage and timings of every review run (see task_usage.py)
+are kept next to the sessions, keyed by correlation_id, for a retention
+period.
+
+The plain functions block and are meant for worker threads. Coroutines must
+use the ``a``-prefixed awaitables, which run the same calls — including the
+JSON decoding of the report — on the store's dedicated I/O threads so the
+event loop never waits on SQLite. Every transaction's latency is recorded
+in the ``review_store_query_seconds`` metric.
 """
+import asyncio
 import json
 import sqlite3
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 
+from app.common.metrics import STORE_QUERY_DURATION
 from app.config.config import settings
 
 def _resolve_db_path() -> Path:
@@ -21,32 +41,71 @@ def _resolve_db_path() -> Path:
     return Path(__file__).parent.parent / "review_sessions.db"
 
 _DB_PATH = _resolve_db_path()
-_lock = threading.Lock()
+
+# One connection per thread, kept open for the thread's lifetime so SQLite's
+# per-connection prepared-statement cache survives across calls. WAL lets
+# readers run concurrently with each other and with the single writer;
+# writers are still serialised in-process to avoid SQLITE_BUSY retries.
+_local = threading.local()
+_write_lock = threading.Lock()
+_BUSY_TIMEOUT_MS = 5000
+_STATEMENT_CACHE_SIZE = 64
+
+# Dedicated threads for the awaitable API; each keeps its own connection.
+_IO_THREADS = 4
+_io_executor = ThreadPoolExecutor(max_workers=_IO_THREADS, thread_name_prefix="ReviewStoreIO")
 
 
 def _get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(_DB_PATH), check_same_thread=False)
+    """Return this thread's connection, opening it on first use (or after the DB path changed)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == _DB_PATH:
+        return conn
+    if conn is not None:
+        conn.close()
+    conn = sqlite3.connect(
+        str(_DB_PATH),
+        check_same_thread=False,
+        cached_statements=_STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={_BUSY_TIMEOUT_MS}")
+    _local.conn, _local.path = conn, _DB_PATH
     return conn
 
 
+_READ_DURATION = STORE_QUERY_DURATION.labels("read")
+_WRITE_DURATION = STORE_QUERY_DURATION.labels("write")
+
+
 @contextmanager
-def _db():
-    with _lock:
+def _db(write: bool = False):
+    """Yield this thread's connection; with *write*, hold the writer lock and commit or roll back.
+
+    The time spent inside the block is observed as the query latency.
+    """
+    started = time.perf_counter()
+    try:
         conn = _get_connection()
-        try:
+        if not write:
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            return
+        with _write_lock:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    finally:
+        (_WRITE_DURATION if write else _READ_DURATION).observe(time.perf_counter() - started)
 
 
 def init_db() -> None:
-    """Create the sessions table if it does not exist."""
-    with _db() as conn:
+    """Create the sessions and cache tables if they do not exist."""
+    with _db(write=True) as conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS review_sessions (
@@ -57,11 +116,81 @@ def init_db() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS review_cache (
+                cache_key      TEXT PRIMARY KEY,
+                final_report   TEXT NOT NULL,
+                created_at     REAL NOT NULL,
+                last_hit_at    REAL NOT NULL,
+                hits           INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_review_cache_last_hit ON review_cache (last_hit_at)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_output_cache (
+                doc_key        TEXT NOT NULL,
+                task_name      TEXT NOT NULL,
+                output_format  TEXT NOT NULL,
+                raw            TEXT NOT NULL,
+                output         TEXT NOT NULL,
+                created_at     REAL NOT NULL,
+                last_hit_at    REAL NOT NULL,
+                hits           INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (doc_key, task_name, output_format)
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_output_cache_last_hit ON task_output_cache (last_hit_at)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                cache_key      TEXT PRIMARY KEY,
+                response       TEXT NOT NULL,
+                size_bytes     INTEGER NOT NULL,
+                created_at     REAL NOT NULL,
+                last_hit_at    REAL NOT NULL,
+                hits           INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_hit ON llm_response_cache (last_hit_at)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_usage (
+                correlation_id       TEXT NOT NULL,
+                task_name            TEXT NOT NULL,
+                agent                TEXT NOT NULL,
+                model                TEXT NOT NULL,
+                status               TEXT NOT NULL,
+                prompt_tokens        INTEGER NOT NULL,
+                completion_tokens    INTEGER NOT NULL,
+                cached_prompt_tokens INTEGER NOT NULL,
+                llm_calls            INTEGER NOT NULL,
+                retries              INTEGER NOT NULL,
+                wall_ms              REAL NOT NULL,
+                cost_usd             REAL,
+                completed_at         REAL NOT NULL,
+                PRIMARY KEY (correlation_id, task_name)
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_usage_completed_at ON task_usage (completed_at)"
+        )
 
 
 def save_review(correlation_id: str, design_doc: str, final_report: dict) -> None:
     """Persist a completed review session."""
-    with _db() as conn:
+    with _db(write=True) as conn:
         conn.execute(
             """
             INSERT INTO review_sessions (correlation_id, design_doc, final_report)
@@ -98,4 +227,291 @@ def get_review(correlation_id: str) -> Optional[dict]:
     }
 
 
-__all__ = ["init_db", "save_review", "get_review"]
+def get_cached_report(cache_key: str, ttl_seconds: int) -> Optional[dict]:
+    """
+    Return the cached final report for *cache_key*, or None on miss.
+    Expired entries are deleted on read; hits refresh the LRU timestamp.
+    """
+    now = time.time()
+    with _db() as conn:
+        row = conn.execute(
+            "SELECT final_report, created_at FROM review_cache WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+    if row is None:
+        return None
+    with _db(write=True) as conn:
+        if now - row["created_at"] > ttl_seconds:
+            conn.execute("DELETE FROM review_cache WHERE cache_key = ?", (cache_key,))
+            return None
+        conn.execute(
+            "UPDATE review_cache SET last_hit_at = ?, hits = hits + 1 WHERE cache_key = ?",
+            (now, cache_key),
+        )
+    return json.loads(row["final_report"])
+
+
+def save_cached_report(cache_key: str, final_report: dict, ttl_seconds: int, max_entries: int) -> None:
+    """Store a final report in the cache, then evict expired and least-recently-used entries."""
+    now = time.time()
+    with _db(write=True) as conn:
+        conn.execute(
+            """
+            INSERT INTO review_cache (cache_key, final_report, created_at, last_hit_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                final_report = excluded.final_report,
+                created_at   = excluded.created_at,
+                last_hit_at  = excluded.last_hit_at
+            """,
+            (cache_key, json.dumps(final_report), now, now),
+        )
+        conn.execute("DELETE FROM review_cache WHERE created_at < ?", (now - ttl_seconds,))
+        conn.execute(
+            """
+            DELETE FROM review_cache WHERE cache_key IN (
+                SELECT cache_key FROM review_cache
+                ORDER BY last_hit_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_entries,),
+        )
+
+
+def get_task_output(doc_key: str, task_name: str, output_format: str, ttl_seconds: int) -> Optional[dict]:
+    """
+    Return a stored task output as ``{"raw": str, "output": dict}``, or None on miss.
+    Expired entries are deleted on read; hits refresh the LRU timestamp.
+    """
+    now = time.time()
+    params = (doc_key, task_name, output_format)
+    with _db() as conn:
+        row = conn.execute(
+            "SELECT raw, output, created_at FROM task_output_cache "
+            "WHERE doc_key = ? AND task_name = ? AND output_format = ?",
+            params,
+        ).fetchone()
+    if row is None:
+        return None
+    with _db(write=True) as conn:
+        if now - row["created_at"] > ttl_seconds:
+            conn.execute(
+                "DELETE FROM task_output_cache WHERE doc_key = ? AND task_name = ? AND output_format = ?",
+                params,
+            )
+            return None
+        conn.execute(
+            "UPDATE task_output_cache SET last_hit_at = ?, hits = hits + 1 "
+            "WHERE doc_key = ? AND task_name = ? AND output_format = ?",
+            (now, *params),
+        )
+    return {"raw": row["raw"], "output": json.loads(row["output"])}
+
+
+def save_task_output(
+    doc_key: str,
+    task_name: str,
+    output_format: str,
+    raw: str,
+    output: dict,
+    ttl_seconds: int,
+    max_documents: int,
+) -> None:
+    """Store one task's output, then evict expired entries and the least-recently-used documents."""
+    now = time.time()
+    with _db(write=True) as conn:
+        conn.execute(
+            """
+            INSERT INTO task_output_cache (doc_key, task_name, output_format, raw, output, created_at, last_hit_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(doc_key, task_name, output_format) DO UPDATE SET
+                raw         = excluded.raw,
+                output      = excluded.output,
+                created_at  = excluded.created_at,
+                last_hit_at = excluded.last_hit_at
+            """,
+            (doc_key, task_name, output_format, raw, json.dumps(output), now, now),
+        )
+        conn.execute("DELETE FROM task_output_cache WHERE created_at < ?", (now - ttl_seconds,))
+        conn.execute(
+            """
+            DELETE FROM task_output_cache WHERE doc_key IN (
+                SELECT doc_key FROM task_output_cache
+                GROUP BY doc_key
+                ORDER BY MAX(last_hit_at) DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_documents,),
+        )
+
+
+def get_llm_response(cache_key: str) -> Optional[str]:
+    """Return the cached LLM response for *cache_key*, or None on miss. Hits refresh the LRU timestamp."""
+    with _db() as conn:
+        row = conn.execute(
+            "SELECT response FROM llm_response_cache WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+    if row is None:
+        return None
+    with _db(write=True) as conn:
+        conn.execute(
+            "UPDATE llm_response_cache SET last_hit_at = ?, hits = hits + 1 WHERE cache_key = ?",
+            (time.time(), cache_key),
+        )
+    return row["response"]
+
+
+def save_llm_response(cache_key: str, response: str, max_bytes: int) -> None:
+    """Store an LLM response, then evict least-recently-used entries beyond *max_bytes* in total."""
+    now = time.time()
+    with _db(write=True) as conn:
+        conn.execute(
+            """
+            INSERT INTO llm_response_cache (cache_key, response, size_bytes, created_at, last_hit_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                response    = excluded.response,
+                size_bytes  = excluded.size_bytes,
+                created_at  = excluded.created_at,
+                last_hit_at = excluded.last_hit_at
+            """,
+            (cache_key, response, len(response.encode("utf-8")), now, now),
+        )
+        conn.execute(
+            """
+            DELETE FROM llm_response_cache WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key, SUM(size_bytes) OVER (ORDER BY last_hit_at DESC, cache_key) AS running
+                    FROM llm_response_cache
+                ) WHERE running > ?
+            )
+            """,
+            (max_bytes,),
+        )
+
+
+_USAGE_COLUMNS = (
+    "correlation_id", "task_name", "agent", "model", "status", "prompt_tokens", "completion_tokens",
+    "cached_prompt_tokens", "llm_calls", "retries", "wall_ms", "cost_usd", "completed_at",
+)
+
+# Aggregates reported for every usage group; cost_usd is NULL if no row in the group was priced.
+_USAGE_AGGREGATES = """
+    COUNT(DISTINCT correlation_id) AS reviews,
+    COUNT(*)                       AS tasks,
+    SUM(llm_calls)                 AS llm_calls,
+    SUM(retries)                   AS retries,
+    SUM(prompt_tokens)             AS prompt_tokens,
+    SUM(completion_tokens)         AS completion_tokens,
+    SUM(cached_prompt_tokens)      AS cached_prompt_tokens,
+    ROUND(SUM(cost_usd), 6)        AS cost_usd,
+    ROUND(AVG(wall_ms), 1)         AS avg_wall_ms,
+    ROUND(MAX(wall_ms), 1)         AS max_wall_ms
+"""
+
+
+def save_task_usage(usage: dict, retention_seconds: int) -> None:
+    """Store one task's usage record, then delete records older than *retention_seconds*."""
+    with _db(write=True) as conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO task_usage ({', '.join(_USAGE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _USAGE_COLUMNS)})",
+            tuple(usage[column] for column in _USAGE_COLUMNS),
+        )
+        conn.execute("DELETE FROM task_usage WHERE completed_at < ?", (time.time() - retention_seconds,))
+
+
+def get_task_usage(correlation_id: str) -> list:
+    """Usage records of one review run, in completion order."""
+    with _db() as conn:
+        rows = conn.execute(
+            "SELECT * FROM task_usage WHERE correlation_id = ? ORDER BY completed_at",
+            (correlation_id,),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_usage_summary(since: float) -> dict:
+    """Usage of the tasks completed since *since* (epoch seconds): totals, and per UTC day, model and agent."""
+    groups = {
+        "by_day": "date(completed_at, 'unixepoch')",
+        "by_model": "model",
+        "by_agent": "agent",
+    }
+    with _db() as conn:
+        totals = conn.execute(
+            f"SELECT {_USAGE_AGGREGATES} FROM task_usage WHERE completed_at >= ?", (since,),
+        ).fetchone()
+        summary = {"totals": dict(totals)}
+        for name, expression in groups.items():
+            order = "key" if name == "by_day" else "cost_usd DESC, prompt_tokens DESC"
+            rows = conn.execute(
+                f"SELECT {expression} AS key, {_USAGE_AGGREGATES} FROM task_usage "
+                f"WHERE completed_at >= ? GROUP BY key ORDER BY {order}",
+                (since,),
+            ).fetchall()
+            summary[name] = [dict(row) for row in rows]
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# Awaitable API — for coroutines on the event loop
+# ---------------------------------------------------------------------------
+
+async def _run_io(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_io_executor, func, *args)
+
+
+async def aget_review(correlation_id: str) -> Optional[dict]:
+    """Awaitable ``get_review``."""
+    return await _run_io(get_review, correlation_id)
+
+
+async def asave_review(correlation_id: str, design_doc: str, final_report: dict) -> None:
+    """Awaitable ``save_review``."""
+    await _run_io(save_review, correlation_id, design_doc, final_report)
+
+
+async def aget_cached_report(cache_key: str, ttl_seconds: int) -> Optional[dict]:
+    """Awaitable ``get_cached_report``."""
+    return await _run_io(get_cached_report, cache_key, ttl_seconds)
+
+
+async def aget_task_output(doc_key: str, task_name: str, output_format: str, ttl_seconds: int) -> Optional[dict]:
+    """Awaitable ``get_task_output``."""
+    return await _run_io(get_task_output, doc_key, task_name, output_format, ttl_seconds)
+
+
+async def aget_task_usage(correlation_id: str) -> list:
+    """Awaitable ``get_task_usage``."""
+    return await _run_io(get_task_usage, correlation_id)
+
+
+async def aget_usage_summary(since: float) -> dict:
+    """Awaitable ``get_usage_summary``."""
+    return await _run_io(get_usage_summary, since)
+
+
+__all__ = [
+    "init_db",
+    "save_review",
+    "get_review",
+    "get_cached_report",
+    "save_cached_report",
+    "get_task_output",
+    "save_task_output",
+    "get_llm_response",
+    "save_llm_response",
+    "save_task_usage",
+    "get_task_usage",
+    "get_usage_summary",
+    "aget_review",
+    "asave_review",
+    "aget_cached_report",
+    "aget_task_output",
+    "aget_task_usage",
+    "aget_usage_summary",
+]
@@ -0,0 +1,290 @@
+"""
+Review budget — pre-flight estimate of a review's tokens and cost, made
+before the crew is kicked off and before any LLM call.
+
+Every task prompt is rebuilt from tasks.yaml the way the crew will send it
+(agent persona, task description with the document interpolated, expected
+output, output schema, and the upstream task outputs in its context) and
+counted with the model's tiktoken encoding. Completions are not known in
+advance; each call is assumed to use the agent LLM's ``max_tokens``, or
+``review_budget.completion_tokens_per_call`` when it sets none. Prices and
+context windows come from LiteLLM's bundled model table, which also ships
+the tiktoken encodings, so estimating needs no network access.
+
+The estimate assumes a full review; a reused blueprint or specialist review
+only makes the real run cheaper.
+
+Two routes are priced: ``single``, where the librarian reads the whole
+document in one prompt (which interpolates it twice), and ``chunked``, where
+it reads the parts of ``reviewer_chunking.split_document`` (once each).
+Documents longer than ``reviewer.chunk_chars`` are always chunked. Shorter
+ones take the single route unless it overflows the librarian's context
+window or exceeds ``review_budget.max_cost_usd`` and the chunked route does
+not.
+"""
+import threading
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+import litellm  # noqa: F401  imported first: points tiktoken at LiteLLM's bundled encodings
+import tiktoken
+from crewai import Crew, Task
+from crewai.utilities.string_utils import interpolate_only
+
+from app.common.exception_handlers import ReviewBudgetExceededException
+from app.services.llm import model_pricing
+from app.services.reviewer.reviewer_chunking import split_document
+
+# Tokens CrewAI adds around every task prompt (format instructions, headings).
+_PROMPT_OVERHEAD_TOKENS = 300
+_FALLBACK_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(model.split("/")[-1])
+    except KeyError:
+        return tiktoken.get_encoding(_FALLBACK_ENCODING)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Number of tokens *text* takes in *model*'s prompt (cl100k_base for unknown models)."""
+    return len(_encoding(model).encode(text, disallowed_special=()))
+
+
+def _usd(cost: Optional[float]) -> str:
+    if cost is None:
+        return "unknown"
+    return f"{cost:.4f}"
+
+
+@dataclass(frozen=True)
+class TaskEstimate:
+    """Predicted usage of one task: *calls* LLM calls, the largest of which sends *max_prompt_tokens*."""
+
+    task: str
+    model: str
+    calls: int
+    prompt_tokens: int
+    max_prompt_tokens: int
+    completion_tokens: int
+    context_window: Optional[int]
+    cost_usd: Optional[float]
+
+    @property
+    def overflows(self) -> bool:
+        """True when the largest call does not fit the model's context window."""
+        if self.context_window is None:
+            return False
+        return self.max_prompt_tokens + self.completion_tokens // self.calls > self.context_window
+
+
+@dataclass(frozen=True)
+class ReviewEstimate:
+    """Predicted usage of a whole review on one route."""
+
+    route: str
+    tasks: List[TaskEstimate]
+    # Document parts the librarian reads on the chunked route.
+    parts: List[str] = field(default_factory=list, repr=False)
+    warning: Optional[str] = None
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(t.prompt_tokens for t in self.tasks)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(t.completion_tokens for t in self.tasks)
+
+    @property
+    def cost_usd(self) -> Optional[float]:
+        """Total predicted cost, or None if any model is unpriced."""
+        costs = [t.cost_usd for t in self.tasks]
+        return None if None in costs else sum(costs)
+
+    def cost_by_model(self) -> Dict[str, Optional[float]]:
+        by_model: Dict[str, Optional[float]] = {}
+        for t in self.tasks:
+            known = by_model.get(t.model, 0.0)
+            by_model[t.model] = None if known is None or t.cost_usd is None else known + t.cost_usd
+        return by_model
+
+    @property
+    def overflow(self) -> Optional[TaskEstimate]:
+        """The first task whose prompt does not fit its model's context window."""
+        return next((t for t in self.tasks if t.overflows), None)
+
+    def header_value(self) -> str:
+        """The estimate as the ``X-Review-Estimate`` response header."""
+        by_model = ",".join(f"{model}:{_usd(cost)}" for model, cost in self.cost_by_model().items())
+        return (
+            f"prompt_tokens={self.prompt_tokens}; completion_tokens={self.completion_tokens}; "
+            f"cost_usd={_usd(self.cost_usd)}; route={self.route}; parts={len(self.parts) or 1}; "
+            f"cost_by_model={by_model}"
+        )
+
+
+class ReviewBudget:
+    """
+    Estimates reviews against the crew built by *crew_factory* and enforces
+    the cost limits.
+
+    The crew is built once, on first use, and only read: its tasks carry the
+    uninterpolated prompts, agents, context and output models of a real run.
+
+    Args:
+        crew_factory:               Builds a DesignReviewerCrew crew.
+        chunk_prompt:               Per-part librarian prompt (tasks.yaml ``extract_blueprint_chunk_task``).
+        chunk_chars:                ``reviewer.chunk_chars``; longer documents are always chunked.
+        completion_tokens_per_call: Completion size assumed when an agent's LLM sets no ``max_tokens``.
+        warn_cost_usd:              Reviews predicted to cost more get a warning event.
+        max_cost_usd:               Reviews predicted to cost more are rejected.
+    """
+
+    def __init__(
+        self,
+        crew_factory: Callable[[], Crew],
+        chunk_prompt: str,
+        chunk_chars: int,
+        completion_tokens_per_call: int,
+        warn_cost_usd: float,
+        max_cost_usd: float,
+    ) -> None:
+        self._crew_factory = crew_factory
+        self._chunk_prompt = chunk_prompt
+        self.chunk_chars = chunk_chars
+        self.completion_tokens_per_call = completion_tokens_per_call
+        self.warn_cost_usd = warn_cost_usd
+        self.max_cost_usd = max_cost_usd
+        self._crew: Optional[Crew] = None
+        self._crew_lock = threading.Lock()
+
+    def _tasks(self) -> List[Task]:
+        with self._crew_lock:
+            if self._crew is None:
+                self._crew = self._crew_factory()
+            return self._crew.tasks
+
+    # ------------------------------------------------------------------
+    # Prompt sizes
+    # ------------------------------------------------------------------
+
+    def _completion_tokens(self, task: Task) -> int:
+        llm = task.agent.llm
+        return getattr(llm, "max_completion_tokens", None) or getattr(llm, "max_tokens", None) or self.completion_tokens_per_call
+
+    @staticmethod
+    def _fixed_prompt(task: Task, description: str) -> str:
+        """Everything a call of *task* sends besides the document and its context."""
+        agent = task.agent
+        schema = task.output_pydantic.model_json_schema() if task.output_pydantic else ""
+        return (
+            f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}\n"
+            f"{description}\n{task.expected_output}\n{schema}"
+        )
+
+    def _estimate_task(self, task: Task, calls: int, prompt_tokens: List[int]) -> TaskEstimate:
+        model = task.agent.llm.model
+        input_cost, output_cost, context_window = model_pricing(model)
+        completion_tokens = self._completion_tokens(task) * calls
+        total_prompt = sum(prompt_tokens)
+        cost = None
+        if input_cost is not None and output_cost is not None:
+            cost = total_prompt * input_cost + completion_tokens * output_cost
+        return TaskEstimate(
+            task=task.name,
+            model=model,
+            calls=calls,
+            prompt_tokens=total_prompt,
+            max_prompt_tokens=max(prompt_tokens),
+            completion_tokens=completion_tokens,
+            context_window=context_window,
+            cost_usd=cost,
+        )
+
+    def _estimate_route(self, design_doc: str, output_format: str, parts: Optional[List[str]]) -> ReviewEstimate:
+        """Estimate every task; the first task (the librarian) reads *parts* if given, else the whole document."""
+        tasks = self._tasks()
+        estimates: List[TaskEstimate] = []
+        for index, task in enumerate(tasks):
+            model = task.agent.llm.model
+            if index == 0 and parts:
+                fixed = count_tokens(self._fixed_prompt(task, self._chunk_prompt), model)
+                prompts = [fixed + count_tokens(part, model) for part in parts]
+            else:
+                template = task.description
+                # Count the document once, however often the description interpolates it.
+                description = interpolate_only(template, {"design_doc": "", "output_format": output_format})
+                doc_tokens = count_tokens(design_doc, model) * template.count("{design_doc}") if design_doc else 0
+                context = task.context if isinstance(task.context, list) else []
+                context_tokens = sum(self._completion_tokens(upstream) for upstream in context)
+                prompts = [count_tokens(self._fixed_prompt(task, description), model) + doc_tokens + context_tokens]
+            prompts = [tokens + _PROMPT_OVERHEAD_TOKENS for tokens in prompts]
+            estimates.append(self._estimate_task(task, len(prompts), prompts))
+        return ReviewEstimate(route="chunked" if parts else "single", tasks=estimates, parts=parts or [])
+
+    def _fitted_chunk_chars(self, single: ReviewEstimate, design_doc: str) -> int:
+        """Part size that keeps each chunked librarian prompt inside its context window."""
+        librarian = single.tasks[0]
+        if librarian.context_window is None:
+            return self.chunk_chars
+        task = self._tasks()[0]
+        model = task.agent.llm.model
+        fixed = count_tokens(self._fixed_prompt(task, self._chunk_prompt), model) + _PROMPT_OVERHEAD_TOKENS
+        room = librarian.context_window - self._completion_tokens(task) - fixed
+        doc_tokens = count_tokens(design_doc, model)
+        if room <= 0 or doc_tokens == 0:
+            return self.chunk_chars
+        return max(1, min(self.chunk_chars, int(len(design_doc) * room / doc_tokens)))
+
+    def _over_budget(self, estimate: ReviewEstimate) -> bool:
+        cost = estimate.cost_usd
+        return estimate.overflow is not None or (cost is not None and cost > self.max_cost_usd)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def estimate(self, design_doc: str, output_format: str) -> ReviewEstimate:
+        """Estimate a review of *design_doc* on the cheapest route that fits. CPU-bound: call off the event loop."""
+        if len(design_doc) > self.chunk_chars:
+            estimate = self._estimate_route(design_doc, output_format, split_document(design_doc, self.chunk_chars))
+        else:
+            estimate = self._estimate_route(design_doc, output_format, None)
+            if self._over_budget(estimate):
+                parts = split_document(design_doc, self._fitted_chunk_chars(estimate, design_doc))
+                chunked = self._estimate_route(design_doc, output_format, parts)
+                if not self._over_budget(chunked) or (chunked.cost_usd or 0.0) < (estimate.cost_usd or 0.0):
+                    estimate = chunked
+        cost = estimate.cost_usd
+        if cost is not None and self.warn_cost_usd < cost <= self.max_cost_usd:
+            estimate = replace(
+                estimate,
+                warning=f"This review is estimated to cost ${_usd(cost)} "
+                        f"({estimate.prompt_tokens:,} prompt tokens, {estimate.completion_tokens:,} completion tokens).",
+            )
+        return estimate
+
+    def check(self, estimate: ReviewEstimate) -> None:
+        """Raise ReviewBudgetExceededException if *estimate* overflows a context window or exceeds the cost limit."""
+        overflow = estimate.overflow
+        if overflow is not None:
+            raise ReviewBudgetExceededException(
+                f"The document is too large to review: {overflow.task} would send about "
+                f"{overflow.max_prompt_tokens:,} tokens to {overflow.model}, whose context window "
+                f"is {overflow.context_window:,} tokens.",
+                estimate.header_value(),
+            )
+        cost = estimate.cost_usd
+        if cost is not None and cost > self.max_cost_usd:
+            raise ReviewBudgetExceededException(
+                f"This review is estimated to cost ${_usd(cost)}, above the limit of ${_usd(self.max_cost_usd)}. "
+                "Submit a shorter document.",
+                estimate.header_value(),
+            )
+
+
+__all__ = ["TaskEstimate", "ReviewEstimate", "ReviewBudget", "count_tokens"]
@@ -0,0 +1,246 @@
+"""
+Chunked blueprint extraction — map-reduce for documents too long for one
+librarian prompt.
+
+The document is split at section headings into parts of at most
+``reviewer.chunk_chars`` characters. The librarian extracts a partial
+DocBlueprint from every part in parallel, and the partials are merged
+deterministically into one blueprint, with no further LLM call, which then
+feeds the specialist tasks as usual. Wall-clock time stays close to that of
+a single part.
+
+Plugged into the crew as the reused output of ``extract_blueprint_task``: a
+resolver that runs when the task is about to start, in place of the task.
+"""
+import contextvars
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from crewai import Task
+from crewai.events import AgentExecutionStartedEvent, crewai_event_bus
+from crewai.utilities.string_utils import interpolate_only
+from pydantic import BaseModel, ValidationError
+
+from app.common.cancellation import get_cancel_token
+from app.common.logger import logger
+from app.models.blueprint_schema import DocBlueprint
+
+# tasks.yaml entry holding the per-part extraction prompt.
+CHUNK_PROMPT = "extract_blueprint_chunk_task"
+
+# Markdown headings, and numbered headings as PDF extraction leaves them ("3.2 Storage Layer").
+_HEADING = re.compile(r"^(?:#{1,6}\s+\S|\d+(?:\.\d+)*\.?\s+[A-Z][^.!?]{0,80}$)")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_UNKNOWN = {"", "unknown", "unspecified", "n/a", "none"}
+# LLM calls per part before a response that does not parse skips the part.
+_PART_ATTEMPTS = 2
+
+
+# ---------------------------------------------------------------------------
+# Split
+# ---------------------------------------------------------------------------
+
+def _sections(design_doc: str) -> List[str]:
+    """Split at heading lines; each section starts with its heading."""
+    sections: List[str] = []
+    current: List[str] = []
+    for line in design_doc.splitlines(keepends=True):
+        if current and _HEADING.match(line.strip()):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def _pieces(section: str, max_chars: int) -> Iterable[str]:
+    """Yield *section* whole, or cut at paragraph breaks — and hard limits as a last resort."""
+    if len(section) <= max_chars:
+        yield section
+        return
+    step = max(1, max_chars - 2)  # room for the paragraph break re-added below
+    for paragraph in _PARAGRAPH_BREAK.split(section):
+        for start in range(0, len(paragraph), step):
+            yield paragraph[start:start + step] + "\n\n"
+
+
+def split_document(design_doc: str, max_chars: int) -> List[str]:
+    """Split *design_doc* at headings into parts of at most *max_chars*, packing consecutive sections together."""
+    parts: List[str] = []
+    current = ""
+    for section in _sections(design_doc):
+        for piece in _pieces(section, max_chars):
+            if current and len(current) + len(piece) > max_chars:
+                parts.append(current)
+                current = ""
+            current += piece
+    if current.strip():
+        parts.append(current)
+    return parts
+
+
+# ---------------------------------------------------------------------------
+# Merge
+# ---------------------------------------------------------------------------
+
+def _name_key(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _known(value: str) -> bool:
+    return _name_key(value) not in _UNKNOWN
+
+
+def _union(lists: Iterable[List[str]]) -> List[str]:
+    """Order-preserving union of string lists, ignoring case and whitespace differences."""
+    seen: Dict[str, str] = {}
+    for values in lists:
+        for value in values:
+            seen.setdefault(_name_key(value), value)
+    return list(seen.values())
+
+
+def merge_blueprints(partials: List[DocBlueprint]) -> DocBlueprint:
+    """
+    Merge partial blueprints, in document order, into one.
+
+    Components are matched by name and interactions by source, destination
+    and protocol; the first occurrence wins, with unknown technology or
+    protocol details filled in from later parts. The architectural style is
+    the one most parts report. The document is valid if any part is.
+    """
+    identities = [p.system_identity for p in partials]
+    styles = Counter(identity.primary_style for identity in identities)
+    top = max(styles.values())
+
+    components: Dict[str, Any] = {}
+    for partial in partials:
+        for component in partial.component_registry:
+            existing = components.setdefault(_name_key(component.name), component.model_copy())
+            if not _known(existing.technology) and _known(component.technology):
+                existing.technology = component.technology
+
+    interactions: Dict[Tuple[str, str, str], Any] = {}
+    for partial in partials:
+        for interaction in partial.interaction_map:
+            key = (_name_key(interaction.source), _name_key(interaction.destination), _name_key(interaction.protocol))
+            interactions.setdefault(key, interaction)
+    # An interaction with an unknown protocol is dropped when another part names it.
+    named = {(source, destination) for source, destination, protocol in interactions if _known(protocol)}
+    interaction_map = [
+        interaction for (source, destination, protocol), interaction in interactions.items()
+        if _known(protocol) or (source, destination) not in named
+    ]
+
+    is_valid = any(p.is_valid for p in partials)
+    return DocBlueprint(
+        is_valid=is_valid,
+        validation_errors=[] if is_valid else _union(p.validation_errors for p in partials),
+        system_identity={
+            "name": next((i.name for i in identities if _known(i.name)), identities[0].name),
+            "primary_style": next(i.primary_style for i in identities if styles[i.primary_style] == top),
+            "deployment_target": next(
+                (i.deployment_target for i in identities if _known(i.deployment_target)),
+                identities[0].deployment_target,
+            ),
+            "stated_goals": _union(i.stated_goals for i in identities),
+        },
+        component_registry=list(components.values()),
+        interaction_map=interaction_map,
+        technical_constraints={
+            field: _union(getattr(p.technical_constraints, field) for p in partials)
+            for field in ("traffic_expectations", "performance_requirements", "security_requirements")
+        },
+        omission={
+            field: _union(getattr(p.omission, field) for p in partials)
+            for field in ("missing_from_diagram", "missing_from_text")
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# Map
+# ---------------------------------------------------------------------------
+
+def _parse_blueprint(response: Any) -> DocBlueprint:
+    if isinstance(response, BaseModel):
+        return DocBlueprint.model_validate(response.model_dump())
+    text = str(response)
+    try:
+        return DocBlueprint.model_validate_json(text)
+    except ValidationError:
+        # Not pure JSON (e.g. a <thinking> preamble): take the outermost object.
+        return DocBlueprint.model_validate_json(text[text.find("{"):text.rfind("}") + 1])
+
+
+def chunked_blueprint(
+    parts: List[str], prompt_template: str, max_workers: int,
+) -> Callable[[Task], Optional[dict]]:
+    """
+    Reused-output resolver for ``extract_blueprint_task`` that extracts one
+    partial blueprint per part with the task's agent's LLM, *max_workers* at
+    a time, and returns the merged blueprint.
+
+    The LLM is called directly, outside CrewAI's output conversion, so the
+    resolver validates on its own: a part whose response does not parse as
+    a DocBlueprint is asked again, then skipped with a warning. If no part
+    yields a blueprint, or the merged one does not validate, it raises and
+    the review fails. Each call names the task and its agent, so its LLM
+    events are streamed and counted in the task's usage like the task's own.
+    """
+
+    def _extract(task: Task, index: int, part: str) -> Optional[DocBlueprint]:
+        cancel_token = get_cancel_token()
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        agent = task.agent
+        prompt = interpolate_only(prompt_template, {"part": index + 1, "parts": len(parts), "chunk": part})
+        messages = [
+            {"role": "system", "content": f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"},
+            {"role": "user", "content": prompt},
+        ]
+        for attempt in range(1, _PART_ATTEMPTS + 1):
+            try:
+                return _parse_blueprint(agent.llm.call(messages, from_task=task, from_agent=agent, response_model=DocBlueprint))
+            except ValidationError as exc:
+                logger.warning(
+                    "[ChunkedBlueprint] Part %d/%d returned no usable blueprint (attempt %d/%d): %s",
+                    index + 1, len(parts), attempt, _PART_ATTEMPTS, exc,
+                )
+        return None
+
+    def _resolve(task: Task) -> Optional[dict]:
+        # Waited for, so the agent's thinking event goes out before its result.
+        started = crewai_event_bus.emit(
+            task.agent,
+            AgentExecutionStartedEvent(agent=task.agent, task=task, tools=[], task_prompt=task.description),
+        )
+        if started is not None:
+            started.result()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(parts))), thread_name_prefix="BlueprintChunk") as pool:
+            futures = [
+                # A fresh context copy per part: the correlation ID and cancel token follow each call.
+                pool.submit(contextvars.copy_context().run, _extract, task, index, part)
+                for index, part in enumerate(parts)
+            ]
+            partials = [partial for partial in (future.result() for future in futures) if partial is not None]
+        if not partials:
+            raise ValueError(f"No blueprint could be extracted from any of the {len(parts)} document parts")
+        try:
+            # Round-tripped: the merge copies and patches already-built models without revalidating them.
+            blueprint = DocBlueprint.model_validate(merge_blueprints(partials).model_dump())
+        except ValidationError as exc:
+            raise ValueError(f"The blueprints extracted from {len(partials)} document parts do not merge into a valid one: {exc}") from exc
+        logger.info(
+            "BLUEPRINT_CHUNKED | parts=%d | extracted=%d | components=%d | interactions=%d",
+            len(parts), len(partials), len(blueprint.component_registry), len(blueprint.interaction_map),
+        )
+        return {"raw": blueprint.model_dump_json(), "output": blueprint.model_dump()}
+
+    return _resolve
+
+
+__all__ = ["CHUNK_PROMPT", "split_document", "merge_blueprints", "chunked_blueprint"]
@@ -1,3 +1,5 @@
+import hashlib
+from pathlib import Path
 from typing import List
 
 from crewai import Agent, Crew, LLM, Process, Task, TaskOutput
@@ -5,10 +7,14 @@ from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.project import CrewBase, agent, before_kickoff, crew, task
 
 from app.common.constants import DESIGN_KEYWORDS
+from app.common.crew_runner import ContextPropagatingTask
 from app.common.exception_handlers import ValidationFailedException
 from app.common.logger import logger
 from app.config.config import settings
-from app.config.config_keys import LOG_LEVEL, CREWAI_TRACING_ENABLED
+from app.config.config_keys import (
+    LOG_LEVEL, CREWAI_TRACING_ENABLED, REVIEWER_MAX_DOCUMENT_CHARS, REVIEWER_PARALLEL_SPECIALISTS,
+    REVIEWER_STREAM_PARTIALS, REVIEWER_STREAM_TOKENS,
+)
 from app.models.blueprint_schema import DocBlueprint
 from app.models.final_report_schema import ReviewReport
 from app.models.performance_schema import PerformanceReview
@@ -21,6 +27,15 @@ class DesignReviewerCrew():
     llm_service = LLMService()
     _verbose = settings.get(LOG_LEVEL, "INFO").upper() == "DEBUG"
     _tracing = settings.get_bool(CREWAI_TRACING_ENABLED, False)
+    # Run the performance and security reviews concurrently once the blueprint
+    # exists; final_review_task waits for both via its context.
+    _parallel_specialists = settings.get_bool(REVIEWER_PARALLEL_SPECIALISTS, True)
+    # Documents longer than reviewer.chunk_chars are extracted in parts, so
+    # this limit may be well above what fits in one librarian prompt.
+    _max_document_chars = settings.get_int(REVIEWER_MAX_DOCUMENT_CHARS, 200000)
+    # Agents' LLM calls stream, so ReviewerEventListener can forward their
+    # tokens and the findings they complete.
+    _stream_tokens = settings.get_bool(REVIEWER_STREAM_TOKENS, True) or settings.get_bool(REVIEWER_STREAM_PARTIALS, True)
 
     agents_config = '../../config/review/v1/agents.yaml'
     tasks_config  = '../../config/review/v1/tasks.yaml'
@@ -28,6 +43,15 @@ class DesignReviewerCrew():
     agents: List[BaseAgent]
     tasks: List[Task]
 
+    @classmethod
+    def config_version(cls) -> str:
+        """SHA-256 of the agents/tasks YAML — changes whenever a prompt or agent setting does."""
+        digest = hashlib.sha256()
+        base = Path(cls.base_directory)
+        for relative in (cls.original_agents_config_path, cls.original_tasks_config_path):
+            digest.update((base / relative).read_bytes())
+        return digest.hexdigest()
+
     @staticmethod
     def _looks_like_design_doc(text: str) -> bool:
         """Return True if the text contains at least one design/architecture keyword."""
@@ -46,9 +70,9 @@ class DesignReviewerCrew():
                 "agents_config is not yet loaded (got %s); using default LLM params.",
                 type(self.agents_config).__name__,
             )
-            return self.llm_service.create_llm({})
+            return self.llm_service.create_llm({"stream": self._stream_tokens})
         agent_config = self.agents_config.get(agent_name, {})
-        llm_params = agent_config.get('llm_params', {})
+        llm_params = {"stream": self._stream_tokens, **agent_config.get('llm_params', {})}
         return self.llm_service.create_llm(llm_params)
 
     def _validate_extraction(self, output: TaskOutput) -> None:
@@ -95,7 +119,7 @@ class DesignReviewerCrew():
     # --- TASK FACTORY ---
     @task
     def extract_blueprint_task(self) -> Task:
-        return Task(
+        return ContextPropagatingTask(
             config=self.tasks_config['extract_blueprint_task'],
             output_pydantic=DocBlueprint,
             callback=self._validate_extraction,
@@ -103,23 +127,25 @@ class DesignReviewerCrew():
 
     @task
     def performance_review_task(self) -> Task:
-        return Task(
+        return ContextPropagatingTask(
             config=self.tasks_config['performance_review_task'],
             context=[self.extract_blueprint_task()],
             output_pydantic=PerformanceReview,
+            async_execution=self._parallel_specialists,
         )
 
     @task
     def security_review_task(self) -> Task:
-        return Task(
+        return ContextPropagatingTask(
             config=self.tasks_config['security_review_task'],
             context=[self.extract_blueprint_task()],
             output_pydantic=SecurityReview,
+            async_execution=self._parallel_specialists,
         )
 
     @task
     def final_review_task(self) -> Task:
-        return Task(
+        return ContextPropagatingTask(
             config=self.tasks_config['final_review_task'],
             context=[
                 self.extract_blueprint_task(),
@@ -149,9 +175,9 @@ class DesignReviewerCrew():
             raise ValidationFailedException(
                 feedback="The document is too short to analyze. Please provide more detail."
             )
-        if len(doc) > 50000:
+        if len(doc) > self._max_document_chars:
             raise ValidationFailedException(
-                feedback="The document exceeds the maximum allowed length of 50,000 characters."
+                feedback=f"The document exceeds the maximum allowed length of {self._max_document_chars:,} characters."
             )
 
         # Stamp correlation_id onto each agent's fingerprint so event handlers
@@ -1,10 +1,151 @@
-from typing import ClassVar
+import threading
+import time
+from contextvars import ContextVar
+from typing import ClassVar, Dict, List, Optional, Tuple, Type
 
+from pydantic import BaseModel, ValidationError
+
+from app.common.json_stream import JsonItemStream
 from app.common.logger import logger
 from app.common.request_context import get_correlation_id, set_correlation_id
+from app.common.tracing import review_tracer
 from app.common.util import log_task_done
+from app.config.config import settings
+from app.config.config_keys import REVIEWER_STREAM_FLUSH_MS, REVIEWER_STREAM_PARTIALS, REVIEWER_STREAM_TOKENS
 from app.models.api_schema import ReviewResponse
-from crewai.events import AgentExecutionStartedEvent, BaseEventListener, TaskCompletedEvent
+from app.models.final_report_schema import Finding, ReviewReport
+from app.models.performance_schema import Bottleneck, PerformanceReview
+from app.models.security_schema import SecurityReview, Vulnerability
+from app.services.task_usage import task_usage_tracker
+from crewai.events import (
+    AgentExecutionStartedEvent, BaseEventListener, LLMCallCompletedEvent, LLMCallFailedEvent,
+    LLMStreamChunkEvent, TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent,
+)
+
+
+class _TokenBatcher:
+    """
+    Joins streamed LLM chunks into one ``token`` event per flush interval.
+
+    Chunks are buffered per review, agent and calling thread, so parallel
+    calls of one agent (chunked blueprint extraction) are not interleaved.
+    The first chunk after a quiet interval goes out at once; the rest of
+    an LLM call is flushed when the call ends.
+    """
+
+    def __init__(self, flush_seconds: float) -> None:
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        # (correlation_id, agent, thread id) -> [last flush time, pending chunks]
+        self._buffers: Dict[Tuple[str, str, int], list] = {}
+
+    def add(self, correlation_id: str, agent: str, chunk: str) -> Optional[str]:
+        """Buffer *chunk*; returns the text to send now, if the interval has passed."""
+        key = (correlation_id, agent, threading.get_ident())
+        now = time.monotonic()
+        with self._lock:
+            buffer = self._buffers.setdefault(key, [0.0, []])
+            buffer[1].append(chunk)
+            if now - buffer[0] < self.flush_seconds:
+                return None
+            buffer[0] = now
+            text, buffer[1] = "".join(buffer[1]), []
+        return text
+
+    def drain(self, correlation_id: str, agent: str, thread_id: int) -> Optional[str]:
+        """Remove *agent*'s buffer of the review on *thread_id* and return its unsent text."""
+        with self._lock:
+            buffer = self._buffers.pop((correlation_id, agent, thread_id), None)
+        text = "".join(buffer[1]) if buffer else ""
+        return text or None
+
+
+# Thread whose LLM call streamed last in this context. Set by the chunk
+# handler on the calling thread; CrewAI runs the handlers of the call's
+# completion in a copy of that thread's context, so they can tell which
+# call's buffers to drain.
+_streaming_thread: ContextVar[Optional[int]] = ContextVar("streaming_thread", default=None)
+
+# Upper bound on a flush; handlers normally finish well within milliseconds.
+_FLUSH_TIMEOUT_SECONDS = 5.0
+
+# Task output model -> (its list field sent item by item, the item model)
+_PARTIAL_FIELDS: Dict[Type[BaseModel], Tuple[str, Type[BaseModel]]] = {
+    PerformanceReview: ("bottlenecks", Bottleneck),
+    SecurityReview: ("vulnerabilities", Vulnerability),
+    ReviewReport: ("findings", Finding),
+}
+
+
+class _PartialItems:
+    """
+    Picks the completed items of a task's list field out of its streamed output.
+
+    One ``JsonItemStream`` is kept per review, agent and calling thread, and
+    restarted after ReAct's ``Final Answer:`` marker. Items that do not
+    validate against the item model are skipped; the task's ``result``
+    still carries them as the output parser repaired them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._streams: Dict[Tuple[str, str, int], JsonItemStream] = {}
+
+    def feed(self, correlation_id: str, agent: str, output_model: Type[BaseModel], chunk: str) -> List[dict]:
+        """Scan *chunk*; returns ``{"field", "index", "item"}`` for each item it completed."""
+        field, item_model = _PARTIAL_FIELDS[output_model]
+        key = (correlation_id, agent, threading.get_ident())
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = JsonItemStream([field], start_marker="Final Answer:")
+        partials = []
+        for _, index, item in stream.feed(chunk):
+            try:
+                validated = item_model.model_validate(item)
+            except ValidationError:
+                continue
+            partials.append({"field": field, "index": index, "item": validated.model_dump(exclude_none=True)})
+        return partials
+
+    def drain(self, correlation_id: str, agent: str, thread_id: int) -> None:
+        """Forget *agent*'s stream of the review on *thread_id*, at the end of its LLM call."""
+        with self._lock:
+            self._streams.pop((correlation_id, agent, thread_id), None)
+
+
+class _TaskCompletions:
+    """
+    Counts the handled ``TaskCompletedEvent``s of the reviews being tracked.
+
+    CrewAI hands those events to its handler thread pool, so a crew can
+    return from kickoff before the result of its last task is dispatched.
+    Only tracked reviews are counted; completions arriving after a review
+    is untracked are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._handled: Dict[str, int] = {}
+
+    def track(self, correlation_id: str) -> None:
+        with self._condition:
+            self._handled[correlation_id] = 0
+
+    def untrack(self, correlation_id: str) -> None:
+        with self._condition:
+            self._handled.pop(correlation_id, None)
+
+    def handled(self, correlation_id: str) -> None:
+        with self._condition:
+            if correlation_id in self._handled:
+                self._handled[correlation_id] += 1
+                self._condition.notify_all()
+
+    def wait(self, correlation_id: str, count: int, timeout: float) -> bool:
+        """Block until *count* completions of the review were handled; False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._handled.get(correlation_id, count) >= count, timeout)
 
 
 class ReviewerEventListener(BaseEventListener):
@@ -20,6 +161,23 @@ class ReviewerEventListener(BaseEventListener):
     2. Agent fingerprint metadata (set by before_kickoff hook, covers events
        fired from CrewAI's internal ThreadPoolExecutor where the ContextVar
        is not inherited)
+
+    Task start, failure and completion events, and failed LLM calls, also
+    feed the per-task usage accounting (``task_usage_tracker``); task start
+    and end are also traced as spans (``review_tracer``).
+
+    Agents' streamed LLM chunks are forwarded as ``token`` events, batched
+    per ``reviewer.stream_flush_ms`` and left out of the dispatcher history.
+    CrewAI handles stream chunk events on the emitting thread, so the
+    correlation ID comes from the ContextVar and tokens keep their order.
+    When a call ends, only the buffers of the thread that made it are
+    flushed (see ``_streaming_thread``).
+    With ``reviewer.stream_partials``, the same chunks are scanned and each
+    bottleneck, vulnerability or finding is sent as a ``result_partial``
+    event as soon as its JSON object closes.
+
+    A job flushes the listener (``flush``) before it reports completion, so
+    every task result reaches the client before the ``complete`` event.
     """
 
     _instance: ClassVar["ReviewerEventListener | None"] = None
@@ -34,9 +192,71 @@ class ReviewerEventListener(BaseEventListener):
         if hasattr(self, '_initialized'):
             return
         self.dispatcher = event_dispatcher
+        self._stream_tokens = settings.get_bool(REVIEWER_STREAM_TOKENS, True)
+        self._tokens = _TokenBatcher(settings.get_int(REVIEWER_STREAM_FLUSH_MS, 50) / 1000)
+        self._stream_partials = settings.get_bool(REVIEWER_STREAM_PARTIALS, True)
+        self._partials = _PartialItems()
+        # Agent role -> display name and task output model; stream chunk events carry the role only.
+        self._display_names: Dict[str, str] = {}
+        self._output_models: Dict[str, Type[BaseModel]] = {}
+        self._completions = _TaskCompletions()
         self._initialized = True
         super().__init__()
 
+    @classmethod
+    def track(cls, correlation_id: str) -> None:
+        """Start counting the review's handled task completions, before its crew runs."""
+        if cls._instance is not None:
+            cls._instance._completions.track(correlation_id)
+
+    @classmethod
+    def untrack(cls, correlation_id: str) -> None:
+        """Stop counting the review's task completions, once its job has ended."""
+        if cls._instance is not None:
+            cls._instance._completions.untrack(correlation_id)
+
+    @classmethod
+    def flush(cls, correlation_id: str, task_count: int) -> None:
+        """Wait until the completions of the review's *task_count* tasks have been handled."""
+        if cls._instance is None:
+            return
+        if not cls._instance._completions.wait(correlation_id, task_count, _FLUSH_TIMEOUT_SECONDS):
+            logger.warning(
+                "[ReviewerEventListener] Task results of %s not all dispatched after %.0f s",
+                correlation_id, _FLUSH_TIMEOUT_SECONDS,
+            )
+
+    def _dispatch_tokens(self, correlation_id: str, agent_role: str, text: str) -> None:
+        message = ReviewResponse(
+            agent=self._display_names.get(agent_role, agent_role),
+            message_type="token",
+            message=text,
+            status="executing",
+        )
+        self.dispatcher.dispatch(correlation_id, message, history=False)
+
+    def _flush_tokens(self, correlation_id: str, agent_role: Optional[str]) -> None:
+        """Send the rest of the LLM call that just ended on the emitting thread."""
+        thread_id = _streaming_thread.get()
+        if correlation_id and correlation_id != "-" and agent_role and thread_id is not None:
+            text = self._tokens.drain(correlation_id, agent_role, thread_id)
+            if text:
+                self._dispatch_tokens(correlation_id, agent_role, text)
+            self._partials.drain(correlation_id, agent_role, thread_id)
+
+    def _dispatch_partials(self, correlation_id: str, agent_role: str, chunk: str) -> None:
+        output_model = self._output_models.get(agent_role)
+        if output_model is None:
+            return
+        for partial in self._partials.feed(correlation_id, agent_role, output_model, chunk):
+            message = ReviewResponse(
+                agent=self._display_names.get(agent_role, agent_role),
+                message_type="result_partial",
+                report=partial,
+                status="executing",
+            )
+            self.dispatcher.dispatch(correlation_id, message, history=False)
+
     def _get_correlation_id(self, context: str, metadata: dict | None = None) -> str | None:
         """Return the current correlation ID from ContextVar, falling back to
         agent fingerprint metadata for events fired from CrewAI's internal thread pool."""
@@ -66,14 +286,74 @@ class ReviewerEventListener(BaseEventListener):
         # save_review() succeeds, ensuring the SQLite row exists before the
         # frontend enters follow-up mode.
 
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            if event.task is None or event.task.agent is None:
+                return
+            metadata = event.task.agent.fingerprint.metadata
+            correlation_id = self._get_correlation_id("TaskStartedEvent", metadata)
+            if correlation_id:
+                task_usage_tracker.start(correlation_id, event.task, event.timestamp)
+                review_tracer.start(
+                    (correlation_id, str(event.task.id)), event.task.name or "task", correlation_id,
+                    start_time=event.timestamp, stage="crew_task",
+                    agent=metadata.get("display_name") or event.task.agent.role,
+                )
+
+        @crewai_event_bus.on(LLMCallFailedEvent)
+        def on_llm_call_failed(source, event):
+            correlation_id = get_correlation_id()
+            if correlation_id and correlation_id != "-":
+                self._flush_tokens(correlation_id, event.agent_role)
+                task_usage_tracker.failed_call(correlation_id, event.task_id)
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_llm_stream_chunk(source, event):
+            correlation_id = get_correlation_id()
+            if not event.chunk or event.tool_call is not None or correlation_id == "-" or not event.agent_role:
+                return
+            _streaming_thread.set(threading.get_ident())
+            if self._stream_tokens:
+                text = self._tokens.add(correlation_id, event.agent_role, event.chunk)
+                if text:
+                    self._dispatch_tokens(correlation_id, event.agent_role, text)
+            if self._stream_partials:
+                self._dispatch_partials(correlation_id, event.agent_role, event.chunk)
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_llm_call_completed(source, event):
+            self._flush_tokens(get_correlation_id(), event.agent_role)
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event):
+            if event.task is None or event.task.agent is None:
+                return
+            correlation_id = self._get_correlation_id("TaskFailedEvent", event.task.agent.fingerprint.metadata)
+            if correlation_id:
+                task_usage_tracker.finish(correlation_id, event.task, event.timestamp, failed=True)
+                review_tracer.end((correlation_id, str(event.task.id)), end_time=event.timestamp, error=str(event.error))
+
         @crewai_event_bus.on(AgentExecutionStartedEvent)
         def on_agent_execution_started(source, event):
             metadata = event.agent.fingerprint.metadata
             logger.debug("[ReviewerEventListener] Received AgentExecutionStartedEvent: agent metadata: %s", metadata)
             
             correlation_id = self._get_correlation_id("AgentExecutionStartedEvent", metadata)
+            if metadata.get("display_name"):
+                self._display_names[event.agent.role] = metadata["display_name"]
+            output_model = getattr(event.task, "output_pydantic", None)
+            if output_model in _PARTIAL_FIELDS:
+                self._output_models[event.agent.role] = output_model
             if correlation_id:
                 set_correlation_id(correlation_id)
+                # Usually a no-op after TaskStartedEvent; starts tasks that resolve their output themselves.
+                if event.task is not None:
+                    task_usage_tracker.start(correlation_id, event.task, event.timestamp)
+                    review_tracer.start(
+                        (correlation_id, str(event.task.id)), event.task.name or "task", correlation_id,
+                        start_time=event.timestamp, stage="crew_task",
+                        agent=metadata.get("display_name") or event.agent.role,
+                    )
 
             message = ReviewResponse(
                 agent=metadata.get("display_name", "Reviewer"),
@@ -96,18 +376,27 @@ class ReviewerEventListener(BaseEventListener):
 
             log_task_done(event.output, agent_name)
 
-            if not event.output or not event.output.pydantic:
-                logger.warning("[ReviewerEventListener] TaskCompletedEvent has no pydantic output; skipping dispatch.")
-                return
+            try:
+                if not event.output or not event.output.pydantic:
+                    logger.warning("[ReviewerEventListener] TaskCompletedEvent has no pydantic output; skipping dispatch.")
+                    return
 
-            event_output = event.output.pydantic.model_dump(exclude_none=True)
-            message = ReviewResponse(
-                agent=agent_name,
-                message_type="result",
-                report=event_output,
-                status="executed",
-            )
-            self.dispatcher.dispatch(correlation_id, message)
+                event_output = event.output.pydantic.model_dump(exclude_none=True)
+                message = ReviewResponse(
+                    agent=agent_name,
+                    message_type="result",
+                    report=event_output,
+                    status="executed",
+                )
+                self.dispatcher.dispatch(correlation_id, message)
+            finally:
+                # Recorded after the dispatch so the store write does not delay the result event.
+                if correlation_id and event.task is not None:
+                    review_tracer.end((correlation_id, str(event.task.id)), end_time=event.timestamp)
+                    task_usage_tracker.finish(correlation_id, event.task, event.timestamp)
+                if correlation_id:
+                    # Counted last, so a flushed job also finds the task's usage stored.
+                    self._completions.handled(correlation_id)
 
 
 __all__ = ["ReviewerEventListener"]
@@ -2,17 +2,20 @@
 Reviewer facade — orchestrates session registration and NDJSON streaming
 for a design review job.
 """
+import time
 import uuid
-from queue import Queue
 from typing import TYPE_CHECKING, Annotated, AsyncGenerator, Literal, Optional
 
 from fastapi import UploadFile
 
 from app.common.event_dispatcher import EventDispatcher
 from app.common.logger import logger
-from app.common.streaming import stream_queue
+from app.common.metrics import REVIEW_TIME_TO_FIRST_EVENT
+from app.common.streaming import StreamBridge, StreamSubscription, stream_queue
+from app.common.tracing import review_tracer
 from app.models.api_schema import ReviewRequest
 from app.services.document_extractor import DocumentExtractor, ExtractionError
+from app.services.reviewer.reviewer_budget import ReviewEstimate
 from app.services.reviewer.reviewer_service import ReviewerService
 
 _DEFAULT_PROMPT = "Please perform a comprehensive architectural review of this design document."
@@ -29,14 +32,31 @@ class ReviewerFacade:
         self.event_dispatcher = event_dispatcher
         self.document_extractor = document_extractor
 
-    async def review_upload(
+    async def preflight(self, request: ReviewRequest, use_cache: bool = True) -> Optional[ReviewEstimate]:
+        """Estimate the review's tokens and cost; reject it (422) when over budget.
+
+        Called by endpoints before the streaming response starts, so the
+        rejection is an HTTP error and the estimate can go in a header.
+        """
+        with review_tracer.span("review_preflight", request.correlation_id):
+            return await self.reviewer_service.preflight(request, use_cache=use_cache)
+
+    async def prepare_upload(
         self,
         file: Optional[UploadFile],
         design_doc: Optional[str],
         output_format: Literal["markdown", "plain", "json"],
         correlation_id: str,
-    ) -> AsyncGenerator[str, None]:
-        """Extract text from an optional file upload, merge with inline text, and stream review."""
+        previous_correlation_id: Optional[str] = None,
+    ) -> ReviewRequest:
+        """Extract text from an optional file upload and merge it with inline text.
+
+        Runs before the response stream opens, so extraction failures
+        (400/422) still reach the client as HTTP errors.
+
+        Raises:
+            ExtractionError: the file could not be accepted or parsed.
+        """
         extracted: Optional[str] = None
         if file is not None:
             extracted = await self.document_extractor.extract(file)
@@ -48,25 +68,54 @@ class ReviewerFacade:
         else:
             content = design_doc or ""
 
-        request = ReviewRequest(
+        return ReviewRequest(
             design_doc=content,
             correlation_id=correlation_id,
             output_format=output_format,
+            previous_correlation_id=previous_correlation_id,
+        )
+
+    async def start_review(
+        self,
+        request: ReviewRequest,
+        use_cache: bool = True,
+        estimate: Optional[ReviewEstimate] = None,
+    ) -> StreamSubscription:
+        """Subscribe to a review job (new, in flight or cached); returns the stream of its results.
+
+        Awaited by endpoints before the streaming response starts, so a
+        review that needs a worker while the pool is full is rejected with
+        a real 429. The session itself is closed by the job; a client going
+        away only unsubscribes its own stream, so other coalesced clients
+        keep theirs. When the last client goes away the job is cancelled.
+        The stream unsubscribes when it ends or is closed, even before its
+        first chunk was read, so callers must close it (see
+        ``ClosingStreamingResponse``).
+
+        Raises:
+            CrewPoolFullException: a new run is needed and the pool is full.
+        """
+        started = time.perf_counter()
+        stream = StreamBridge()
+        session_id = await self.reviewer_service.run_crew_job(request, stream, use_cache=use_cache, estimate=estimate)
+        return StreamSubscription(
+            self._stream_results(request, stream, started),
+            on_close=lambda: self._leave(session_id, stream),
         )
-        async for chunk in self.start_review(request):
+
+    async def _stream_results(
+        self, request: ReviewRequest, stream: StreamBridge, started: float,
+    ) -> AsyncGenerator[str, None]:
+        first = True
+        async for chunk in stream_queue(stream, label="ReviewerFacade", correlation_id=request.correlation_id):
+            if first:
+                REVIEW_TIME_TO_FIRST_EVENT.observe(time.perf_counter() - started)
+                first = False
             yield chunk
 
-    async def start_review(self, request: ReviewRequest) -> AsyncGenerator[str, None]:
-        """Register the session, kick off the crew job, and stream results."""
-        sync_queue: Queue = Queue()
-        self.event_dispatcher.register_session(request.correlation_id, sync_queue)
-        try:
-            self.reviewer_service.run_crew_job(request, sync_queue)
-            async for chunk in stream_queue(sync_queue, label="ReviewerFacade"):
-                yield chunk
-        finally:
-            logger.debug("[ReviewerFacade] Unregistering session: %s", request.correlation_id)
-            self.event_dispatcher.unregister_session(request.correlation_id)
+    def _leave(self, session_id: str, stream: StreamBridge) -> None:
+        logger.debug("[ReviewerFacade] Leaving session: %s", session_id)
+        self.reviewer_service.leave_job(session_id, stream)
 
 
 __all__ = ["ReviewerFacade"]
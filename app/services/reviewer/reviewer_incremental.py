@@ -0,0 +1,113 @@
+"""
+Incremental re-review — what a new version of a document can take over from
+the review of the previous version.
+
+The edit is expressed as a line diff of the two documents. The librarian
+updates the previous DocBlueprint from that diff instead of re-reading the
+whole document. Once the updated blueprint exists, each specialist review
+of the previous version is reused unless a blueprint field its prompt
+audits has changed. The chief strategist always runs, merging reused and
+fresh specialist reviews into a new report.
+"""
+import difflib
+import json
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from crewai import Task
+
+from app.common.logger import logger
+
+BLUEPRINT_TASK = "extract_blueprint_task"
+# tasks.yaml entry holding the description extract_blueprint_task runs with.
+UPDATE_BLUEPRINT_PROMPT = "update_blueprint_task"
+
+# Blueprint fields a specialist's prompt does not audit; a change confined to
+# them leaves its previous review valid.
+SPECIALIST_IGNORED_FIELDS: Dict[str, FrozenSet[str]] = {
+    "performance_review_task": frozenset({"technical_constraints.security_requirements"}),
+    "security_review_task": frozenset({
+        "technical_constraints.traffic_expectations",
+        "technical_constraints.performance_requirements",
+    }),
+}
+
+_DIFF_CONTEXT_LINES = 3
+
+
+def _normalized_lines(design_doc: str) -> List[str]:
+    """Non-blank lines with whitespace runs collapsed, so re-indentation is not an edit."""
+    lines = (" ".join(line.split()) for line in design_doc.splitlines())
+    return [line for line in lines if line]
+
+
+def diff_documents(previous_doc: str, design_doc: str) -> Tuple[str, float]:
+    """
+    Return the unified line diff from *previous_doc* to *design_doc* and the
+    share of the two documents' text that the changed lines make up (0–1).
+    An empty diff means the documents differ in whitespace only.
+    """
+    old, new = _normalized_lines(previous_doc), _normalized_lines(design_doc)
+    diff = [
+        line
+        for line in difflib.unified_diff(old, new, lineterm="", n=_DIFF_CONTEXT_LINES)
+        if not line.startswith(("---", "+++"))
+    ]
+    changed_chars = sum(len(line) - 1 for line in diff if line.startswith(("+", "-")))
+    total_chars = sum(map(len, old)) + sum(map(len, new))
+    return "\n".join(diff), changed_chars / total_chars if total_chars else 0.0
+
+
+def _flatten(blueprint: dict) -> Dict[str, Any]:
+    """Top-level blueprint fields, with nested objects split into ``parent.child`` fields."""
+    fields: Dict[str, Any] = {}
+    for key, value in blueprint.items():
+        if isinstance(value, dict):
+            fields.update({f"{key}.{child}": child_value for child, child_value in value.items()})
+        else:
+            fields[key] = value
+    return fields
+
+
+def changed_blueprint_fields(previous: dict, current: dict) -> Set[str]:
+    """Names of the (flattened) fields whose value differs between two blueprint dumps."""
+    old, new = _flatten(previous), _flatten(current)
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+
+def format_blueprint(blueprint: dict) -> str:
+    """The previous blueprint as the librarian is shown it."""
+    return json.dumps(blueprint, indent=2)
+
+
+def reuse_if_unaffected(
+    previous_blueprint: dict, stored: dict, ignored_fields: FrozenSet[str],
+) -> Callable[[Task], Optional[dict]]:
+    """
+    Reused-output resolver for a specialist task: returns *stored* (its review
+    of the previous version) when the blueprint in the task's context differs
+    from *previous_blueprint* only in *ignored_fields*, else None so it runs.
+    """
+
+    def _resolve(task: Task) -> Optional[dict]:
+        context = task.context if isinstance(task.context, list) else []
+        blueprint = next((t.output for t in context if t.name == BLUEPRINT_TASK and t.output), None)
+        if blueprint is None or blueprint.pydantic is None:
+            return None
+        changed = changed_blueprint_fields(previous_blueprint, blueprint.pydantic.model_dump()) - ignored_fields
+        if changed:
+            logger.info("INCREMENTAL_RERUN | task=%s | changed=%s", task.name, ",".join(sorted(changed)))
+            return None
+        return stored
+
+    return _resolve
+
+
+__all__ = [
+    "BLUEPRINT_TASK",
+    "UPDATE_BLUEPRINT_PROMPT",
+    "SPECIALIST_IGNORED_FIELDS",
+    "diff_documents",
+    "changed_blueprint_fields",
+    "format_blueprint",
+    "reuse_if_unaffected",
+]
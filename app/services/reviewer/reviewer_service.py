@@ -1,39 +1,154 @@
 """
 Reviewer service — wires the DesignReviewerCrew to the generic crew runner,
 providing reviewer-specific persistence and completion callbacks.
+
+A content-addressed ReviewCache sits in front of the crew: resubmitted
+documents replay the stored report without any LLM call. Below it, the
+blueprint and specialist outputs of every run are kept per document; a new
+run for an already reviewed document (e.g. in another output format) reuses
+the stored blueprint and skips the librarian's LLM round-trip. A review
+that names the review of a previous version of the document is incremental
+(see reviewer_incremental.py): the librarian only updates the previous
+blueprint from the diff, and unaffected specialist reviews are reused.
+Documents too long for one librarian prompt have their blueprint extracted
+in parallel parts and merged (see reviewer_chunking.py). Before a run is
+accepted, a pre-flight ReviewBudget estimate of its tokens and cost can
+reject it, route the blueprint through the cheaper chunked extraction, or
+open its stream with a warning (see reviewer_budget.py). Identical
+submissions that arrive while a review is still running are coalesced onto
+that run (single-flight) and receive its events through the dispatcher.
+When the last client of a running review disconnects, the run is cancelled.
+Each run leases its own prebuilt crew from a WarmCrewPool, so concurrent
+reviews never share agents or their fingerprint metadata.
+With LLM cassettes on, a run's LLM calls are written to, or replayed from,
+its cassette once it ends (see llm_cassette.py).
 """
-from queue import Queue
-from typing import Any
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from crewai.utilities.string_utils import interpolate_only
 
-from app.common.crew_runner import run_crew_in_thread
+from app.common.cancellation import CancelToken
+from app.common.crew_pool import CrewWorkerPool
+from app.common.crew_runner import ReusedOutput, run_crew_in_thread
 from app.common.event_dispatcher import EventDispatcher
+from app.common.exception_handlers import CrewPoolFullException, ReviewBudgetExceededException
 from app.common.logger import logger
-from app.common.request_context import get_correlation_id
+from app.common.streaming import StreamBridge
+from app.common.tracing import review_tracer
+from app.common.warm_crew_pool import WarmCrewPool
+from app.config.config import settings
+from app.config.config_keys import (
+    REVIEW_CACHE_ENABLED, REVIEW_CACHE_TTL_SECONDS, REVIEW_CACHE_MAX_ENTRIES,
+    REVIEWER_CANCEL_ON_DISCONNECT, REVIEWER_CHUNK_CHARS, REVIEWER_CHUNK_WORKERS,
+    REVIEWER_INCREMENTAL_MAX_CHANGED_RATIO,
+    REVIEW_BUDGET_ENABLED, REVIEW_BUDGET_WARN_COST_USD, REVIEW_BUDGET_MAX_COST_USD,
+    REVIEW_BUDGET_COMPLETION_TOKENS_PER_CALL,
+)
 from app.models.api_schema import ReviewRequest, ReviewResponse
-from app.services.review_store import save_review
+from app.services.llm import LLMService
+from app.services.review_cache import ReviewCache
+from app.services.review_store import aget_review, asave_review, save_review
+from app.services.reviewer.reviewer_budget import ReviewBudget, ReviewEstimate
+from app.services.reviewer.reviewer_chunking import CHUNK_PROMPT, chunked_blueprint, split_document
 from app.services.reviewer.reviewer_crew import DesignReviewerCrew
+from app.services.reviewer.reviewer_event_listeners import ReviewerEventListener
+from app.services.reviewer.reviewer_incremental import (
+    BLUEPRINT_TASK, SPECIALIST_IGNORED_FIELDS, UPDATE_BLUEPRINT_PROMPT,
+    diff_documents, format_blueprint, reuse_if_unaffected,
+)
+
+# Task outputs kept per document. Only the blueprint is independent of the
+# requested output format; the specialists format their summaries for it.
+_STORED_TASKS = (BLUEPRINT_TASK, "performance_review_task", "security_review_task")
+_FORMAT_INDEPENDENT_TASKS = frozenset({BLUEPRINT_TASK})
+
+
+@dataclass
+class _Flight:
+    """A crew run in progress and the extra submissions coalesced onto it."""
+
+    job_id: str
+    cache_key: str
+    design_doc: str
+    doc_key: str
+    output_format: str
+    # Tasks that completed with a stored output of this same document.
+    reused_tasks: FrozenSet[str] = frozenset()
+    # correlation_id -> design_doc of each coalesced submission
+    followers: Dict[str, str] = field(default_factory=dict)
+    cancel_token: CancelToken = field(default_factory=CancelToken)
 
 
 class ReviewerService:
-    def __init__(self, event_dispatcher: EventDispatcher) -> None:
+    def __init__(self, event_dispatcher: EventDispatcher, crew_pool: CrewWorkerPool, warm_crews: WarmCrewPool) -> None:
         self.reviewer_crew = DesignReviewerCrew()
         self._event_dispatcher = event_dispatcher
+        self._crew_pool = crew_pool
+        self._warm_crews = warm_crews
+        self._review_cache = ReviewCache(
+            config_version=DesignReviewerCrew.config_version(),
+            ttl_seconds=settings.get_int(REVIEW_CACHE_TTL_SECONDS, 604800),
+            max_entries=settings.get_int(REVIEW_CACHE_MAX_ENTRIES, 500),
+            enabled=settings.get_bool(REVIEW_CACHE_ENABLED, True),
+        )
+        self._flights_lock = threading.Lock()
+        self._flights_by_key: Dict[str, _Flight] = {}
+        self._flights_by_id: Dict[str, _Flight] = {}
+        self._cancel_on_disconnect = settings.get_bool(REVIEWER_CANCEL_ON_DISCONNECT, True)
+        self._incremental_max_changed_ratio = settings.get(REVIEWER_INCREMENTAL_MAX_CHANGED_RATIO, 0.3)
+        self._chunk_chars = settings.get_int(REVIEWER_CHUNK_CHARS, 50000)
+        self._chunk_workers = settings.get_int(REVIEWER_CHUNK_WORKERS, 4)
+        self._budget: Optional[ReviewBudget] = None
+        if settings.get_bool(REVIEW_BUDGET_ENABLED, True):
+            self._budget = ReviewBudget(
+                crew_factory=lambda: DesignReviewerCrew().crew(),
+                chunk_prompt=self.reviewer_crew.tasks_config[CHUNK_PROMPT]["description"],
+                chunk_chars=self._chunk_chars,
+                completion_tokens_per_call=settings.get_int(REVIEW_BUDGET_COMPLETION_TOKENS_PER_CALL, 2000),
+                warn_cost_usd=settings.get(REVIEW_BUDGET_WARN_COST_USD, 0.10),
+                max_cost_usd=settings.get(REVIEW_BUDGET_MAX_COST_USD, 1.00),
+            )
 
     # ------------------------------------------------------------------
     # Callbacks injected into the generic runner
     # ------------------------------------------------------------------
 
-    def _on_complete(self, design_doc: str, result: Any) -> None:
-        """Persist the report, then dispatch the completion event."""
-        correlation_id = get_correlation_id()
-        self._persist_review(correlation_id, design_doc, result)
+    def _on_complete(self, flight: _Flight, result: Any) -> None:
+        """Persist and cache the report and task outputs, then dispatch the completion event."""
+        # Every task's result event goes out before "complete".
+        ReviewerEventListener.flush(flight.job_id, len(getattr(result, "tasks_output", None) or []))
+        self._store_task_outputs(flight, result)
+        report_data = self._persist_review(flight.job_id, flight.design_doc, result)
+        if report_data:
+            self._review_cache.put(flight.cache_key, report_data)
+        # Close the flight only once the cache holds the report, so a
+        # duplicate arriving now replays it rather than starting a new run.
+        for follower_id, follower_doc in self._end_flight(flight).items():
+            if report_data:
+                self._save_report(follower_id, follower_doc, report_data)
         # Dispatch "complete" AFTER persist so the SQLite row exists
         # before the client enters follow-up mode.
         self._event_dispatcher.dispatch(
-            correlation_id,
+            flight.job_id,
             ReviewResponse(status="complete", message="Design review completed!"),
         )
 
+    def _on_queued(self, correlation_id: str, position: int) -> None:
+        """Tell the client where its review sits in the worker pool queue."""
+        self._event_dispatcher.dispatch(
+            correlation_id,
+            ReviewResponse(
+                agent="System",
+                message_type="queued",
+                message=f"All reviewers are busy. Your review is number {position} in the queue.",
+                status="queued",
+                queue_position=position,
+            ),
+        )
+
     def _on_error(self, exc: Exception) -> ReviewResponse:
         """Build a typed error event for the stream."""
         return ReviewResponse(
@@ -58,40 +173,350 @@ class ReviewerService:
             return {"raw": result.raw}
         return {}
 
-    def _persist_review(self, correlation_id: str, design_doc: str, result: Any) -> None:
-        """Save the review result to the store; logs but does not raise on failure."""
-        report_data = self._extract_report_data(result)
-        if not report_data:
-            logger.warning("[ReviewerService] No report data to save")
-            return
+    def _persist_review(self, correlation_id: str, design_doc: str, result: Any) -> dict:
+        """Save the review result to the store; logs but does not raise on failure.
+
+        Returns the extracted report data (empty dict if there was none).
+        """
+        with review_tracer.span("persist_review", correlation_id):
+            report_data = self._extract_report_data(result)
+            if not report_data:
+                logger.warning("[ReviewerService] No report data to save")
+                return report_data
+            self._save_report(correlation_id, design_doc, report_data)
+            return report_data
+
+    def _store_task_outputs(self, flight: _Flight, result: Any) -> None:
+        """Keep the blueprint and specialist outputs of *result* for later runs on the same document."""
+        for task_output in getattr(result, "tasks_output", None) or []:
+            name = task_output.name
+            if name not in _STORED_TASKS or name in flight.reused_tasks or task_output.pydantic is None:
+                continue
+            output_format = "" if name in _FORMAT_INDEPENDENT_TASKS else flight.output_format
+            self._review_cache.put_task_output(
+                flight.doc_key, name, task_output.raw, task_output.pydantic.model_dump(), output_format,
+            )
+
+    @staticmethod
+    def _save_report(correlation_id: str, design_doc: str, report_data: dict) -> None:
         try:
             save_review(correlation_id, design_doc, report_data)
             logger.debug("[ReviewerService] Review saved")
         except Exception as save_err:
             logger.error("[ReviewerService] Failed to persist review session: %s", save_err)
 
+    # ------------------------------------------------------------------
+    # Single-flight bookkeeping
+    # ------------------------------------------------------------------
+
+    def _join_flight_locked(self, request: ReviewRequest, cache_key: str, stream: StreamBridge) -> Optional[str]:
+        """Subscribe *stream* to a matching in-flight run. Caller holds ``_flights_lock``.
+
+        A run matches when it was started under the same correlation ID (a
+        client retrying) or for the same cache key (a duplicate document).
+        Returns the run's session ID, or None if nothing matched.
+        """
+        flight = self._flights_by_id.get(request.correlation_id) or self._flights_by_key.get(cache_key)
+        if flight is None or not self._event_dispatcher.subscribe(flight.job_id, stream):
+            return None
+        if request.correlation_id != flight.job_id:
+            flight.followers[request.correlation_id] = request.design_doc
+        logger.info("REVIEW_COALESCED | job=%s | followers=%d", flight.job_id, len(flight.followers))
+        return flight.job_id
+
+    def leave_job(self, session_id: str, stream: StreamBridge) -> None:
+        """Detach a client's *stream*; cancel the run if it was the last one listening.
+
+        Holding ``_flights_lock`` keeps this atomic with ``_join_flight_locked``,
+        so a duplicate submission cannot subscribe to a run being cancelled.
+        """
+        with self._flights_lock:
+            remaining = self._event_dispatcher.unsubscribe(session_id, stream)
+            flight = self._flights_by_id.get(session_id)
+            if remaining or flight is None or not self._cancel_on_disconnect:
+                return
+            del self._flights_by_id[session_id]
+            if self._flights_by_key.get(flight.cache_key) is flight:
+                del self._flights_by_key[flight.cache_key]
+        if flight.cancel_token.cancel("client disconnected"):
+            logger.info("REVIEW_CANCEL_REQUESTED | job=%s", session_id)
+
+    def _end_flight(self, flight: _Flight) -> Dict[str, str]:
+        """Stop accepting followers for *flight*; returns the followers it had. Idempotent."""
+        with self._flights_lock:
+            if self._flights_by_id.get(flight.job_id) is flight:
+                del self._flights_by_id[flight.job_id]
+            if self._flights_by_key.get(flight.cache_key) is flight:
+                del self._flights_by_key[flight.cache_key]
+            followers, flight.followers = flight.followers, {}
+        return followers
+
+    # ------------------------------------------------------------------
+    # Incremental re-review
+    # ------------------------------------------------------------------
+
+    async def _plan_incremental(
+        self, request: ReviewRequest,
+    ) -> Optional[Tuple[Dict[str, ReusedOutput], Dict[str, str]]]:
+        """Work out what a review of *request* can take over from its previous version's review.
+
+        Returns the reused outputs and task descriptions to run the crew
+        with, or None when a full review is needed: the previous review or
+        its stored blueprint is unknown, the documents differ in whitespace
+        only, or the edit changes too much of the text to be worth it.
+        """
+        previous_id = request.previous_correlation_id
+
+        def _skip(reason: str) -> None:
+            logger.info("REVIEW_INCREMENTAL_SKIPPED | previous=%s | reason=%s", previous_id, reason)
+
+        try:
+            previous = await aget_review(previous_id)
+        except Exception as exc:
+            logger.error("[ReviewerService] Failed to load previous review %s: %s", previous_id, exc)
+            previous = None
+        if previous is None:
+            _skip("unknown review")
+            return None
+
+        doc_changes, changed_ratio = diff_documents(previous["design_doc"], request.design_doc or "")
+        if not doc_changes:
+            _skip("document unchanged")
+            return None
+        if changed_ratio > self._incremental_max_changed_ratio:
+            _skip("changed_ratio=%.3f" % changed_ratio)
+            return None
+
+        previous_key = self._review_cache.make_doc_key(previous["design_doc"])
+        blueprint, *specialists = await asyncio.gather(
+            self._review_cache.aget_task_output(previous_key, BLUEPRINT_TASK),
+            *(
+                self._review_cache.aget_task_output(previous_key, task_name, request.output_format)
+                for task_name in SPECIALIST_IGNORED_FIELDS
+            ),
+        )
+        if blueprint is None:
+            _skip("no stored blueprint")
+            return None
+
+        reused_outputs: Dict[str, ReusedOutput] = {
+            task_name: reuse_if_unaffected(blueprint["output"], stored, ignored_fields)
+            for (task_name, ignored_fields), stored in zip(SPECIALIST_IGNORED_FIELDS.items(), specialists)
+            if stored is not None
+        }
+        description = interpolate_only(
+            self.reviewer_crew.tasks_config[UPDATE_BLUEPRINT_PROMPT]["description"],
+            {"previous_blueprint": format_blueprint(blueprint["output"]), "doc_changes": doc_changes},
+        )
+        logger.info(
+            "REVIEW_INCREMENTAL | previous=%s | changed_ratio=%.3f | reusable=%s",
+            previous_id, changed_ratio, ",".join(reused_outputs) or "-",
+        )
+        return reused_outputs, {BLUEPRINT_TASK: description}
+
+    # ------------------------------------------------------------------
+    # Cache replay
+    # ------------------------------------------------------------------
+
+    async def _replay_cached(self, request: ReviewRequest, cache_key: str, report_data: dict) -> None:
+        """Stream a cached report into the already registered session of *request*, then close it."""
+        correlation_id = request.correlation_id
+        logger.info("REVIEW_CACHE_HIT | key=%s", cache_key[:12])
+        # Save under the new correlation_id so follow-up chat works as usual.
+        try:
+            await asave_review(correlation_id, request.design_doc, report_data)
+        except Exception as save_err:
+            logger.error("[ReviewerService] Failed to persist review session: %s", save_err)
+
+        agent_name = self.reviewer_crew.agents_config["chief_strategist"].get("display_name", "Reviewer")
+        self._event_dispatcher.dispatch(
+            correlation_id,
+            ReviewResponse(agent=agent_name, message_type="result", report=report_data, status="executed", cached=True),
+        )
+        self._event_dispatcher.dispatch(
+            correlation_id,
+            ReviewResponse(status="complete", message="Design review completed!", cached=True),
+        )
+        self._event_dispatcher.close_session(correlation_id)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def run_crew_job(self, request: ReviewRequest, sync_queue: Queue) -> None:
-        """Start the crew in a thread; correlation ID propagated via ContextVar set by the crew runner."""
-        crew = self.reviewer_crew.crew()
+    async def preflight(self, request: ReviewRequest, use_cache: bool = True) -> Optional[ReviewEstimate]:
+        """Estimate the tokens and cost of reviewing *request* before anything runs.
+
+        Returns None when the budget is disabled. Tokenising runs on the
+        default executor, off the event loop.
+
+        Raises:
+            ReviewBudgetExceededException: the review would overflow a context
+                window or cost more than ``review_budget.max_cost_usd``, and
+                no cached report can be replayed instead.
+        """
+        if self._budget is None:
+            return None
+        loop = asyncio.get_running_loop()
+        estimate = await loop.run_in_executor(
+            None, self._budget.estimate, request.design_doc or "", request.output_format,
+        )
+        cost = estimate.cost_usd
+        logger.info(
+            "REVIEW_ESTIMATE | route=%s | parts=%d | prompt_tokens=%d | completion_tokens=%d | cost_usd=%s",
+            estimate.route, len(estimate.parts) or 1, estimate.prompt_tokens, estimate.completion_tokens,
+            "unknown" if cost is None else "%.4f" % cost,
+        )
+        try:
+            self._budget.check(estimate)
+        except ReviewBudgetExceededException:
+            # Replaying a cached report costs nothing.
+            cache_key = self._review_cache.make_key(request.design_doc or "", request.output_format)
+            if use_cache and await self._review_cache.aget(cache_key) is not None:
+                return estimate
+            raise
+        return estimate
+
+    async def run_crew_job(
+        self,
+        request: ReviewRequest,
+        stream: StreamBridge,
+        use_cache: bool = True,
+        estimate: Optional[ReviewEstimate] = None,
+    ) -> str:
+        """Attach *stream* to a review of *request* and return the session ID it is subscribed to.
+
+        In order of preference the stream is subscribed to an identical review
+        that is already running, served a cached report for the same
+        normalised document (skipped when *use_cache* is False — the fresh
+        result still refreshes the cache), or given a new crew run queued on
+        the worker pool, which leases a prebuilt crew once a worker picks it
+        up. A new run reuses the stored blueprint of the same document, if
+        any, or — when *request* names a previous review — runs as an
+        incremental re-review of that one (both skipped when *use_cache* is
+        False). Failing both, the blueprint is extracted in parts when the
+        pre-flight *estimate* (see ``preflight``) chose the chunked route or,
+        without an estimate, when the document is longer than
+        ``reviewer.chunk_chars``; a new run whose estimate carries a warning
+        opens its stream with a ``warning`` event. The correlation ID is
+        propagated to the run via the ContextVar set by the crew runner.
+
+        Joining a running review and replaying a cached report need no
+        worker, so they are served while the pool is full. Only a new run
+        checks the pool's capacity first; if another request takes the last
+        slot after that check, every subscriber receives an error event and
+        the session is closed.
+
+        Raises:
+            CrewPoolFullException: a new run is needed and the pool is full;
+                nothing was registered.
+        """
         design_doc = request.design_doc
+        correlation_id = request.correlation_id
+        cache_key = self._review_cache.make_key(design_doc or "", request.output_format)
+        doc_key = self._review_cache.make_doc_key(design_doc or "")
+
+        with self._flights_lock:
+            job_id = self._join_flight_locked(request, cache_key, stream)
+        if job_id is not None:
+            return job_id
+
+        # Looked up outside the lock — the store calls are awaited on its I/O thread.
+        cached_report = await self._review_cache.aget(cache_key) if use_cache else None
+        reused_outputs: Dict[str, ReusedOutput] = {}
+        task_descriptions: Dict[str, str] = {}
+        reused_tasks: FrozenSet[str] = frozenset()
+        if use_cache and cached_report is None:
+            plan = await self._plan_incremental(request) if request.previous_correlation_id else None
+            if plan is not None:
+                reused_outputs, task_descriptions = plan
+            else:
+                blueprint = await self._review_cache.aget_task_output(doc_key, BLUEPRINT_TASK)
+                if blueprint is not None:
+                    logger.info("BLUEPRINT_CACHE_HIT | key=%s", doc_key[:12])
+                    reused_outputs[BLUEPRINT_TASK] = blueprint
+                    reused_tasks = frozenset({BLUEPRINT_TASK})
+        if BLUEPRINT_TASK not in reused_outputs and BLUEPRINT_TASK not in task_descriptions:
+            if estimate is not None:
+                parts = estimate.parts  # empty on the single route
+            elif len(design_doc or "") > self._chunk_chars:
+                parts = split_document(design_doc, self._chunk_chars)
+            else:
+                parts = []
+            if parts:
+                logger.info("REVIEW_CHUNKED | chars=%d | parts=%d", len(design_doc), len(parts))
+                reused_outputs[BLUEPRINT_TASK] = chunked_blueprint(
+                    parts, self.reviewer_crew.tasks_config[CHUNK_PROMPT]["description"], self._chunk_workers,
+                )
+
+        with self._flights_lock:
+            # An identical run may have started while the cache was being read.
+            job_id = self._join_flight_locked(request, cache_key, stream)
+            if job_id is not None:
+                return job_id
+            if cached_report is None and not self._crew_pool.has_capacity():
+                raise CrewPoolFullException(self._crew_pool.retry_after_seconds)
+
+            self._event_dispatcher.register_session(correlation_id, stream)
+            if cached_report is None:
+                flight = _Flight(
+                    job_id=correlation_id,
+                    cache_key=cache_key,
+                    design_doc=design_doc,
+                    doc_key=doc_key,
+                    output_format=request.output_format,
+                    reused_tasks=reused_tasks,
+                )
+                self._flights_by_id[correlation_id] = flight
+                self._flights_by_key[cache_key] = flight
+
+        if cached_report is not None:
+            await self._replay_cached(request, cache_key, cached_report)
+            return correlation_id
+
+        if estimate is not None and estimate.warning:
+            self._event_dispatcher.dispatch(
+                correlation_id,
+                ReviewResponse(agent="System", message_type="warning", message=estimate.warning, status="warning"),
+            )
 
         def on_complete(result: Any) -> None:
-            self._on_complete(design_doc, result)
-
-        run_crew_in_thread(
-            crew=crew,
-            inputs={"design_doc": design_doc, "output_format": request.output_format, "correlation_id": request.correlation_id},
-            correlation_id=request.correlation_id,
-            sync_queue=sync_queue,
-            event_dispatcher=self._event_dispatcher,
-            on_complete=on_complete,
-            on_error=self._on_error,
-            label="ReviewerService",
-        )
+            self._on_complete(flight, result)
+
+        def on_queued(position: int) -> None:
+            self._on_queued(correlation_id, position)
+
+        def on_finished() -> None:
+            ReviewerEventListener.untrack(correlation_id)
+            self._end_flight(flight)
+            LLMService.cassettes.finish(correlation_id, design_doc or "", request.output_format)
+
+        ReviewerEventListener.track(correlation_id)
+        try:
+            run_crew_in_thread(
+                crew=None,
+                inputs={"design_doc": design_doc, "output_format": request.output_format, "correlation_id": correlation_id},
+                correlation_id=correlation_id,
+                event_dispatcher=self._event_dispatcher,
+                on_complete=on_complete,
+                on_error=self._on_error,
+                label="ReviewerService",
+                pool=self._crew_pool,
+                on_queued=on_queued,
+                on_finished=on_finished,
+                cancel_token=flight.cancel_token,
+                warm_crews=self._warm_crews,
+                reused_outputs=reused_outputs,
+                task_descriptions=task_descriptions,
+            )
+        except CrewPoolFullException as exc:
+            ReviewerEventListener.untrack(correlation_id)
+            self._end_flight(flight)
+            self._event_dispatcher.dispatch(
+                correlation_id,
+                ReviewResponse(agent="System", message_type="error", message=exc.message, status="error"),
+            )
+            self._event_dispatcher.close_session(correlation_id)
+        return correlation_id
 
 
 __all__ = ["ReviewerService"]
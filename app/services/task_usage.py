@@ -0,0 +1,164 @@
+"""
+Task usage accounting — prompt and completion tokens, LLM calls, retries,
+wall time and cost of every task of every crew run, stored per
+correlation_id in review_store.
+
+Fed from CrewAI events by the crew's event listener. A task's tokens are
+the growth of its agent's LLM token counters between the task starting and
+completing; WarmCrewPool resets those counters between runs, and each LLM
+belongs to one agent, so concurrent tasks of different agents do not mix.
+Retries are the task's failed LLM calls, each of which the agent executor
+retries. Wall time runs from the start event to the completion event.
+Each record also feeds the per-agent latency, token and cost metrics.
+
+A task completed with a reused output and no LLM call (see crew_runner)
+has no start event; it is recorded as ``reused`` with zero usage. One that
+resolves its output with LLM calls of its own, like chunked blueprint
+extraction, emits ``AgentExecutionStartedEvent`` first and is measured
+from there.
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.common.logger import logger
+from app.common.metrics import LLM_COST, LLM_TOKENS, TASK_DURATION
+from app.common.util import llm_token_usage
+from app.config.config import settings
+from app.config.config_keys import USAGE_RETENTION_DAYS
+from app.services.llm import model_pricing
+from app.services.review_store import save_task_usage
+
+# Runs that never complete a started task (e.g. a crash) leave it pending this long at most.
+_PENDING_MAX_AGE_SECONDS = 3600
+_COUNTERS = ("prompt_tokens", "completion_tokens", "cached_prompt_tokens", "successful_requests")
+
+
+@dataclass
+class _Pending:
+    started_at: datetime
+    counters: Dict[str, int]
+    retries: int = 0
+
+
+@dataclass
+class TaskUsage:
+    """Usage of one task of one run, as stored in ``task_usage``."""
+
+    correlation_id: str
+    task_name: str
+    agent: str
+    model: str
+    status: str  # "completed", "reused" or "failed"
+    prompt_tokens: int
+    completion_tokens: int
+    cached_prompt_tokens: int
+    llm_calls: int
+    retries: int
+    wall_ms: float
+    cost_usd: Optional[float]
+    completed_at: float
+
+
+def _counters(llm: Any) -> Dict[str, int]:
+    usage = llm_token_usage(llm) or {}
+    return {name: usage.get(name, 0) for name in _COUNTERS}
+
+
+class TaskUsageTracker:
+    """
+    Follows tasks from start to completion and stores a TaskUsage for each.
+
+    Every method is called from CrewAI event handlers and never raises.
+
+    Args:
+        retention_days: Stored records older than this are deleted.
+    """
+
+    def __init__(self, retention_days: int) -> None:
+        self.retention_seconds = retention_days * 86400
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], _Pending] = {}
+
+    def start(self, correlation_id: str, task: Any, started_at: datetime) -> None:
+        """Note that *task* started; a second start of the same execution is ignored."""
+        key = (correlation_id, str(task.id))
+        counters = _counters(getattr(getattr(task, "agent", None), "llm", None))
+        with self._lock:
+            if key in self._pending:
+                return
+            cutoff = time.time() - _PENDING_MAX_AGE_SECONDS
+            for stale in [k for k, p in self._pending.items() if p.started_at.timestamp() < cutoff]:
+                del self._pending[stale]
+            self._pending[key] = _Pending(started_at=started_at, counters=counters)
+
+    def failed_call(self, correlation_id: str, task_id: Optional[str]) -> None:
+        """Count a failed LLM call of a started task."""
+        if not task_id:
+            return
+        with self._lock:
+            pending = self._pending.get((correlation_id, task_id))
+            if pending is not None:
+                pending.retries += 1
+
+    def finish(self, correlation_id: str, task: Any, finished_at: datetime, failed: bool = False) -> Optional[TaskUsage]:
+        """Record *task* as completed (or failed) and store its usage. Returns the record, or None on error."""
+        try:
+            with self._lock:
+                pending = self._pending.pop((correlation_id, str(task.id)), None)
+            agent = task.agent
+            llm = getattr(agent, "llm", None)
+            model = str(getattr(llm, "model", None) or "unknown")
+            if pending is None:
+                status = "failed" if failed else "reused"
+                delta, retries, wall_ms = dict.fromkeys(_COUNTERS, 0), 0, 0.0
+            else:
+                now = _counters(llm)
+                delta = {name: max(0, now[name] - pending.counters[name]) for name in _COUNTERS}
+                status = "failed" if failed else "completed"
+                retries = pending.retries
+                wall_ms = max(0.0, (finished_at - pending.started_at).total_seconds() * 1000)
+            input_cost, output_cost, _ = model_pricing(model)
+            cost = None
+            if input_cost is not None and output_cost is not None:
+                cost = delta["prompt_tokens"] * input_cost + delta["completion_tokens"] * output_cost
+            usage = TaskUsage(
+                correlation_id=correlation_id,
+                task_name=task.name or "unknown",
+                agent=(agent.fingerprint.metadata.get("display_name") or agent.role) if agent else "unknown",
+                model=model,
+                status=status,
+                prompt_tokens=delta["prompt_tokens"],
+                completion_tokens=delta["completion_tokens"],
+                cached_prompt_tokens=delta["cached_prompt_tokens"],
+                llm_calls=delta["successful_requests"],
+                retries=retries,
+                wall_ms=round(wall_ms, 1),
+                cost_usd=cost,
+                completed_at=finished_at.timestamp(),
+            )
+            if pending is not None:
+                TASK_DURATION.labels(usage.agent, status).observe(wall_ms / 1000)
+            for kind in ("prompt", "completion", "cached_prompt"):
+                if delta[f"{kind}_tokens"]:
+                    LLM_TOKENS.labels(model, kind).inc(delta[f"{kind}_tokens"])
+            if cost:
+                LLM_COST.labels(model).inc(cost)
+            save_task_usage(asdict(usage), self.retention_seconds)
+        except Exception as exc:
+            logger.error("[TaskUsageTracker] Failed to record usage of %s: %s", getattr(task, "name", "?"), exc)
+            return None
+        logger.info(
+            "TASK_USAGE | task=%s | status=%s | model=%s | tokens(p=%d,c=%d) | calls=%d | retries=%d | wall_ms=%.0f",
+            usage.task_name, usage.status, usage.model, usage.prompt_tokens, usage.completion_tokens,
+            usage.llm_calls, usage.retries, usage.wall_ms,
+        )
+        return usage
+
+
+task_usage_tracker = TaskUsageTracker(retention_days=settings.get_int(USAGE_RETENTION_DAYS, 90))
+
+
+__all__ = ["TaskUsage", "TaskUsageTracker", "task_usage_tracker"]
@@ -0,0 +1,103 @@
+"""
+Benchmark: upload extraction throughput and event-loop lag.
+
+Pushes a stream of PDF uploads through ``DocumentExtractor.extract`` with
+a fixed number in flight, while a ticker coroutine measures how late the
+event loop wakes it up. Reports uploads/s and loop lag percentiles.
+
+Compares the process-pool extractor against the legacy behaviour it
+replaced, where ``pypdf`` ran inline on the event loop.
+
+Usage:
+    PYTHONPATH=. python benchmarks/document_extraction.py --pages 50 --uploads 24 --concurrency 4
+"""
+import argparse
+import asyncio
+import io
+import logging
+import time
+from typing import Any, Callable, List
+
+from fastapi import UploadFile
+
+from app.common.util import percentile
+from app.services.document_extractor import DocumentExtractor
+from benchmarks.pdf_fixtures import make_pdf
+
+_TICK_SECONDS = 0.01
+
+
+class _InlineExtractor(DocumentExtractor):
+    """Parses on the event loop, as DocumentExtractor did before the process pool."""
+
+    async def _run_in_pool(self, func: Callable[..., Any], *args: Any) -> Any:
+        return func(*args)
+
+
+async def _ticker(stop: asyncio.Event, lags: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(_TICK_SECONDS)
+        lags.append(time.perf_counter() - started - _TICK_SECONDS)
+
+
+async def _run(mode: str, pdf: bytes, uploads: int, concurrency: int, workers: int) -> dict:
+    extractor = _InlineExtractor() if mode == "inline" else DocumentExtractor()
+    extractor.max_workers = workers
+    # Every upload is the same file; keep the text cache out of the measurement.
+    extractor._text_cache.max_chars = 0
+    if mode == "pool":
+        # Warm the pool so process spawn time is not billed to the first uploads.
+        await extractor.extract(UploadFile(file=io.BytesIO(pdf), filename="warmup.pdf"))
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _upload(index: int) -> None:
+        async with semaphore:
+            await extractor.extract(UploadFile(file=io.BytesIO(pdf), filename=f"spec-{index}.pdf"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_upload(i) for i in range(uploads)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    extractor.shutdown()
+
+    lags = lags or [0.0]
+    return {
+        "mode": mode,
+        "uploads": uploads,
+        "uploads_per_s": uploads / elapsed,
+        "lag_p50_ms": percentile(lags, 50) * 1000,
+        "lag_p99_ms": percentile(lags, 99) * 1000,
+        "lag_max_ms": max(lags) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50, help="pages per PDF")
+    parser.add_argument("--uploads", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=4, help="uploads in flight at once")
+    parser.add_argument("--workers", type=int, default=4, help="extraction processes (pool mode)")
+    parser.add_argument("--mode", choices=["pool", "inline", "both"], default="both")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    pdf = make_pdf(args.pages)
+    print(f"PDF: {args.pages} pages, {len(pdf) / 1024:.0f} KiB")
+    modes = ["inline", "pool"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = asyncio.run(_run(mode, pdf, args.uploads, args.concurrency, args.workers))
+        print(
+            "{mode:>6} | uploads={uploads} ({uploads_per_s:.2f}/s) | "
+            "loop lag p50={lag_p50_ms:.1f}ms p99={lag_p99_ms:.1f}ms max={lag_max_ms:.1f}ms".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
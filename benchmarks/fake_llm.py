@@ -0,0 +1,271 @@
+"""
+Local OpenAI-compatible LLM stub for the load-test benchmarks.
+
+Serves ``POST /v1/chat/completions`` from a thread-per-connection HTTP
+server. It answers each crew task with a schema-valid ``DocBlueprint``,
+``PerformanceReview``, ``SecurityReview`` or ``ReviewReport``, chosen by
+the output schema embedded in the task prompt (or the ``response_format``
+of structured-output calls). Anything else, such as a follow-up chat, gets
+a short prose answer. Each response waits ``latency`` seconds first.
+Streamed requests (``stream: true``) are sent as server-sent events, one
+word per chunk with ``token_delay`` seconds between chunks.
+
+Usage counts are approximated as one token per four characters, so the
+usage accounting and metrics see plausible numbers.
+
+Point the app at it with ``OPENAI_BASE_URL=<server.url>``. Run standalone:
+    PYTHONPATH=. python benchmarks/fake_llm.py --port 8001 --latency 1.5
+"""
+import argparse
+import collections
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional
+
+from pydantic import BaseModel
+
+from app.models.blueprint_schema import DocBlueprint
+from app.models.final_report_schema import ReviewReport
+from app.models.performance_schema import PerformanceReview
+from app.models.security_schema import SecurityReview
+
+_BLUEPRINT = DocBlueprint.model_validate({
+    "is_valid": True,
+    "validation_errors": [],
+    "system_identity": {
+        "name": "Order Platform",
+        "primary_style": "Microservices",
+        "deployment_target": "Kubernetes",
+        "stated_goals": ["Serve 50k concurrent users", "99.9% availability"],
+    },
+    "component_registry": [
+        {"name": "API Gateway", "type": "Gateway", "technology": "Envoy", "hosting": "Kubernetes", "statefulness": "Stateless"},
+        {"name": "Order Service", "type": "Web Server", "technology": "FastAPI", "hosting": "Kubernetes", "statefulness": "Stateless"},
+        {"name": "Order DB", "type": "Database", "technology": "PostgreSQL", "hosting": "RDS", "statefulness": "Stateful"},
+        {"name": "Event Bus", "type": "Queue", "technology": "Kafka", "hosting": "MSK", "statefulness": "Stateful"},
+    ],
+    "interaction_map": [
+        {"source": "API Gateway", "destination": "Order Service", "protocol": "HTTP", "data_exchanged": "orders", "nature": "Synchronous"},
+        {"source": "Order Service", "destination": "Order DB", "protocol": "TCP", "data_exchanged": "order rows", "nature": "Synchronous"},
+        {"source": "Order Service", "destination": "Event Bus", "protocol": "Kafka", "data_exchanged": "order events", "nature": "Asynchronous"},
+    ],
+    "technical_constraints": {
+        "traffic_expectations": ["50k concurrent users at peak"],
+        "performance_requirements": ["p99 below 300 ms"],
+        "security_requirements": ["TLS everywhere"],
+    },
+    "omission": {"missing_from_diagram": ["Cache"], "missing_from_text": ["Backup strategy"]},
+})
+
+_PERFORMANCE = PerformanceReview.model_validate({
+    "summary": "The single Order DB primary is the ceiling: every write and most reads hit it synchronously.",
+    "bottlenecks": [
+        {
+            "id": "PERF-001", "type": "I/O", "component": "Order DB",
+            "observation": "All order reads and writes go to one PostgreSQL primary.",
+            "impact": "Connection exhaustion and p99 above 2 s at 50k users.",
+            "severity": "Critical", "remediation": "Add read replicas and a Redis read-through cache.",
+        },
+        {
+            "id": "PERF-002", "type": "Network", "component": "API Gateway",
+            "observation": "Synchronous fan-out to the Order Service with no timeout budget.",
+            "impact": "Retries amplify load during partial outages.",
+            "severity": "High", "remediation": "Set per-route timeouts and retry budgets in Envoy.",
+        },
+    ],
+    "scalability_blockers": [
+        {"issue": "Single-writer database", "why_it_blocks_scaling": "Write throughput cannot grow past one instance."},
+    ],
+    "reliability_score": {"score": 62, "justification": "No cache, no replicas, one region."},
+})
+
+_SECURITY = SecurityReview.model_validate({
+    "summary": "Service-to-service traffic is unauthenticated inside the cluster.",
+    "vulnerabilities": [
+        {
+            "id": "SEC-001", "category": "Spoofing", "owasp_mapping": "A07:2021",
+            "component_impacted": "Order Service",
+            "threat_description": "Any pod can call the Order Service without credentials.",
+            "attack_vector": "Compromise a neighbouring pod, then call internal endpoints directly.",
+            "severity": "High", "mitigation_strategy": "Enforce mTLS with a service mesh and authorisation policies.",
+        },
+    ],
+    "trust_boundary_violations": ["Gateway to Order Service without token validation"],
+    "missing_security_controls": ["WAF", "Secrets rotation"],
+})
+
+_REPORT = ReviewReport.model_validate({
+    "data_available": True,
+    "generated_at": "2026-01-01T00:00:00Z",
+    "scorecard": {
+        "architecture_health": "62/100",
+        "primary_risks": "Unauthenticated service-to-service calls",
+        "primary_bottleneck": "Single PostgreSQL primary",
+    },
+    "findings": [
+        {"priority": "High", "category": "Performance", "finding": "Single database primary",
+         "impact": "Outage under peak load", "fix": "Read replicas and caching"},
+        {"priority": "High", "category": "Security", "finding": "No mTLS",
+         "impact": "Lateral movement after one compromise", "fix": "Service mesh with mTLS"},
+    ],
+    "deep_dive": "Start with the database tier: it bounds both availability and latency.",
+})
+
+OUTPUTS: Dict[str, BaseModel] = {
+    "DocBlueprint": _BLUEPRINT,
+    "PerformanceReview": _PERFORMANCE,
+    "SecurityReview": _SECURITY,
+    "ReviewReport": _REPORT,
+}
+CHAT_REPLY = (
+    "The main risk is the single PostgreSQL primary. Add read replicas for the order "
+    "history queries and put a read-through cache in front of product lookups before scaling out."
+)
+
+_SCHEMA_TITLE = re.compile(r'"title":\s*"(' + "|".join(OUTPUTS) + r')"')
+
+
+def _output_name(request: dict) -> Optional[str]:
+    """Which review model the request asks for, or None for a free-form (chat) answer."""
+    response_format = request.get("response_format") or {}
+    name = (response_format.get("json_schema") or {}).get("name")
+    if name in OUTPUTS:
+        return name
+    prompt = "\n".join(str(message.get("content") or "") for message in request.get("messages", []))
+    # The task's own schema is the last one in its prompt.
+    titles = _SCHEMA_TITLE.findall(prompt)
+    return titles[-1] if titles else None
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeLLMServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        name = _output_name(request)
+        if name is None:
+            content = CHAT_REPLY
+        elif request.get("response_format"):
+            content = OUTPUTS[name].model_dump_json()
+        else:
+            # CrewAI agents answer in the ReAct format.
+            content = "Thought: I now can give a great answer\nFinal Answer: " + OUTPUTS[name].model_dump_json()
+        self.server.record(name or "chat")
+        prompt_tokens = _tokens(json.dumps(request.get("messages", [])))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": _tokens(content),
+            "total_tokens": prompt_tokens + _tokens(content),
+        }
+        time.sleep(self.server.latency)
+        if request.get("stream"):
+            self._stream(request, content, usage)
+        else:
+            self._send_json({
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                "model": request.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+    def _send_json(self, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, request: dict, content: str, usage: dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        base = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": request.get("model")}
+        for index, token in enumerate(_words(content)):
+            if index and self.server.token_delay:
+                time.sleep(self.server.token_delay)
+            self._event({**base, "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]})
+        self._event({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (request.get("stream_options") or {}).get("include_usage"):
+            self._event({**base, "choices": [], "usage": usage})
+        self._chunk(b"data: [DONE]\n\n")
+        self._chunk(b"")
+
+    def _event(self, body: dict) -> None:
+        self._chunk(f"data: {json.dumps(body)}\n\n".encode("utf-8"))
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def _words(text: str) -> Iterator[str]:
+    """Split *text* into word-sized chunks that join back to it exactly."""
+    return iter(re.findall(r"\s*\S+", text) or [text])
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """
+    The stub server; ``start()`` serves it from a daemon thread.
+
+    Args:
+        port:         Port to listen on (0 picks a free one).
+        latency:      Seconds each response waits before its first byte.
+        token_delay:  Seconds between streamed chunks.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, token_delay: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.calls: collections.Counter = collections.Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ``OPENAI_BASE_URL``."""
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+
+    def start(self) -> "FakeLLMServer":
+        threading.Thread(target=self.serve_forever, name="FakeLLM", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before each response")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    args = parser.parse_args()
+    server = FakeLLMServer(args.port, args.latency, args.token_delay)
+    print(f"Fake LLM listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: time from review request to the first ``thinking`` event.
+
+Submits reviews through ``ReviewerService.run_crew_job`` and measures how
+long each stream waits for its first ``thinking`` event — the moment the
+user sees an agent start. A ``before_llm_call`` hook refuses every LLM
+call, so runs end shortly after that event and no request leaves the
+machine. The hook waits briefly first: CrewAI delivers events from its own
+executor, and a run that failed instantly could close the stream before
+the thinking event reached it.
+
+Compares leasing crews from the ``WarmCrewPool`` against building a fresh
+crew for every run, the alternative that keeps concurrent runs isolated.
+
+Usage:
+    PYTHONPATH=. python benchmarks/first_event.py --requests 20 --concurrency 4
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from crewai import Crew
+from crewai.hooks import register_before_llm_call_hook
+
+from app.common.crew_pool import CrewWorkerPool
+from app.common.event_dispatcher import EventDispatcher
+from app.common.streaming import StreamBridge
+from app.common.util import percentile
+from app.common.warm_crew_pool import WarmCrewPool
+from app.models.api_schema import ReviewRequest
+from app.services import review_store
+from app.services.reviewer.reviewer_crew import DesignReviewerCrew
+from app.services.reviewer.reviewer_event_listeners import ReviewerEventListener
+from app.services.reviewer.reviewer_service import ReviewerService
+
+_LLM_REFUSAL_DELAY_SECONDS = 0.2
+_DOC = (
+    "Architecture overview: an API gateway routes requests to stateless services "
+    "backed by a sharded database with a read-through cache. Revision {}."
+)
+
+
+class _BuildPerRun:
+    """Builds a new crew for every run and throws it away afterwards."""
+
+    def acquire(self) -> Crew:
+        return DesignReviewerCrew().crew()
+
+    def release(self, crew: Crew) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+def _refuse_llm_call(context: Any) -> bool:
+    time.sleep(_LLM_REFUSAL_DELAY_SECONDS)
+    return False
+
+
+async def _time_to_thinking(service: ReviewerService) -> float:
+    request = ReviewRequest(design_doc=_DOC.format(uuid.uuid4()), correlation_id=str(uuid.uuid4()))
+    stream = StreamBridge()
+    started = time.perf_counter()
+    await service.run_crew_job(request, stream, use_cache=False)
+    first = None
+    while (event := await stream.get()) is not None:
+        if first is None and getattr(event, "message_type", None) == "thinking":
+            first = time.perf_counter() - started
+    if first is None:
+        raise RuntimeError("run ended without a thinking event")
+    return first
+
+
+async def _run(mode: str, requests: int, concurrency: int) -> dict:
+    dispatcher = EventDispatcher()
+    crew_pool = CrewWorkerPool(max_workers=concurrency, max_queue_depth=requests)
+    warm_crews = WarmCrewPool(lambda: DesignReviewerCrew().crew(), size=concurrency) if mode == "warm" else _BuildPerRun()
+    service = ReviewerService(dispatcher, crew_pool, warm_crews)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one() -> float:
+        async with semaphore:
+            return await _time_to_thinking(service)
+
+    samples = await asyncio.gather(*(_one() for _ in range(requests)))
+    return {
+        "mode": mode,
+        "requests": requests,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+        "pool": warm_crews.stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4, help="reviews in flight (and crew workers)")
+    parser.add_argument("--mode", choices=["warm", "rebuild", "both"], default="both")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    review_store._DB_PATH = Path(tempfile.mkdtemp()) / "bench_first_event.db"
+    review_store.init_db()
+    ReviewerEventListener(event_dispatcher=EventDispatcher())
+    register_before_llm_call_hook(_refuse_llm_call)
+
+    modes = ["rebuild", "warm"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = asyncio.run(_run(mode, args.requests, args.concurrency))
+        print(
+            "{mode:>7} | requests={requests} | first thinking event p50={p50_ms:.1f}ms "
+            "p99={p99_ms:.1f}ms max={max_ms:.1f}ms | {pool}".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
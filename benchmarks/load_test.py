@@ -0,0 +1,313 @@
+"""
+Benchmark: offline load test of the review and chat endpoints.
+
+Starts the fake LLM (fake_llm.py) and the real app under uvicorn in this
+process, with ``OPENAI_BASE_URL`` pointing the crew agents and the chat
+service at the stub. It then drives ``/api/v1/review``,
+``/api/v1/review/upload`` and ``/api/v1/chat`` over HTTP at the given
+concurrency. Every review submits a different document, so neither the
+review cache nor coalescing hides the pipeline's cost. Chat runs first
+create one review per concurrent client to chat about.
+
+``--scenario replay --cassettes DIR`` replays reviews recorded with
+``llm_cassette.mode = "record"`` instead, cycling through the cassettes in
+DIR. Each request runs under a copy of one cassette with a new correlation
+ID. The crew's LLM calls are answered from the cassette, at the recorded
+timing times ``--time-scale``, so the numbers cover everything but the LLM.
+
+Reported per endpoint:
+- throughput;
+- time to the first NDJSON line;
+- p50, p95 and p99 latency to the end of the stream;
+- rejected (429) and failed requests;
+- LLM calls served by the stub.
+
+Peak RSS and thread count are also reported. They are sampled every
+100 ms and cover the whole process: server, client and stub.
+
+Usage:
+    PYTHONPATH=. python benchmarks/load_test.py --scenario review --requests 40 --concurrency 8 --latency 0.5
+    PYTHONPATH=. python benchmarks/load_test.py --scenario replay --cassettes cassettes/ --time-scale 0
+"""
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+
+from benchmarks.fake_llm import FakeLLMServer
+
+_DOC = (
+    "# Order Platform\n\n## Overview\nAn API gateway routes requests to stateless order services on "
+    "Kubernetes, backed by PostgreSQL and a Kafka event bus. Revision {revision}.\n\n"
+    "## Requirements\nServe 50k concurrent users with p99 below 300 ms.\n"
+)
+
+
+@dataclass
+class _Sample:
+    status_code: int
+    first_event_s: Optional[float]
+    total_s: float
+    ok: bool
+
+
+@dataclass
+class _ResourceSampler:
+    peak_rss_mb: float = 0.0
+    peak_threads: int = 0
+    _stop: threading.Event = field(default_factory=threading.Event)
+
+    @staticmethod
+    def rss_mb() -> float:
+        try:
+            with open("/proc/self/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    def _run(self) -> None:
+        while not self._stop.wait(0.1):
+            self.peak_rss_mb = max(self.peak_rss_mb, self.rss_mb())
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+
+    def __enter__(self) -> "_ResourceSampler":
+        self._stop.clear()
+        self.peak_rss_mb, self.peak_threads = self.rss_mb(), threading.active_count()
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# ---------------------------------------------------------------------------
+# Requests
+# ---------------------------------------------------------------------------
+
+async def _consume(response: httpx.Response, started: float) -> _Sample:
+    """Read an NDJSON stream to its end, noting when the first line arrived and how it ended."""
+    first, last = None, ""
+    async for line in response.aiter_lines():
+        if not line.strip():
+            continue
+        if first is None:
+            first = time.perf_counter() - started
+        last = line
+    ok = response.status_code == 200 and '"error"' not in last
+    return _Sample(response.status_code, first, time.perf_counter() - started, ok)
+
+
+async def _review(
+    client: httpx.AsyncClient, correlation_id: Optional[str] = None, body: Optional[dict] = None, skip_cache: bool = False,
+) -> _Sample:
+    started = time.perf_counter()
+    headers = {"X-Correlation-ID": correlation_id or str(uuid.uuid4())}
+    if skip_cache:
+        headers["X-Skip-Cache"] = "true"
+    body = body or {"design_doc": _DOC.format(revision=uuid.uuid4())}
+    async with client.stream("POST", "/api/v1/review", json=body, headers=headers) as response:
+        return await _consume(response, started)
+
+
+async def _upload(client: httpx.AsyncClient) -> _Sample:
+    started = time.perf_counter()
+    files = {"file": ("design.md", _DOC.format(revision=uuid.uuid4()).encode("utf-8"), "text/markdown")}
+    headers = {"X-Correlation-ID": str(uuid.uuid4())}
+    async with client.stream("POST", "/api/v1/review/upload", files=files, headers=headers) as response:
+        return await _consume(response, started)
+
+
+def _chat(correlation_ids: List[str]) -> Callable[[httpx.AsyncClient, int], Awaitable[_Sample]]:
+    async def _one(client: httpx.AsyncClient, index: int) -> _Sample:
+        started = time.perf_counter()
+        correlation_id = correlation_ids[index % len(correlation_ids)]
+        body = {
+            "correlation_id": correlation_id,
+            "messages": [{"role": "user", "content": "What should we fix first?"}],
+        }
+        async with client.stream("POST", "/api/v1/chat", json=body) as response:
+            return await _consume(response, started)
+
+    return _one
+
+
+def _replay(cassette_paths: List[Path], replay_dir: Path) -> Callable[[httpx.AsyncClient, int], Awaitable[_Sample]]:
+    from app.services.llm_cassette import LLMCassettes
+
+    cassettes = [LLMCassettes.load(path) for path in cassette_paths]
+
+    async def _one(client: httpx.AsyncClient, index: int) -> _Sample:
+        slot = index % len(cassettes)
+        correlation_id = str(uuid.uuid4())
+        shutil.copyfile(cassette_paths[slot], replay_dir / f"{correlation_id}.json.gz")
+        design_doc = cassettes[slot]["design_doc"]
+        if index >= len(cassettes):
+            # Another pass over the same document would be coalesced onto a run still in flight.
+            design_doc += f"\n\n<!-- replay {correlation_id} -->"
+        body = {"design_doc": design_doc, "output_format": cassettes[slot].get("output_format") or "markdown"}
+        return await _review(client, correlation_id, body, skip_cache=True)
+
+    return _one
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+async def _drive(
+    client: httpx.AsyncClient, send: Callable[[httpx.AsyncClient, int], Awaitable[_Sample]], requests: int, concurrency: int,
+) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(index: int) -> _Sample:
+        async with semaphore:
+            try:
+                return await send(client, index)
+            except httpx.HTTPError:
+                return _Sample(0, None, 0.0, False)
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*(_one(index) for index in range(requests)))
+    return samples, time.perf_counter() - started
+
+
+async def _scenario(base_url: str, scenario: str, requests: int, concurrency: int, llm: FakeLLMServer, replay: Optional[tuple] = None) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        if scenario == "replay":
+            send = _replay(*replay)
+        elif scenario == "chat":
+            correlation_ids = [str(uuid.uuid4()) for _ in range(concurrency)]
+            setup = await asyncio.gather(*(_review(client, correlation_id) for correlation_id in correlation_ids))
+            if not all(sample.ok for sample in setup):
+                raise RuntimeError("could not create the reviews to chat about")
+            send = _chat(correlation_ids)
+        elif scenario == "upload":
+            send = lambda client, index: _upload(client)  # noqa: E731
+        else:
+            send = lambda client, index: _review(client)  # noqa: E731
+
+        calls_before = sum(llm.calls.values())
+        with _ResourceSampler() as sampler:
+            samples, elapsed = await _drive(client, send, requests, concurrency)
+
+    # Imported here: importing the app reads its settings, which main() sets first.
+    from app.common.util import percentile
+
+    ok = [sample for sample in samples if sample.ok]
+    first = [sample.first_event_s for sample in ok if sample.first_event_s is not None]
+    totals = [sample.total_s for sample in ok]
+    return {
+        "scenario": scenario,
+        "requests": requests,
+        "ok": len(ok),
+        "rejected": sum(1 for sample in samples if sample.status_code == 429),
+        "failed": sum(1 for sample in samples if not sample.ok and sample.status_code != 429),
+        "throughput": len(ok) / elapsed if elapsed else 0.0,
+        "first_p50_ms": percentile(first, 50) * 1000,
+        "first_p99_ms": percentile(first, 99) * 1000,
+        "p50_ms": percentile(totals, 50) * 1000,
+        "p95_ms": percentile(totals, 95) * 1000,
+        "p99_ms": percentile(totals, 99) * 1000,
+        "llm_calls": sum(llm.calls.values()) - calls_before,
+        "rss_mb": sampler.peak_rss_mb,
+        "threads": sampler.peak_threads,
+    }
+
+
+def _serve(port: int):
+    """Import the app (after the environment is set) and serve it from a background thread."""
+    import uvicorn
+
+    import main as app_main
+
+    server = uvicorn.Server(uvicorn.Config(app_main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="Uvicorn", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["review", "upload", "chat", "replay", "all"], default="all")
+    parser.add_argument("--requests", type=int, default=40, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM seconds before each response")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="fake LLM seconds between streamed chunks")
+    parser.add_argument("--workers", type=int, default=4, help="crew worker threads (reviewer.worker_pool_size)")
+    parser.add_argument("--queue-depth", type=int, default=64, help="reviews allowed to wait (reviewer.worker_queue_depth)")
+    parser.add_argument("--cassettes", type=Path, help="directory of recorded cassettes (replay scenario)")
+    parser.add_argument("--time-scale", type=float, default=0.0, help="replayed call time as a fraction of the recorded one")
+    args = parser.parse_args()
+
+    replay = None
+    if args.scenario == "replay":
+        cassette_paths = sorted(args.cassettes.glob("*.json.gz")) if args.cassettes else []
+        if not cassette_paths:
+            parser.error("--scenario replay needs --cassettes with at least one *.json.gz cassette")
+        replay = (cassette_paths, Path(tempfile.mkdtemp()))
+        os.environ.update({
+            "LLM_CASSETTE_MODE": "replay",
+            "LLM_CASSETTE_DIR": str(replay[1]),
+            "LLM_CASSETTE_TIME_SCALE": str(args.time_scale),
+        })
+
+    llm = FakeLLMServer(latency=args.latency, token_delay=args.token_delay).start()
+    os.environ.update({
+        "OPENAI_BASE_URL": llm.url,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "sk-fake",
+        "STORAGE_DB_PATH": os.path.join(tempfile.mkdtemp(), "bench_load_test.db"),
+        "REVIEWER_WORKER_POOL_SIZE": str(args.workers),
+        "REVIEWER_WORKER_QUEUE_DEPTH": str(args.queue_depth),
+        "CREWAI_TRACING_ENABLED": "false",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+    port = _free_port()
+    server = _serve(port)
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    scenarios = ["review", "upload", "chat"] if args.scenario == "all" else [args.scenario]
+    results = []
+    try:
+        for scenario in scenarios:
+            results.append(asyncio.run(_scenario(f"http://127.0.0.1:{port}", scenario, args.requests, args.concurrency, llm, replay)))
+    finally:
+        server.should_exit = True
+        llm.stop()
+
+    # Printed together at the end, after CrewAI's own console output.
+    print(f"\nworkers={args.workers} concurrency={args.concurrency} latency={args.latency}s token_delay={args.token_delay}s")
+    for result in results:
+        print(
+            "{scenario:>6} | requests={requests} ok={ok} rejected={rejected} failed={failed} | "
+            "{throughput:.2f} req/s | first event p50={first_p50_ms:.0f}ms p99={first_p99_ms:.0f}ms | "
+            "latency p50={p50_ms:.0f}ms p95={p95_ms:.0f}ms p99={p99_ms:.0f}ms | llm_calls={llm_calls} | "
+            "peak rss={rss_mb:.0f}MB threads={threads}".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
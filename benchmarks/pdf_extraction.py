@@ -0,0 +1,104 @@
+"""
+Benchmark: PDF extraction time with parallel page batches and the page cache.
+
+For each page count, times ``DocumentExtractor.extract`` on:
+
+- ``serial``    — one ``PdfReader`` loop over every page in a single worker,
+                  as the extractor did before page batching (baseline);
+- ``cold``      — page batches parsed in parallel, empty cache;
+- ``edited``    — a re-upload of the same spec with a few pages changed;
+- ``identical`` — a byte-identical re-upload.
+
+The pool is warmed before timing so process spawn is not billed to any mode.
+Parallel batches only beat the serial baseline on a multi-core machine;
+the cached modes do not depend on core count.
+
+Usage:
+    PYTHONPATH=. python benchmarks/pdf_extraction.py --pages 50 200 500 --workers 4
+"""
+import argparse
+import asyncio
+import io
+import logging
+import time
+from typing import Any, Callable, List
+
+from fastapi import UploadFile
+
+from app.services.document_extractor import DocumentExtractor, ParseSource
+from benchmarks.pdf_fixtures import make_pdf
+
+
+def _extract_serial(source: ParseSource) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+    pages = [page.extract_text() or '' for page in reader.pages]
+    return '\n\n'.join(p for p in pages if p.strip())
+
+
+class _SerialExtractor(DocumentExtractor):
+    """Parses the whole PDF in one pool task with no page cache."""
+
+    async def _extract_pdf(self, source: ParseSource, file_hash: str) -> str:
+        return await self._run_in_pool(_extract_serial, source)
+
+
+async def _timed(extractor: DocumentExtractor, pdf: bytes, name: str) -> float:
+    started = time.perf_counter()
+    await extractor.extract(UploadFile(file=io.BytesIO(pdf), filename=name))
+    return time.perf_counter() - started
+
+
+async def _run(pages: int, workers: int, pages_per_task: int, edits: int) -> dict:
+    pdf = make_pdf(pages)
+    edited = make_pdf(pages, edited_pages={(i * 7 + 3) % pages for i in range(edits)})
+    warmup = make_pdf(workers, seed=999)
+
+    def _make(cls: Callable[..., Any]) -> DocumentExtractor:
+        extractor = cls()
+        extractor.max_workers = workers
+        extractor.pages_per_task = pages_per_task
+        return extractor
+
+    serial = _make(_SerialExtractor)
+    await _timed(serial, warmup, "warmup.pdf")
+    serial_s = await _timed(serial, pdf, "spec.pdf")
+    serial.shutdown()
+
+    extractor = _make(DocumentExtractor)
+    await asyncio.gather(*(_timed(extractor, warmup, "warmup.pdf") for _ in range(workers)))
+    result = {
+        "pages": pages,
+        "kib": len(pdf) / 1024,
+        "serial_ms": serial_s * 1000,
+        "cold_ms": await _timed(extractor, pdf, "spec.pdf") * 1000,
+        "edited_ms": await _timed(extractor, edited, "spec-v2.pdf") * 1000,
+        "identical_ms": await _timed(extractor, edited, "spec-v2.pdf") * 1000,
+    }
+    extractor.shutdown()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200, 500], help="page counts to test")
+    parser.add_argument("--workers", type=int, default=4, help="extraction processes")
+    parser.add_argument("--pages-per-task", type=int, default=16)
+    parser.add_argument("--edits", type=int, default=3, help="pages changed in the edited re-upload")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    rows: List[dict] = [
+        asyncio.run(_run(pages, args.workers, args.pages_per_task, args.edits)) for pages in args.pages
+    ]
+    for row in rows:
+        print(
+            "pages={pages:>4} ({kib:.0f} KiB) | serial={serial_ms:.0f}ms | cold={cold_ms:.0f}ms | "
+            "edited={edited_ms:.0f}ms | identical={identical_ms:.1f}ms".format(**row)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Synthetic PDF fixtures for the extraction benchmarks.
+
+Writes a minimal, valid multi-page PDF with one text paragraph per page —
+no third-party PDF writer needed.
+"""
+from typing import List, Optional
+
+_WORDS = (
+    "service gateway cache queue shard replica latency throughput token session "
+    "database index partition consumer producer retry timeout circuit breaker"
+).split()
+
+
+def _page_lines(page: int, lines: int, seed: int) -> List[str]:
+    out = []
+    for line in range(lines):
+        start = (page * 7 + line * 3 + seed) % len(_WORDS)
+        words = [_WORDS[(start + i) % len(_WORDS)] for i in range(12)]
+        out.append(f"Page {page + 1} line {line + 1}: " + " ".join(words))
+    return out
+
+
+def make_pdf(
+    pages: int, lines_per_page: int = 40, seed: int = 0, edited_pages: Optional[set] = None,
+    form_xobjects: bool = False,
+) -> bytes:
+    """Return the bytes of a *pages*-page text PDF.
+
+    Pages listed in *edited_pages* get different text, to simulate a lightly
+    edited resubmission of the same document. With *form_xobjects*, each
+    page draws its text through a form XObject, so every page has the same
+    content stream (``/X0 Do``) and differs only in its form.
+    """
+    edited_pages = edited_pages or set()
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # patched below
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for page in range(pages):
+        lines = _page_lines(page, lines_per_page, seed + (101 if page in edited_pages else 0))
+        text_ops = ["BT", "/F1 9 Tf", "11 TL", "40 800 Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            text_ops.append(f"({escaped}) Tj T*")
+        text_ops.append("ET")
+        stream = "\n".join(text_ops).encode("latin-1")
+        if form_xobjects:
+            form = add(
+                b"<< /Type /XObject /Subtype /Form /BBox [0 0 595 842] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Length %d >>\nstream\n" % (font, len(stream))
+                + stream + b"\nendstream"
+            )
+            resources = b"<< /XObject << /X0 %d 0 R >> >>" % form
+            stream = b"q /X0 Do Q"
+        else:
+            resources = b"<< /Font << /F1 %d 0 R >> >>" % font
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources %s /Contents %d 0 R >>" % (pages_obj, resources, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    objects[pages_obj - 1] = (
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids) + b"] /Count %d >>" % len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+__all__ = ["make_pdf"]
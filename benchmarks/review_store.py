@@ -0,0 +1,158 @@
+"""
+Benchmark: ``get_review`` throughput under concurrent chat streams.
+
+Starts N reader threads (one per chat stream) that call ``get_review`` in a
+tight loop for a fixed duration while a writer thread keeps saving new
+reviews, as completing review jobs would. Reports reads/s and read latency.
+
+Compares the pooled, WAL-mode ``review_store`` against the legacy access
+pattern it replaced (one process-wide lock, a fresh ``sqlite3.connect`` per
+call, rollback journal).
+
+Usage:
+    PYTHONPATH=. python benchmarks/review_store.py --streams 50 --duration 5
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from app.common.util import percentile
+from app.services import review_store
+
+
+class _LegacyStore:
+    """The pre-pooling review_store access pattern, kept here as the baseline."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_review(self, correlation_id: str) -> Optional[dict]:
+        with self.lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT * FROM review_sessions WHERE correlation_id = ?", (correlation_id,)
+                ).fetchone()
+                conn.commit()
+            finally:
+                conn.close()
+        return None if row is None else {"final_report": json.loads(row["final_report"])}
+
+    def save_review(self, correlation_id: str, design_doc: str, final_report: dict) -> None:
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO review_sessions (correlation_id, design_doc, final_report) VALUES (?, ?, ?)",
+                    (correlation_id, design_doc, json.dumps(final_report)),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+
+def _seed(save_review: Callable[[str, str, dict], None], sessions: int) -> List[str]:
+    report = {"executive_summary": "x" * 2000, "findings": [{"title": "t", "detail": "d" * 400}] * 10}
+    ids = [str(uuid.uuid4()) for _ in range(sessions)]
+    for correlation_id in ids:
+        save_review(correlation_id, "design doc " * 500, report)
+    return ids
+
+
+def _run(mode: str, streams: int, duration: float, sessions: int, write_interval: float) -> dict:
+    review_store._DB_PATH = Path(tempfile.mkdtemp()) / f"bench_{mode}.db"
+    review_store.init_db()
+    if mode == "legacy":
+        # The legacy store never enabled WAL: drop this thread's pooled
+        # connection and put the file back into rollback-journal mode.
+        review_store._local.conn.close()
+        review_store._local.__dict__.clear()
+        conn = sqlite3.connect(str(review_store._DB_PATH))
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+    legacy = _LegacyStore(review_store._DB_PATH)
+    get_review: Callable[[str], Optional[dict]] = legacy.get_review if mode == "legacy" else review_store.get_review
+    save_review = legacy.save_review if mode == "legacy" else review_store.save_review
+    ids = _seed(save_review, sessions)
+
+    stop = threading.Event()
+    latencies: List[List[float]] = [[] for _ in range(streams)]
+    write_latencies: List[float] = []
+
+    def _reader(index: int) -> None:
+        samples = latencies[index]
+        i = index
+        while not stop.is_set():
+            started = time.perf_counter()
+            get_review(ids[i % len(ids)])
+            samples.append(time.perf_counter() - started)
+            i += 1
+
+    def _writer() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            save_review(str(uuid.uuid4()), "design doc", {"executive_summary": "new"})
+            write_latencies.append(time.perf_counter() - started)
+            time.sleep(write_interval)
+
+    threads = [threading.Thread(target=_reader, args=(i,), daemon=True) for i in range(streams)]
+    threads.append(threading.Thread(target=_writer, daemon=True))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    flat = [sample for samples in latencies for sample in samples]
+    return {
+        "mode": mode,
+        "streams": streams,
+        "reads": len(flat),
+        "reads_per_s": len(flat) / duration,
+        "writes": len(write_latencies),
+        "write_p50_ms": percentile(write_latencies, 50) * 1000,
+        "latency_p50_ms": percentile(flat, 50) * 1000,
+        "latency_p99_ms": percentile(flat, 99) * 1000,
+        "latency_mean_ms": statistics.fmean(flat) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=50, help="concurrent chat streams (reader threads)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per mode")
+    parser.add_argument("--sessions", type=int, default=200, help="stored review sessions to read from")
+    parser.add_argument("--write-interval", type=float, default=0.05, help="seconds between writer saves")
+    parser.add_argument("--mode", choices=["pooled", "legacy", "both"], default="both")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    modes = ["legacy", "pooled"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = _run(mode, args.streams, args.duration, args.sessions, args.write_interval)
+        print(
+            "{mode:>6} | streams={streams} | reads={reads} ({reads_per_s:,.0f}/s) | "
+            "read p50={latency_p50_ms:.2f}ms p99={latency_p99_ms:.2f}ms mean={latency_mean_ms:.2f}ms | "
+            "writes={writes} (p50={write_p50_ms:.1f}ms)".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
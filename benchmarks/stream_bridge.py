@@ -0,0 +1,126 @@
+"""
+Benchmark: idle-stream cost and event latency of the review stream bridge.
+
+Opens N concurrent review streams that sit idle, samples the process thread
+count and CPU time while they wait, then dispatches one event per stream
+from a worker thread and measures dispatch → yield latency.
+
+Compares the event-driven ``StreamBridge`` against the legacy
+``run_in_executor(queue.get(timeout=0.2))`` polling loop it replaced.
+
+Usage:
+    PYTHONPATH=. python benchmarks/stream_bridge.py --streams 1000 --idle 3
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import threading
+import time
+from queue import Empty, Queue
+from typing import AsyncGenerator, List
+
+from app.common.streaming import StreamBridge, stream_queue
+from app.common.util import percentile
+
+
+async def _legacy_stream(sync_queue: Queue) -> AsyncGenerator[float, None]:
+    """The pre-StreamBridge polling loop, kept here as the baseline."""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            event = await loop.run_in_executor(None, lambda: sync_queue.get(timeout=0.2))
+            if event is None:
+                break
+            yield event
+        except Empty:
+            await asyncio.sleep(0.1)
+
+
+async def _run(mode: str, streams: int, idle: float) -> dict:
+    latencies: List[float] = []
+    done = asyncio.Event()
+    remaining = streams
+
+    def _record(sent_at: float) -> None:
+        nonlocal remaining
+        latencies.append(time.perf_counter() - sent_at)
+        remaining -= 1
+        if remaining == 0:
+            done.set()
+
+    producers = []
+    consumers = []
+    for _ in range(streams):
+        if mode == "bridge":
+            bridge = StreamBridge()
+
+            async def _consume(b: StreamBridge = bridge) -> None:
+                async for chunk in stream_queue(b, label="bench"):
+                    _record(json.loads(chunk)["sent_at"])
+
+            consumers.append(asyncio.create_task(_consume()))
+            producers.append(bridge.put)
+        else:
+            sync_queue: Queue = Queue()
+
+            async def _consume_legacy(q: Queue = sync_queue) -> None:
+                async for event in _legacy_stream(q):
+                    _record(event["sent_at"])
+
+            consumers.append(asyncio.create_task(_consume_legacy()))
+            producers.append(sync_queue.put)
+
+    threads_before = threading.active_count()
+    cpu_before = time.process_time()
+    peak_threads = threads_before
+    idle_until = time.perf_counter() + idle
+    while time.perf_counter() < idle_until:
+        await asyncio.sleep(0.1)
+        peak_threads = max(peak_threads, threading.active_count())
+    idle_cpu = time.process_time() - cpu_before
+
+    def _dispatch() -> None:
+        for put in producers:
+            put({"status": "executing", "sent_at": time.perf_counter()})
+        for put in producers:
+            put(None)
+
+    threading.Thread(target=_dispatch, daemon=True).start()
+    await asyncio.wait_for(done.wait(), timeout=120)
+    await asyncio.gather(*consumers)
+
+    return {
+        "mode": mode,
+        "streams": streams,
+        "threads_idle_peak": peak_threads,
+        "idle_cpu_s": idle_cpu,
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "latency_max_ms": max(latencies) * 1000,
+        "latency_mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=1000)
+    parser.add_argument("--idle", type=float, default=3.0, help="seconds to hold streams idle")
+    parser.add_argument("--mode", choices=["bridge", "legacy", "both"], default="both")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    modes = ["legacy", "bridge"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = asyncio.run(_run(mode, args.streams, args.idle))
+        print(
+            "{mode:>7} | streams={streams} | threads(idle peak)={threads_idle_peak} | "
+            "idle cpu={idle_cpu_s:.2f}s | latency p50={latency_p50_ms:.1f}ms "
+            "p99={latency_p99_ms:.1f}ms max={latency_max_ms:.1f}ms".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,22 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 
+from crewai.hooks import register_before_llm_call_hook
+
+from app.common.cancellation import block_cancelled_llm_calls, cancellation_stats
+from app.common.crew_pool import CrewWorkerPool
+from app.common.warm_crew_pool import WarmCrewPool
+from app.common.upload_limit import MULTIPART_OVERHEAD_BYTES, UploadSizeLimitMiddleware
+from app.common.constants import REVIEW_ESTIMATE_HEADER
 from app.common.event_dispatcher import EventDispatcher
+from app.common.metrics import register_runtime
+from app.common.tracing import review_tracer
 from app.common.exception_handlers import register_exception_handlers
 from app.config.config import settings
 from app.services.document_extractor import DocumentExtractor
+from app.services.llm import LLMService
 from app.services.review_store import init_db
+from app.services.reviewer.reviewer_crew import DesignReviewerCrew
 from app.services.reviewer.reviewer_event_listeners import ReviewerEventListener
 from app.services.reviewer.reviewer_facade import ReviewerFacade
 from app.services.reviewer.reviewer_service import ReviewerService
@@ -18,6 +29,7 @@ from app.config.config_keys import (
     APP_NAME, APP_DESCRIPTION, APP_VERSION,
     CORS_ORIGINS, CORS_CREDENTIALS, CORS_METHODS, CORS_HEADERS,
     SERVER_HOST, SERVER_PORT, SERVER_RELOAD,
+    REVIEWER_WORKER_POOL_SIZE, REVIEWER_WORKER_QUEUE_DEPTH, REVIEWER_RETRY_AFTER_SECONDS,
 )
 
 _debug = settings.get("log_level", "INFO").upper() == "DEBUG"
@@ -36,6 +48,8 @@ app.add_middleware(
     allow_credentials=settings.get(CORS_CREDENTIALS),
     allow_methods=settings.get(CORS_METHODS),
     allow_headers=settings.get(CORS_HEADERS),
+    # Let browser clients read the pre-flight estimate of a review
+    expose_headers=[REVIEW_ESTIMATE_HEADER],
 )
 
 app.include_router(api_router, prefix="/api")
@@ -45,17 +59,45 @@ register_exception_handlers(app)
 # Initialise SQLite schema on startup
 init_db()
 
+# Every LLM call (crew agents and chat) shares one pooled HTTP client per mode
+LLMService.install_http_pool()
+app.add_event_handler("shutdown", LLMService.http_pool.aclose)
+
 # Build shared singletons once and store on app.state so endpoints can
 # resolve them via FastAPI dependency injection (no module-level globals).
 _event_dispatcher = EventDispatcher()
 app.state.event_dispatcher = _event_dispatcher
-app.state.reviewer_service = ReviewerService(_event_dispatcher)
+_crew_pool = CrewWorkerPool(
+    max_workers=settings.get_int(REVIEWER_WORKER_POOL_SIZE, 4),
+    max_queue_depth=settings.get_int(REVIEWER_WORKER_QUEUE_DEPTH, 16),
+    retry_after_seconds=settings.get_int(REVIEWER_RETRY_AFTER_SECONDS, 30),
+)
+app.state.crew_pool = _crew_pool
+# One prebuilt crew per worker, leased to a single review at a time
+_warm_crews = WarmCrewPool(lambda: DesignReviewerCrew().crew(), size=_crew_pool.max_workers)
+app.state.warm_crews = _warm_crews
+app.state.reviewer_service = ReviewerService(_event_dispatcher, _crew_pool, _warm_crews)
 _document_extractor = DocumentExtractor()
 app.state.document_extractor = _document_extractor
+app.add_event_handler("shutdown", _document_extractor.shutdown)
+# Reject oversized uploads while they are being received, not after buffering
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_bytes=_document_extractor.max_file_size_bytes + MULTIPART_OVERHEAD_BYTES,
+    max_file_mb=_document_extractor.max_file_size_bytes // (1024 * 1024),
+    paths=("/api/v1/review/upload",),
+)
 app.state.reviewer_facade = ReviewerFacade(app.state.reviewer_service, _event_dispatcher, _document_extractor)
 
+# Report session, worker, queue and cache occupancy on /api/v1/metrics, read at scrape time
+register_runtime(_event_dispatcher, _crew_pool, _warm_crews, LLMService.response_cache, cancellation_stats)
+# Flush spans still waiting to be written to review_tracing.export_path
+app.add_event_handler("shutdown", review_tracer.shutdown)
+
 # Wire the CrewAI event listener to the shared dispatcher — must happen once at startup
 ReviewerEventListener(event_dispatcher=_event_dispatcher)
+# Stop agents of cancelled reviews from making further LLM calls
+register_before_llm_call_hook(block_cancelled_llm_calls)
 
 if __name__ == "__main__":
     import uvicorn
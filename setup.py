@@ -13,7 +13,8 @@ setup(
     install_requires=[
         "fastapi>=0.104.1",
         "uvicorn[standard]>=0.24.0",
-        "crewai[tools]>=1.7.2",
+        # Token accounting reads BaseLLM._token_usage; see app.common.util.llm_token_usage.
+        "crewai[tools]>=1.7.2,<1.8",
         "pydantic>=2.5.0",
         "python-multipart>=0.0.6",
     ],
@@ -0,0 +1,89 @@
+"""
+Shared test setup.
+
+Settings are read when the app modules are first imported, so the
+environment is fixed here, before any test module imports them: a
+throwaway SQLite database, and every OpenAI call pointed at the local
+fake LLM from benchmarks/fake_llm.py. No API key or network is needed.
+"""
+import os
+import tempfile
+import threading
+
+import pytest
+
+from benchmarks.fake_llm import FakeLLMServer
+
+_DATA_DIR = tempfile.mkdtemp(prefix="reviewer-tests-")
+FAKE_LLM = FakeLLMServer(latency=0.2, token_delay=0.001).start()
+
+os.environ.update({
+    "STORAGE_DB_PATH": os.path.join(_DATA_DIR, "review_sessions.db"),
+    "OPENAI_BASE_URL": FAKE_LLM.url,
+    "OPENAI_API_KEY": "sk-test",
+    "LLM_CASSETTE_MODE": "off",
+    "CREWAI_TRACING_ENABLED": "false",
+    "CREWAI_DISABLE_TELEMETRY": "true",
+})
+
+from app.common.request_context import reset_correlation_id, set_correlation_id  # noqa: E402
+
+
+class RecordingBridge:
+    """StreamBridge stand-in that records what it is sent; ``closed`` is set by ``close()``."""
+
+    def __init__(self):
+        self.events = []
+        self.closed = threading.Event()
+
+    def put(self, event):
+        self.events.append(event)
+
+    def close(self):
+        self.closed.set()
+
+
+@pytest.fixture
+def make_bridge():
+    """Builds recording subscriber streams (see ``RecordingBridge``)."""
+    return RecordingBridge
+
+
+@pytest.fixture
+def fake_llm() -> FakeLLMServer:
+    """The fake LLM every OpenAI call of the app goes to."""
+    return FAKE_LLM
+
+
+@pytest.fixture
+def correlation_id():
+    """A correlation ID set on the test's context for its duration."""
+    token = set_correlation_id("test-review-0001")
+    yield "test-review-0001"
+    reset_correlation_id(token)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def review_db():
+    """Create the tables in the throwaway database once per test session."""
+    from app.services.review_store import init_db
+
+    init_db()
+
+
+@pytest.fixture
+def stored_blueprint():
+    """A stored extract_blueprint_task output, as ReviewCache keeps it."""
+    return {
+        "raw": '{"is_valid": true}',
+        "output": {
+            "is_valid": True,
+            "system_identity": {"name": "Orders", "primary_style": "Monolith", "deployment_target": "EC2"},
+            "component_registry": [
+                {"name": "api", "type": "Web Server", "hosting": "EC2", "statefulness": "Stateless"},
+            ],
+            "interaction_map": [],
+            "technical_constraints": {},
+            "omission": {},
+        },
+    }
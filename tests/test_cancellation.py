@@ -0,0 +1,108 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.common.cancellation import (
+    CancelToken, block_cancelled_llm_calls, cancellation_stats, reset_cancel_token, set_cancel_token,
+)
+from app.common.crew_runner import ContextPropagatingTask, run_crew_in_thread
+from app.common.event_dispatcher import EventDispatcher
+from app.common.exception_handlers import JobCancelledException
+from app.models.api_schema import ReviewRequest
+from app.services.reviewer.reviewer_facade import ReviewerFacade
+
+
+class _Crew:
+    def __init__(self, tasks: int):
+        self.tasks = [object()] * tasks
+        self.kickoffs = 0
+
+    def kickoff(self, inputs):
+        self.kickoffs += 1
+
+
+@pytest.fixture
+def cancelled():
+    cancel_token = CancelToken()
+    cancel_token.cancel("test")
+    ctx_token = set_cancel_token(cancel_token)
+    yield cancel_token
+    reset_cancel_token(ctx_token)
+
+
+def test_token_cancels_once_and_raises():
+    cancel_token = CancelToken()
+    cancel_token.raise_if_cancelled()
+
+    assert cancel_token.cancel("tab closed")
+    assert not cancel_token.cancel("again")
+    with pytest.raises(JobCancelledException):
+        cancel_token.raise_if_cancelled()
+    assert cancel_token.reason == "tab closed"
+
+
+def test_llm_calls_are_blocked_only_for_cancelled_jobs():
+    context = SimpleNamespace(messages=[{"role": "user", "content": "x" * 400}])
+    assert block_cancelled_llm_calls(context) is None
+
+    ctx_token = set_cancel_token(CancelToken())
+    try:
+        assert block_cancelled_llm_calls(context) is None
+    finally:
+        reset_cancel_token(ctx_token)
+
+
+def test_blocked_call_counts_its_prompt(cancelled):
+    before = cancellation_stats.stats()
+
+    assert block_cancelled_llm_calls(SimpleNamespace(messages=[{"content": "x" * 400}])) is False
+
+    after = cancellation_stats.stats()
+    assert after["blocked_llm_calls"] == before["blocked_llm_calls"] + 1
+    assert after["estimated_tokens_saved"] - before["estimated_tokens_saved"] >= 100
+
+
+def test_tasks_of_a_cancelled_job_do_not_start(cancelled):
+    task = ContextPropagatingTask(description="Review the design", expected_output="A review")
+
+    with pytest.raises(JobCancelledException):
+        task.execute_sync()
+    with pytest.raises(JobCancelledException):
+        task.execute_async()
+    assert cancelled.tasks_started == 0
+
+
+def test_a_job_cancelled_while_queued_never_kicks_off(make_bridge):
+    dispatcher, session_id = EventDispatcher(), f"test-{uuid.uuid4()}"
+    bridge, crew = make_bridge(), _Crew(tasks=3)
+    dispatcher.register_session(session_id, bridge)
+    cancel_token = CancelToken()
+    cancel_token.cancel()
+    before = cancellation_stats.stats()
+
+    run_crew_in_thread(
+        crew=crew, inputs={}, correlation_id=session_id, event_dispatcher=dispatcher, cancel_token=cancel_token,
+    )
+
+    assert bridge.closed.wait(5)
+    assert crew.kickoffs == 0
+    assert bridge.events == []
+    after = cancellation_stats.stats()
+    assert after["cancelled_jobs"] == before["cancelled_jobs"] + 1
+    assert after["skipped_tasks"] == before["skipped_tasks"] + 3
+
+
+async def test_a_review_stream_closed_before_it_was_read_leaves_the_job():
+    left = []
+
+    async def run_crew_job(request, stream, use_cache, estimate):
+        return request.correlation_id
+
+    service = SimpleNamespace(run_crew_job=run_crew_job, leave_job=lambda session_id, stream: left.append(session_id))
+    facade = ReviewerFacade(service, event_dispatcher=None, document_extractor=None)
+
+    events = await facade.start_review(ReviewRequest(design_doc="# Design", correlation_id="review-1"))
+    await events.aclose()
+    await events.aclose()
+    assert left == ["review-1"]
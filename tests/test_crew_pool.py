@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from app.common.crew_pool import CrewWorkerPool
+from app.common.exception_handlers import CrewPoolFullException
+
+
+def _blocking_job(release: threading.Event, started: threading.Event = None):
+    def job():
+        if started is not None:
+            started.set()
+        release.wait(5)
+    return job
+
+
+def test_runs_immediately_when_a_worker_is_idle():
+    pool = CrewWorkerPool(max_workers=1, max_queue_depth=0)
+    done = threading.Event()
+
+    assert pool.submit(done.set) == 0
+    assert done.wait(5)
+
+
+def test_queues_then_rejects_once_the_queue_is_full():
+    pool = CrewWorkerPool(max_workers=1, max_queue_depth=1, retry_after_seconds=7)
+    release, started = threading.Event(), threading.Event()
+    positions = []
+    try:
+        assert pool.submit(_blocking_job(release, started)) == 0
+        assert started.wait(5)
+
+        assert pool.submit(_blocking_job(release), on_position=positions.append) == 1
+        assert positions == [1]
+        assert not pool.has_capacity()
+
+        with pytest.raises(CrewPoolFullException) as rejected:
+            pool.submit(_blocking_job(release))
+        assert rejected.value.retry_after_seconds == 7
+
+        stats = pool.stats()
+        assert (stats["active"], stats["queue_depth"], stats["rejected"]) == (1, 1, 1)
+    finally:
+        release.set()
+
+
+def test_a_failing_job_does_not_kill_its_worker():
+    pool = CrewWorkerPool(max_workers=1, max_queue_depth=1)
+    done = threading.Event()
+
+    def boom():
+        raise RuntimeError("boom")
+
+    pool.submit(boom)
+    pool.submit(done.set)
+    assert done.wait(5)
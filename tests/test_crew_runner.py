@@ -0,0 +1,104 @@
+import threading
+import uuid
+
+import pytest
+from crewai import Agent
+from crewai.events import AgentExecutionStartedEvent, TaskCompletedEvent, crewai_event_bus
+
+from app.common import crew_runner
+from app.common.event_dispatcher import EventDispatcher
+from app.common.request_context import reset_correlation_id, set_correlation_id
+from app.models.blueprint_schema import DocBlueprint
+from app.services.reviewer.reviewer_crew import DesignReviewerCrew
+from app.services.reviewer.reviewer_event_listeners import ReviewerEventListener
+from benchmarks.fake_llm import OUTPUTS
+
+
+@pytest.fixture(scope="module")
+def blueprint_task():
+    crew = DesignReviewerCrew().crew()
+    return next(task for task in crew.tasks if task.name == "extract_blueprint_task")
+
+
+@pytest.fixture
+def reuse():
+    ctx_tokens = []
+
+    def set_reused(outputs):
+        ctx_tokens.append(crew_runner._reused_outputs.set(outputs))
+
+    yield set_reused
+    for ctx_token in reversed(ctx_tokens):
+        crew_runner._reused_outputs.reset(ctx_token)
+
+
+def test_a_reused_output_completes_the_task_without_its_agent(blueprint_task, reuse, stored_blueprint, monkeypatch):
+    completed = []
+    monkeypatch.setattr(crewai_event_bus, "emit", lambda source, event: completed.append(event))
+    reuse({"extract_blueprint_task": stored_blueprint})
+
+    output = blueprint_task.execute_sync()
+
+    assert isinstance(output.pydantic, DocBlueprint)
+    assert output.pydantic.system_identity.name == "Orders"
+    assert blueprint_task.output is output
+    assert [type(event) for event in completed] == [TaskCompletedEvent]
+
+
+def test_a_stored_output_that_no_longer_validates_is_ignored(blueprint_task, reuse, stored_blueprint):
+    reuse({"extract_blueprint_task": {"raw": "{}", "output": {"is_valid": True}}})
+    assert blueprint_task._reuse_output(None) is None
+
+
+def test_specialist_events_keep_their_review_when_they_finish_out_of_order(make_bridge, monkeypatch):
+    crew = DesignReviewerCrew().crew()
+    tasks = {task.name: task for task in crew.tasks}
+    performance, security = tasks["performance_review_task"], tasks["security_review_task"]
+    assert performance.async_execution and security.async_execution
+    reviews = [f"test-{uuid.uuid4()}" for _ in range(2)]
+    # The crew is shared: its agents' fingerprints carry the review stamped last.
+    for agent in crew.agents:
+        agent.fingerprint.metadata["correlation_id"] = reviews[-1]
+
+    started = {task.name: threading.Event() for task in (performance, security)}
+    finish = {task.name: threading.Event() for task in (performance, security)}
+
+    def execute_task(agent, task, context=None, tools=None):
+        crewai_event_bus.emit(
+            agent, AgentExecutionStartedEvent(agent=agent, task=task, tools=[], task_prompt=task.description),
+        ).result()
+        started[task.name].set()
+        assert finish[task.name].wait(5)
+        return OUTPUTS[task.output_pydantic.__name__].model_dump_json()
+
+    monkeypatch.setattr(Agent, "execute_task", execute_task)
+    dispatcher = EventDispatcher()
+    ReviewerEventListener(dispatcher)
+    bridges = {review: make_bridge() for review in reviews}
+
+    for review in reviews:
+        dispatcher.register_session(review, bridges[review])
+        ReviewerEventListener.track(review)
+        ctx_token = set_correlation_id(review)
+        try:
+            futures = [performance.execute_async(), security.execute_async()]
+        finally:
+            reset_correlation_id(ctx_token)
+        assert all(event.wait(5) for event in started.values())
+        finish[security.name].set()
+        futures[1].result(5)
+        ReviewerEventListener.flush(review, 1)
+        assert not futures[0].done()
+        finish[performance.name].set()
+        futures[0].result(5)
+        ReviewerEventListener.flush(review, 2)
+        ReviewerEventListener.untrack(review)
+        dispatcher.close_session(review)
+        for event in (*started.values(), *finish.values()):
+            event.clear()
+
+    names = {task.name: task.agent.fingerprint.metadata["display_name"] for task in (performance, security)}
+    for review in reviews:
+        events = [(e.agent, e.message_type) for e in bridges[review].events if e.message_type in ("thinking", "result")]
+        assert sorted(events[:2]) == sorted((names[name], "thinking") for name in names)
+        assert events[2:] == [(names[security.name], "result"), (names[performance.name], "result")]
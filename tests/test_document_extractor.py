@@ -0,0 +1,189 @@
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+import pytest
+from docx import Document
+from fastapi import UploadFile
+
+from app.services.document_extractor import (
+    DocumentExtractor, ExtractionError, _extract_pdf_pages, _parse_source, _TextLRU,
+)
+from benchmarks.pdf_fixtures import make_pdf
+
+_CORRUPTED = "Could not extract text from file. The file may be corrupted or password-protected."
+
+
+@pytest.fixture
+def extractor():
+    extractor = DocumentExtractor()
+    yield extractor
+    extractor.shutdown()
+
+
+def _upload(data: bytes, filename: str) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+
+def _docx(*paragraphs: str) -> bytes:
+    document = Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+async def _error(extractor: DocumentExtractor, data: bytes, filename: str) -> ExtractionError:
+    with pytest.raises(ExtractionError) as error:
+        await extractor.extract(_upload(data, filename))
+    return error.value
+
+
+async def test_text_files_are_read_as_is(extractor):
+    assert await extractor.extract(_upload(b"# Design\n\nhello", "design.md")) == "# Design\n\nhello"
+
+
+async def test_pdf_and_docx_are_parsed(extractor):
+    assert "\n" in await extractor.extract(_upload(make_pdf(3), "design.pdf"))
+    assert await extractor.extract(_upload(_docx("Overview", "", "Storage"), "design.docx")) == "Overview\n\nStorage"
+
+
+async def test_an_upload_spooled_to_disk_is_parsed_in_place(extractor):
+    pdf = make_pdf(3)
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+    spooled.write(pdf)
+
+    source, _ = _parse_source(spooled)
+    assert source == f"/proc/{os.getpid()}/fd/{spooled.fileno()}"
+    assert _parse_source(io.BytesIO(pdf))[0] == pdf
+    assert await extractor.extract(UploadFile(spooled, filename="design.pdf")) == \
+        await extractor.extract(_upload(pdf, "again.pdf"))
+
+
+async def test_unsupported_type_is_400(extractor):
+    error = await _error(extractor, b"MZ", "design.exe")
+    assert error.status_code == 400 and str(error).startswith("Unsupported file type '.exe'")
+
+
+async def test_oversized_file_is_413(extractor):
+    extractor.max_file_size_bytes = 1024
+    error = await _error(extractor, b"x" * 4096, "design.txt")
+    assert (error.status_code, str(error)) == (413, "File exceeds maximum size of 0MB")
+
+
+@pytest.mark.parametrize("data, filename", [
+    (b"%PDF-1.4\nnot really a pdf", "design.pdf"),
+    (b"\xff\xfe\xfa not utf-8", "design.txt"),
+    (b"PK not a docx", "design.docx"),
+])
+async def test_unreadable_files_are_reported_as_corrupted(extractor, data, filename):
+    error = await _error(extractor, data, filename)
+    assert (error.status_code, str(error)) == (422, _CORRUPTED)
+
+
+async def test_parser_errors_keep_their_message(extractor):
+    error = await _error(extractor, _docx(), "design.docx")
+    assert (error.status_code, str(error)) == (422, "Could not extract text from document. The file may be empty.")
+
+
+async def test_resubmitted_pdf_is_served_from_the_cache(extractor):
+    pdf = make_pdf(4)
+    text = await extractor.extract(_upload(pdf, "design.pdf"))
+
+    pool_calls = []
+    run_in_pool = extractor._run_in_pool
+    extractor._run_in_pool = lambda *args: pool_calls.append(args) or run_in_pool(*args)
+    assert await extractor.extract(_upload(pdf, "again.pdf")) == text
+    assert pool_calls == []
+
+
+def _record_page_parses(extractor: DocumentExtractor) -> list:
+    """Batches of page indices the extractor sends to the pool from now on."""
+    batches = []
+    run_in_pool = extractor._run_in_pool
+
+    def recording(func, *args):
+        if func is _extract_pdf_pages:
+            batches.append(args[1])
+        return run_in_pool(func, *args)
+
+    extractor._run_in_pool = recording
+    return batches
+
+
+async def test_an_edited_pdf_reparses_only_the_changed_page(extractor):
+    await extractor.extract(_upload(make_pdf(6), "design.pdf"))
+    edited = make_pdf(6, edited_pages={2})
+
+    batches = _record_page_parses(extractor)
+    text = await extractor.extract(_upload(edited, "edited.pdf"))
+
+    assert batches == [[2]]
+    fresh = DocumentExtractor()
+    try:
+        assert text == await fresh.extract(_upload(edited, "edited.pdf"))
+    finally:
+        fresh.shutdown()
+
+
+async def test_pages_differing_only_in_their_form_xobject_keep_their_own_text(extractor):
+    # Both pages' content stream is "/X0 Do"; only the form it names differs.
+    await extractor.extract(_upload(make_pdf(2, form_xobjects=True), "design.pdf"))
+
+    batches = _record_page_parses(extractor)
+    text = await extractor.extract(_upload(make_pdf(2, form_xobjects=True, edited_pages={0}), "edited.pdf"))
+
+    assert batches == [[0]]
+    assert text.count("Page 1 line 1:") == text.count("Page 2 line 1:") == 1
+    assert text.index("Page 1 line 1:") < text.index("Page 2 line 1:")
+
+
+def test_text_cache_evicts_least_recently_used_by_size():
+    cache = _TextLRU(max_chars=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    cache.get("a")
+    cache.put("c", "cccc")
+    cache.put("huge", "x" * 11)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c"), cache.get("huge")) == ("aaaa", None, "cccc", None)
+
+
+async def test_slow_parse_times_out_and_the_pool_recovers(extractor):
+    extractor.timeout_seconds = 0
+    error = await _error(extractor, make_pdf(5), "design.pdf")
+    assert (error.status_code, str(error)) == (422, "Text extraction took longer than 0s and was aborted.")
+
+    extractor.timeout_seconds = 30
+    assert await extractor.extract(_upload(make_pdf(1), "design.pdf"))
+
+
+async def test_a_timeout_fails_only_its_own_parse(extractor, monkeypatch):
+    extractor.max_workers = 1
+    parse = extractor._parse
+    # The PDF parse hangs; the DOCX one queues behind it in the single worker.
+    monkeypatch.setattr(extractor, "_parse", lambda extension, path, file_hash: (
+        extractor._run_in_pool(time.sleep, 30) if extension == ".pdf" else parse(extension, path, file_hash)
+    ))
+    extractor.timeout_seconds = 1
+    hanging = asyncio.create_task(extractor.extract(_upload(make_pdf(1), "hang.pdf")))
+    await asyncio.sleep(0)
+    extractor.timeout_seconds = 30
+    queued = asyncio.create_task(extractor.extract(_upload(_docx("Overview"), "design.docx")))
+
+    with pytest.raises(ExtractionError, match="took longer than 1s"):
+        await hanging
+    assert await queued == "Overview"
+
+
+async def test_a_parse_whose_pool_breaks_twice_reports_a_worker_crash(extractor, monkeypatch):
+    attempts = []
+    monkeypatch.setattr(extractor, "_parse", lambda *args: attempts.append(args) or extractor._run_in_pool(os._exit, 1))
+
+    error = await _error(extractor, _docx("Overview"), "design.docx")
+
+    assert len(attempts) == 2
+    assert str(error) == "The extraction worker stopped unexpectedly while parsing the file. Please try again."
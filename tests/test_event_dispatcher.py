@@ -0,0 +1,56 @@
+import uuid
+
+from app.common.event_dispatcher import EventDispatcher
+
+
+def _session_id() -> str:
+    return f"test-{uuid.uuid4()}"
+
+
+def test_is_a_singleton():
+    assert EventDispatcher() is EventDispatcher()
+
+
+def test_late_subscriber_gets_history_but_not_unreplayed_events(make_bridge):
+    dispatcher, sid = EventDispatcher(), _session_id()
+    first, late = make_bridge(), make_bridge()
+    dispatcher.register_session(sid, first)
+
+    dispatcher.dispatch(sid, "thinking")
+    dispatcher.dispatch(sid, "token", history=False)
+    dispatcher.dispatch(sid, "partial")
+    assert dispatcher.subscribe(sid, late)
+    dispatcher.dispatch(sid, "result")
+    dispatcher.close_session(sid)
+
+    assert first.events == ["thinking", "token", "partial", "result"]
+    assert late.events == ["thinking", "partial", "result"]
+    assert first.closed.is_set() and late.closed.is_set()
+
+
+def test_history_keeps_only_the_latest_events(make_bridge):
+    dispatcher, sid = EventDispatcher(), _session_id()
+    dispatcher.register_session(sid, make_bridge())
+    for index in range(1000):
+        dispatcher.dispatch(sid, index)
+
+    late = make_bridge()
+    dispatcher.subscribe(sid, late)
+    dispatcher.close_session(sid)
+
+    assert late.events == list(range(1000 - 256, 1000))
+
+
+def test_subscribe_and_unsubscribe(make_bridge):
+    dispatcher, sid = EventDispatcher(), _session_id()
+    first, second = make_bridge(), make_bridge()
+
+    assert not dispatcher.subscribe(sid, second)
+    dispatcher.register_session(sid, first)
+    assert dispatcher.subscribe(sid, second)
+    assert dispatcher.unsubscribe(sid, second) == 1
+
+    dispatcher.dispatch(sid, "result")
+    dispatcher.close_session(sid)
+    assert second.events == [] and not second.closed.is_set()
+    assert not dispatcher.has_session(sid)
@@ -0,0 +1,61 @@
+import json
+import random
+
+import pytest
+
+from app.common.json_stream import JsonItemStream
+from benchmarks.fake_llm import OUTPUTS
+
+
+def _feed_in_chunks(stream: JsonItemStream, text: str, seed: int) -> list:
+    rng = random.Random(seed)
+    items, pos = [], 0
+    while pos < len(text):
+        size = rng.randint(1, 12)
+        items += stream.feed(text[pos:pos + size])
+        pos += size
+    return items
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_items_arrive_as_each_one_closes(seed):
+    review = OUTPUTS["PerformanceReview"].model_dump()
+    text = "```json\n" + json.dumps(review, indent=2) + "\n```"
+
+    items = _feed_in_chunks(JsonItemStream(["bottlenecks", "scalability_blockers"]), text, seed)
+
+    assert items == (
+        [("bottlenecks", index, item) for index, item in enumerate(review["bottlenecks"])]
+        + [("scalability_blockers", index, item) for index, item in enumerate(review["scalability_blockers"])]
+    )
+
+
+def test_nested_objects_are_part_of_their_item():
+    report = OUTPUTS["ReviewReport"].model_dump()
+    items = JsonItemStream(["findings"]).feed(json.dumps(report))
+
+    assert [item for _, _, item in items] == report["findings"]
+    # "scorecard" is an object, not a list of them.
+    assert JsonItemStream(["scorecard"]).feed(json.dumps(report)) == []
+
+
+def test_restarts_after_the_final_answer_marker():
+    review = OUTPUTS["SecurityReview"].model_dump()
+    text = (
+        "Thought: the {gateway has no auth [\"x\"\n"
+        "Final Answer: " + json.dumps(review)
+    )
+
+    items = _feed_in_chunks(JsonItemStream(["vulnerabilities"], start_marker="Final Answer:"), text, seed=1)
+    assert [item for _, _, item in items] == review["vulnerabilities"]
+
+
+def test_braces_and_escapes_inside_strings():
+    text = json.dumps({"findings": [{"finding": "a } brace, a \" quote and a \\ slash {"}, {"finding": "ok"}]})
+    items = _feed_in_chunks(JsonItemStream(["findings"]), text, seed=2)
+    assert [item["finding"] for _, _, item in items] == ['a } brace, a " quote and a \\ slash {', "ok"]
+
+
+def test_invalid_item_is_skipped():
+    text = '{"findings": [{"finding": 1,}, {"finding": 2}]}'
+    assert JsonItemStream(["findings"]).feed(text) == [("findings", 1, {"finding": 2})]
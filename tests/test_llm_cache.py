@@ -0,0 +1,68 @@
+import uuid
+
+from app.models.performance_schema import PerformanceReview
+from app.services.llm_cache import LLMResponseCache
+
+
+class _LLM:
+    """Stands in for a crewai.LLM: the attributes the cache keys on and a counted call."""
+
+    def __init__(self, model="openai/gpt-4o-mini", temperature=0.0, reply="answer"):
+        self.model = model
+        self.temperature = temperature
+        self.reply = reply
+        self.calls = 0
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        self.calls += 1
+        return self.reply
+
+
+def _messages(text: str) -> list:
+    return [{"role": "system", "content": "You are a librarian."}, {"role": "user", "content": text}]
+
+
+def test_key_ignores_whitespace_but_not_content():
+    cache = LLMResponseCache(max_bytes=1 << 20)
+    llm = _LLM()
+
+    key = cache.make_key(llm, _messages("Summarise  the\n design."))
+    assert key == cache.make_key(llm, _messages("Summarise the design."))
+    assert key != cache.make_key(llm, _messages("Summarise the diagram."))
+
+
+def test_key_covers_model_sampling_params_and_schema():
+    cache = LLMResponseCache(max_bytes=1 << 20)
+    messages = _messages("Summarise the design.")
+    key = cache.make_key(_LLM(), messages)
+
+    assert key != cache.make_key(_LLM(model="openai/gpt-4o"), messages)
+    assert key != cache.make_key(_LLM(temperature=0.7), messages)
+    assert key != cache.make_key(_LLM(), messages, PerformanceReview)
+    assert cache.make_key(_LLM(), "Summarise the design.") == cache.make_key(
+        _LLM(), [{"role": "user", "content": "Summarise the design."}]
+    )
+
+
+def test_wrapped_llm_answers_repeats_from_the_cache():
+    cache = LLMResponseCache(max_bytes=1 << 20)
+    llm = cache.wrap(_LLM())
+    messages = _messages(f"Summarise document {uuid.uuid4()}.")
+
+    assert llm.call(messages) == "answer"
+    assert llm.call(messages) == "answer"
+    assert llm.calls == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_calls_with_tools_or_a_disabled_cache_are_not_cached():
+    messages = _messages(f"Summarise document {uuid.uuid4()}.")
+    llm = LLMResponseCache(max_bytes=1 << 20).wrap(_LLM())
+    llm.call(messages, tools=[{"name": "search"}])
+    llm.call(messages, tools=[{"name": "search"}])
+    assert llm.calls == 2
+
+    llm = LLMResponseCache(max_bytes=1 << 20, enabled=False).wrap(_LLM())
+    llm.call(messages)
+    llm.call(messages)
+    assert llm.calls == 2
@@ -0,0 +1,73 @@
+import pytest
+
+from app.common.exception_handlers import LLMCassetteMissException
+from app.models.performance_schema import PerformanceReview
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_cassette import LLMCassettes
+from benchmarks.fake_llm import OUTPUTS
+
+
+class _LLM:
+    """Stands in for a crewai.LLM whose answer depends on the prompt."""
+
+    model = "openai/gpt-4o-mini"
+    temperature = 0.0
+
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        self.calls += 1
+        if kwargs.get("response_model") is PerformanceReview:
+            return OUTPUTS["PerformanceReview"]
+        return f"answer to: {messages[-1]['content']}"
+
+
+def _messages(agent: str, text: str) -> list:
+    return [{"role": "system", "content": f"You are the {agent}."}, {"role": "user", "content": text}]
+
+
+def _cassettes(mode: str, directory) -> LLMCassettes:
+    return LLMCassettes(mode=mode, directory=str(directory), cache=LLMResponseCache(max_bytes=1 << 20, enabled=False))
+
+
+def test_recorded_review_replays_without_the_llm(tmp_path, correlation_id):
+    recorder, recorded = _cassettes("record", tmp_path), _LLM()
+    llm = recorder.wrap(recorded)
+    first = llm.call(_messages("librarian", "Extract the blueprint."))
+    review = llm.call(_messages("performance engineer", "Review it."), response_model=PerformanceReview)
+    recorder.finish(correlation_id, design_doc="# Design", output_format="json")
+
+    cassette = LLMCassettes.load(recorder.path_for(correlation_id))
+    assert (cassette["design_doc"], cassette["output_format"], len(cassette["calls"])) == ("# Design", "json", 2)
+
+    replayed = _LLM()
+    llm = _cassettes("replay", tmp_path).wrap(replayed)
+    assert llm.call(_messages("performance engineer", "Review it."), response_model=PerformanceReview) == review
+    assert llm.call(_messages("librarian", "Extract the blueprint.")) == first
+    assert replayed.calls == 0
+
+
+def test_unrecorded_prompt_gets_the_agents_next_response(tmp_path, correlation_id):
+    recorder = _cassettes("record", tmp_path)
+    llm = recorder.wrap(_LLM())
+    recorded = llm.call(_messages("librarian", "Extract the blueprint."))
+    recorder.finish(correlation_id)
+
+    llm = _cassettes("replay", tmp_path).wrap(_LLM())
+    assert llm.call(_messages("librarian", "Extract the edited blueprint.")) == recorded
+    with pytest.raises(LLMCassetteMissException):
+        llm.call(_messages("librarian", "Extract the blueprint."))
+
+
+def test_replay_without_a_cassette_fails(tmp_path, correlation_id):
+    llm = _cassettes("replay", tmp_path).wrap(_LLM())
+    with pytest.raises(LLMCassetteMissException, match="no cassette"):
+        llm.call(_messages("librarian", "Extract the blueprint."))
+
+
+def test_calls_outside_a_review_pass_through(tmp_path):
+    replayed = _LLM()
+    llm = _cassettes("replay", tmp_path).wrap(replayed)
+    assert llm.call(_messages("librarian", "Hello")) == "answer to: Hello"
+    assert replayed.calls == 1
@@ -0,0 +1,62 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.llm import LLMService
+from app.services.llm_http import LLMHttpPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def _counts():
+    return tuple(
+        REGISTRY.get_sample_value(name) or 0.0
+        for name in ("llm_http_requests_total", "llm_http_connections_opened_total", "llm_http_connect_seconds_count")
+    )
+
+
+def test_sync_requests_reuse_one_connection(server_url):
+    pool, before = LLMHttpPool(), _counts()
+    for _ in range(3):
+        assert pool.client.get(server_url).text == "ok"
+
+    requests, opened, connect_samples = (after - start for after, start in zip(_counts(), before))
+    assert (requests, opened, connect_samples) == (3, 1, 1)
+
+
+async def test_async_requests_reuse_one_connection(server_url):
+    pool, before = LLMHttpPool(), _counts()
+    try:
+        for _ in range(3):
+            assert (await pool.async_client.get(server_url)).text == "ok"
+    finally:
+        await pool.aclose()
+
+    requests, opened, _ = (after - start for after, start in zip(_counts(), before))
+    assert (requests, opened) == (3, 1)
+
+
+def test_openai_agents_use_the_shared_client():
+    llm = LLMService().create_llm({"model": "gpt-4o-mini", "temperature": 0.0})
+    assert llm.client._client is LLMService.http_pool.client
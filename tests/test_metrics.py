@@ -0,0 +1,46 @@
+import io
+import uuid
+
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.common.util import percentile
+from app.services.document_extractor import DocumentExtractor
+from app.services.review_store import get_review
+
+
+def test_metrics_endpoint_exposes_runtime_and_pipeline_series():
+    from main import app
+
+    response = TestClient(app).get("/api/v1/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for series in (
+        "review_sessions_active", "crew_workers", "crew_queue_depth", "warm_crews_idle",
+        "warm_crew_lease_hits_total", "llm_cache_hits_total", "crew_jobs_cancelled_total",
+        "llm_http_requests_total", "review_duration_seconds_bucket",
+    ):
+        assert f"\n{series}" in response.text, series
+
+
+async def test_extraction_time_is_recorded_per_file_type():
+    extractor = DocumentExtractor()
+    before = REGISTRY.get_sample_value("document_extraction_seconds_count", {"file_type": ".md"}) or 0
+
+    await extractor.extract(UploadFile(io.BytesIO(b"# Design"), filename="design.md"))
+
+    assert REGISTRY.get_sample_value("document_extraction_seconds_count", {"file_type": ".md"}) == before + 1
+
+
+def test_store_reads_are_timed():
+    before = REGISTRY.get_sample_value("review_store_query_seconds_count", {"mode": "read"}) or 0
+    get_review(f"test-{uuid.uuid4()}")
+    assert REGISTRY.get_sample_value("review_store_query_seconds_count", {"mode": "read"}) == before + 1
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile([], 95) == 0.0
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile(range(101), 95) == 95
@@ -0,0 +1,93 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.review_cache import ReviewCache
+
+_REPORT = {"executive_summary": "Cached verdict", "recommendations": []}
+
+
+@pytest.fixture
+def cache():
+    return ReviewCache(config_version="test", ttl_seconds=3600, max_entries=10)
+
+
+@pytest.fixture
+def client():
+    from main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def crew_runs(monkeypatch):
+    """Replace the crew run with one that records the document and completes at once."""
+    from app.services.reviewer import reviewer_service
+
+    runs = []
+
+    def fake_run(**kwargs):
+        runs.append(kwargs["inputs"]["design_doc"])
+        dispatcher, session_id = kwargs["event_dispatcher"], kwargs["correlation_id"]
+        dispatcher.dispatch(session_id, {"status": "complete", "message": "fresh run"})
+        kwargs["on_finished"]()
+        dispatcher.close_session(session_id)
+
+    monkeypatch.setattr(reviewer_service, "run_crew_in_thread", fake_run)
+    return runs
+
+
+def _review(client, design_doc, **headers):
+    response = client.post("/api/v1/review", json={"design_doc": design_doc}, headers=headers)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_key_ignores_whitespace_but_not_format_or_config_version(cache):
+    key = cache.make_key("# Design\n\nUses  Redis.  \n", "markdown")
+
+    assert cache.make_key("# Design\nUses Redis.", "markdown") == key
+    assert cache.make_key("# Design\nUses Redis.", "json") != key
+    assert ReviewCache("other", 3600, 10).make_key("# Design\nUses Redis.", "markdown") != key
+
+
+async def test_put_then_get_round_trips(cache):
+    key = cache.make_key(f"doc {uuid.uuid4()}", "markdown")
+
+    assert await cache.aget(key) is None
+    cache.put(key, _REPORT)
+    assert await cache.aget(key) == _REPORT
+
+
+async def test_a_disabled_cache_never_stores(cache):
+    disabled = ReviewCache("test", 3600, 10, enabled=False)
+    key = disabled.make_key(f"doc {uuid.uuid4()}", "markdown")
+
+    disabled.put(key, _REPORT)
+    assert await disabled.aget(key) is None
+    assert await cache.aget(key) is None
+
+
+def test_cached_report_is_replayed_without_running_the_crew(client, crew_runs):
+    design_doc = f"Design {uuid.uuid4()}"
+    service = client.app.state.reviewer_facade.reviewer_service
+    service._review_cache.put(service._review_cache.make_key(design_doc, "markdown"), _REPORT)
+
+    events = _review(client, design_doc)
+
+    assert crew_runs == []
+    assert events[0]["report"] == _REPORT and events[0]["cached"] is True
+    assert events[-1]["status"] == "complete"
+
+
+def test_skip_cache_header_forces_a_fresh_run(client, crew_runs):
+    design_doc = f"Design {uuid.uuid4()}"
+    service = client.app.state.reviewer_facade.reviewer_service
+    service._review_cache.put(service._review_cache.make_key(design_doc, "markdown"), _REPORT)
+
+    events = _review(client, design_doc, **{"X-Skip-Cache": "true"})
+
+    assert crew_runs == [design_doc]
+    assert events == [{"status": "complete", "message": "fresh run"}]
@@ -0,0 +1,55 @@
+import threading
+import uuid
+
+from app.services import review_store
+from app.services.review_store import aget_review, asave_review, get_review, save_review
+
+
+def test_database_runs_in_wal_mode():
+    with review_store._db() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_each_thread_keeps_its_own_connection():
+    seen = []
+
+    def record():
+        seen.append(review_store._get_connection())
+        seen.append(review_store._get_connection())
+
+    worker = threading.Thread(target=record)
+    worker.start()
+    worker.join()
+
+    assert seen[0] is seen[1]
+    assert seen[0] is not review_store._get_connection()
+
+
+def test_concurrent_writers_all_land():
+    ids = [f"test-{uuid.uuid4()}" for _ in range(16)]
+    errors = []
+
+    def write(correlation_id):
+        try:
+            save_review(correlation_id, "doc", {"executive_summary": correlation_id})
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(cid,)) for cid in ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert all(get_review(cid)["final_report"]["executive_summary"] == cid for cid in ids)
+
+
+async def test_awaitable_round_trip():
+    correlation_id = f"test-{uuid.uuid4()}"
+
+    await asave_review(correlation_id, "doc", {"executive_summary": "ok"})
+    stored = await aget_review(correlation_id)
+
+    assert stored["final_report"] == {"executive_summary": "ok"}
+    assert await aget_review(f"test-{uuid.uuid4()}") is None
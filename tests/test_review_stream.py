@@ -0,0 +1,98 @@
+"""
+End-to-end reviews against the app served on a local port, with every LLM
+call answered by the fake LLM (see conftest.py).
+"""
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+
+from benchmarks.fake_llm import OUTPUTS
+from benchmarks.load_test import _DOC, _free_port, _serve
+
+# Over reviewer.chunk_chars (50k), so the blueprint is extracted in two parts.
+_LONG_DOC = _DOC + "".join(
+    f"\n## Component {index} (revision {{revision}})\n" + "The order service writes rows to PostgreSQL and emits Kafka events. " * 60
+    for index in range(14)
+)
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    port = _free_port()
+    server = _serve(port)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+
+
+async def _review(base_url: str, design_doc: str) -> list:
+    headers = {"X-Correlation-ID": str(uuid.uuid4())}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async with client.stream("POST", "/api/v1/review", json={"design_doc": design_doc}, headers=headers) as response:
+            assert response.status_code == 200
+            return [json.loads(line) async for line in response.aiter_lines() if line.strip()]
+
+
+def _types(events: list) -> list:
+    return [event.get("message_type") for event in events]
+
+
+async def test_each_agent_streams_its_partials_before_its_result(base_url):
+    events = await _review(base_url, _DOC.format(revision=uuid.uuid4()))
+
+    results = {e["agent"]: (i, e["report"]) for i, e in enumerate(events) if e.get("message_type") == "result"}
+    assert len(results) == 4
+    partials = [(i, e) for i, e in enumerate(events) if e.get("message_type") == "result_partial"]
+    assert partials
+    for index, event in partials:
+        result_index, report = results[event["agent"]]
+        assert index < result_index
+        assert report[event["report"]["field"]][event["report"]["index"]] == event["report"]["item"]
+    assert events[-1]["status"] == "complete"
+
+
+async def test_concurrent_duplicates_share_one_run(base_url, fake_llm):
+    design_doc = _DOC.format(revision=uuid.uuid4())
+    calls_before = sum(fake_llm.calls.values())
+
+    first, second = await asyncio.gather(_review(base_url, design_doc), _review(base_url, design_doc))
+
+    assert sum(fake_llm.calls.values()) - calls_before == 4
+    for events in (first, second):
+        assert _types(events).count("result") == 4
+        assert events[-1]["status"] == "complete"
+
+
+async def test_a_chunked_review_streams_every_part(base_url, fake_llm):
+    calls_before = fake_llm.calls["DocBlueprint"]
+    events = await _review(base_url, _LONG_DOC.format(revision=uuid.uuid4()))
+
+    assert fake_llm.calls["DocBlueprint"] - calls_before == 2
+    librarian = next(e["agent"] for e in events if e.get("message_type") == "thinking")
+    streamed = "".join(e["message"] for e in events if e.get("agent") == librarian and e.get("message_type") == "token")
+    assert len(streamed) == 2 * len(OUTPUTS["DocBlueprint"].model_dump_json())
+    assert events[-1]["status"] == "complete"
+
+
+def _split_into_streams(texts: list, expected: str, streams: int) -> bool:
+    """Whether *texts*, in order, are *streams* interleaved copies of *expected*, each text inside one copy."""
+    states = {(0,) * streams}
+    for text in texts:
+        states = {
+            tuple(sorted(state[:i] + (position + len(text),) + state[i + 1:]))
+            for state in states
+            for i, position in enumerate(state)
+            if expected.startswith(text, position)
+        }
+    return tuple([len(expected)] * streams) in states
+
+
+async def test_parallel_parts_are_streamed_without_mixing_their_tokens(base_url):
+    events = await _review(base_url, _LONG_DOC.format(revision=uuid.uuid4()))
+
+    librarian = next(e["agent"] for e in events if e.get("message_type") == "thinking")
+    tokens = [e["message"] for e in events if e.get("agent") == librarian and e.get("message_type") == "token"]
+    assert len(tokens) > 2
+    assert _split_into_streams(tokens, OUTPUTS["DocBlueprint"].model_dump_json(), streams=2)
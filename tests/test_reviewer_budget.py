@@ -0,0 +1,58 @@
+import pytest
+
+from app.common.exception_handlers import ReviewBudgetExceededException
+from app.services.reviewer.reviewer_budget import ReviewBudget, count_tokens
+from app.services.reviewer.reviewer_chunking import CHUNK_PROMPT
+from app.services.reviewer.reviewer_crew import DesignReviewerCrew
+
+_DOC = "## Overview\n\nAn order service on Kubernetes backed by PostgreSQL and Kafka.\n\n"
+
+
+def _budget(chunk_chars=50_000, warn_cost_usd=10.0, max_cost_usd=100.0) -> ReviewBudget:
+    return ReviewBudget(
+        crew_factory=lambda: DesignReviewerCrew().crew(),
+        chunk_prompt=DesignReviewerCrew().tasks_config[CHUNK_PROMPT]["description"],
+        chunk_chars=chunk_chars,
+        completion_tokens_per_call=2000,
+        warn_cost_usd=warn_cost_usd,
+        max_cost_usd=max_cost_usd,
+    )
+
+
+def test_count_tokens_falls_back_for_unknown_models():
+    assert count_tokens("hello world", "openai/gpt-4o-mini") == 2
+    assert count_tokens("hello world", "acme/unknown-model") == 2
+
+
+def test_short_document_takes_the_single_route():
+    estimate = _budget().estimate(_DOC, "json")
+
+    assert estimate.route == "single"
+    assert len(estimate.tasks) == 4 and estimate.prompt_tokens > 0
+    assert estimate.cost_usd is not None and estimate.warning is None
+    assert "route=single; parts=1" in estimate.header_value()
+
+
+def test_long_document_is_chunked():
+    estimate = _budget(chunk_chars=500).estimate(_DOC * 30, "json")
+
+    assert estimate.route == "chunked"
+    assert len(estimate.parts) > 1
+    assert estimate.tasks[0].calls == len(estimate.parts)
+
+
+def test_warns_between_the_two_limits():
+    budget = _budget(warn_cost_usd=0.0)
+    estimate = budget.estimate(_DOC, "json")
+
+    assert estimate.warning.startswith("This review is estimated to cost $")
+    budget.check(estimate)
+
+
+def test_rejects_above_the_cost_limit():
+    budget = _budget(warn_cost_usd=0.0, max_cost_usd=0.0)
+    estimate = budget.estimate(_DOC, "json")
+
+    with pytest.raises(ReviewBudgetExceededException, match="above the limit") as rejected:
+        budget.check(estimate)
+    assert rejected.value.estimate == estimate.header_value()
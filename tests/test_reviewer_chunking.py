@@ -0,0 +1,148 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from crewai import Agent
+from crewai.llms.base_llm import BaseLLM
+
+from app.models.blueprint_schema import DocBlueprint
+from app.services.reviewer.reviewer_chunking import chunked_blueprint, merge_blueprints, split_document
+
+
+class _ScriptedLLM(BaseLLM):
+    """Answers each part's calls from a script keyed by the part's text."""
+
+    def __init__(self, script):
+        super().__init__(model="scripted")
+        self.script = {part: list(responses) for part, responses in script.items()}
+        self.calls = []
+        self.callers = []
+        self._lock = threading.Lock()
+
+    def call(self, messages, *args, **kwargs):
+        part = messages[-1]["content"]
+        with self._lock:
+            self.calls.append(part)
+            self.callers.append((kwargs.get("from_task"), kwargs.get("from_agent")))
+            return self.script[part].pop(0)
+
+
+def _resolve(script):
+    llm = _ScriptedLLM(script)
+    agent = Agent(role="Librarian", goal="Extract blueprints", backstory="Reads documents", llm=llm)
+    resolver = chunked_blueprint(list(script), "{chunk}", max_workers=2)
+    return resolver(SimpleNamespace(agent=agent, description="extract")), llm
+
+
+def _doc(sections: int, paragraph: str = "The service keeps order state in PostgreSQL. " * 5) -> str:
+    return "".join(f"## Section {index}\n\n{paragraph}\n\n" for index in range(sections))
+
+
+def _blueprint(style="Microservices", valid=True, components=(), interactions=(), errors=()) -> DocBlueprint:
+    return DocBlueprint.model_validate({
+        "is_valid": valid,
+        "validation_errors": list(errors),
+        "system_identity": {"name": "Shop", "primary_style": style, "deployment_target": "Kubernetes"},
+        "component_registry": [
+            {"name": name, "type": "Service", "technology": technology, "hosting": "Kubernetes", "statefulness": "Stateless"}
+            for name, technology in components
+        ],
+        "interaction_map": [
+            {"source": source, "destination": destination, "protocol": protocol,
+             "data_exchanged": "orders", "nature": "Synchronous"}
+            for source, destination, protocol in interactions
+        ],
+        "technical_constraints": {},
+        "omission": {},
+    })
+
+
+def test_split_keeps_every_character_within_the_limit():
+    doc = _doc(12)
+    parts = split_document(doc, max_chars=800)
+
+    assert len(parts) > 1
+    assert all(len(part) <= 800 for part in parts)
+    assert "".join(parts) == doc
+
+
+def test_split_cuts_at_headings():
+    parts = split_document(_doc(12), max_chars=800)
+    assert all(part.startswith("## Section") for part in parts)
+
+
+def test_short_document_is_one_part():
+    doc = _doc(2)
+    assert split_document(doc, max_chars=len(doc)) == [doc]
+
+
+def test_oversized_section_is_cut_to_the_limit():
+    doc = "## Everything\n\n" + "word " * 2000
+    parts = split_document(doc, max_chars=500)
+    assert len(parts) > 1 and all(len(part) <= 500 for part in parts)
+
+
+def test_merge_matches_components_and_fills_unknown_details():
+    merged = merge_blueprints([
+        _blueprint(components=[("Order DB", "unknown")], interactions=[("API", "Orders", "unknown")]),
+        _blueprint(components=[("order  db", "PostgreSQL"), ("Cache", "Redis")],
+                   interactions=[("API", "Orders", "HTTP")]),
+    ])
+
+    assert [(c.name, c.technology) for c in merged.component_registry] == [
+        ("Order DB", "PostgreSQL"), ("Cache", "Redis"),
+    ]
+    assert [i.protocol for i in merged.interaction_map] == ["HTTP"]
+
+
+def test_merge_takes_the_majority_style_and_any_valid_part():
+    merged = merge_blueprints([
+        _blueprint(style="Monolith", valid=False, errors=["No diagram"]),
+        _blueprint(style="Microservices"),
+        _blueprint(style="Microservices", valid=False, errors=["No diagram"]),
+    ])
+
+    assert merged.system_identity.primary_style == "Microservices"
+    assert merged.is_valid and merged.validation_errors == []
+
+
+def test_merge_of_invalid_parts_keeps_their_errors_once():
+    merged = merge_blueprints([
+        _blueprint(valid=False, errors=["No diagram"]),
+        _blueprint(valid=False, errors=["no  diagram", "No goals"]),
+    ])
+    assert not merged.is_valid
+    assert merged.validation_errors == ["No diagram", "No goals"]
+
+
+def test_a_part_that_does_not_parse_is_asked_again_then_skipped():
+    first = _blueprint(components=[("orders", "Go")]).model_dump_json()
+    retried = _blueprint(components=[("billing", "Java")]).model_dump_json()
+
+    result, llm = _resolve({
+        "part one": [first],
+        "part two": ["Sorry, I cannot help.", retried],
+        "part three": ["not json", "still not json"],
+    })
+
+    assert sorted(llm.calls) == sorted(["part one", "part two", "part two", "part three", "part three"])
+    names = [component["name"] for component in result["output"]["component_registry"]]
+    assert names == ["orders", "billing"]
+    assert DocBlueprint.model_validate_json(result["raw"]).model_dump() == result["output"]
+
+
+def test_no_parseable_part_fails_the_review():
+    with pytest.raises(ValueError, match="No blueprint could be extracted from any of the 1 document parts"):
+        _resolve({"only part": ["nope", "nope"]})
+
+
+def test_part_calls_name_the_task_and_its_agent():
+    # LLM events carry the agent role and task ID only when the call names them.
+    blueprint = _blueprint().model_dump_json()
+    llm = _ScriptedLLM({"part one": [blueprint], "part two": [blueprint]})
+    agent = Agent(role="Librarian", goal="Extract blueprints", backstory="Reads documents", llm=llm)
+    task = SimpleNamespace(agent=agent, description="extract")
+
+    chunked_blueprint(list(llm.script), "{chunk}", max_workers=2)(task)
+
+    assert llm.callers == [(task, agent)] * 2
@@ -0,0 +1,98 @@
+import threading
+
+from crewai.events import LLMCallCompletedEvent, crewai_event_bus
+
+from app.services.reviewer.reviewer_event_listeners import _streaming_thread, _TaskCompletions, _TokenBatcher
+
+
+def test_first_chunk_goes_out_and_the_rest_waits_for_the_interval():
+    batcher = _TokenBatcher(flush_seconds=60)
+
+    assert batcher.add("review-1", "Architect", "Hel") == "Hel"
+    assert batcher.add("review-1", "Architect", "lo") is None
+    assert batcher.add("review-1", "Architect", " world") is None
+
+    assert batcher.drain("review-1", "Architect", threading.get_ident()) == "lo world"
+    assert batcher.drain("review-1", "Architect", threading.get_ident()) is None
+
+
+def test_chunks_are_flushed_every_time_with_a_zero_interval():
+    batcher = _TokenBatcher(flush_seconds=0)
+
+    assert [batcher.add("review-1", "Architect", c) for c in "abc"] == ["a", "b", "c"]
+    assert batcher.drain("review-1", "Architect", threading.get_ident()) is None
+
+
+def test_parallel_calls_of_one_agent_are_buffered_and_drained_apart():
+    batcher = _TokenBatcher(flush_seconds=60)
+    batcher.add("review-1", "Architect", "first")
+    other_thread = []
+
+    def other_call():
+        other_thread.append(threading.get_ident())
+        batcher.add("review-1", "Architect", "A")
+        batcher.add("review-1", "Architect", "B")
+
+    thread = threading.Thread(target=other_call)
+    thread.start()
+    thread.join()
+    batcher.add("review-1", "Architect", "1")
+    batcher.add("review-1", "Architect", "2")
+
+    assert batcher.drain("review-1", "Architect", threading.get_ident()) == "12"
+    assert batcher.drain("review-1", "Architect", other_thread[0]) == "B"
+
+
+def test_reviews_and_agents_are_buffered_apart():
+    batcher = _TokenBatcher(flush_seconds=60)
+    for review, agent in [("review-1", "Architect"), ("review-1", "Security"), ("review-2", "Architect")]:
+        batcher.add(review, agent, "x")
+        batcher.add(review, agent, review + agent)
+
+    assert batcher.drain("review-1", "Security", threading.get_ident()) == "review-1Security"
+    assert batcher.drain("review-2", "Architect", threading.get_ident()) == "review-2Architect"
+
+
+def test_a_flush_waits_for_the_task_completions_still_being_handled():
+    completions = _TaskCompletions()
+    completions.track("review-1")
+    completions.handled("review-1")
+
+    handler = threading.Timer(0.05, completions.handled, args=("review-1",))
+    handler.start()
+    assert completions.wait("review-1", 2, timeout=5)
+    assert not completions.wait("review-1", 3, timeout=0.01)
+
+
+def test_completions_of_untracked_reviews_are_not_counted():
+    completions = _TaskCompletions()
+    completions.handled("review-1")
+    completions.track("review-1")
+    assert not completions.wait("review-1", 1, timeout=0.01)
+
+    completions.untrack("review-1")
+    completions.handled("review-1")
+    assert completions.wait("review-1", 1, timeout=0)
+
+
+def test_call_completion_handlers_see_the_thread_that_streamed():
+    seen = []
+    calling_threads = []
+
+    def llm_call():
+        calling_threads.append(threading.get_ident())
+        _streaming_thread.set(threading.get_ident())  # as the chunk handler does
+        crewai_event_bus.emit(None, LLMCallCompletedEvent(response="done", call_type="llm_call", model="m")).result()
+
+    with crewai_event_bus.scoped_handlers():
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_completed(source, event):
+            seen.append(_streaming_thread.get())
+
+        threads = [threading.Thread(target=llm_call) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(seen) == sorted(calling_threads)
@@ -0,0 +1,60 @@
+import copy
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.blueprint_schema import DocBlueprint
+from app.services.reviewer.reviewer_incremental import (
+    BLUEPRINT_TASK, SPECIALIST_IGNORED_FIELDS, changed_blueprint_fields, diff_documents, reuse_if_unaffected,
+)
+
+_PREVIOUS_DOC = "# Orders\n\nThe api talks to Postgres.\n\n## Security\nTLS everywhere.\n"
+
+
+def _task(name, blueprint):
+    upstream = SimpleNamespace(name=BLUEPRINT_TASK, output=SimpleNamespace(pydantic=DocBlueprint.model_validate(blueprint)))
+    return SimpleNamespace(name=name, context=[upstream])
+
+
+def _edited(blueprint, constraint, value):
+    edited = copy.deepcopy(blueprint)
+    edited["technical_constraints"][constraint] = [value]
+    return edited
+
+
+def test_whitespace_only_edits_produce_an_empty_diff():
+    assert diff_documents(_PREVIOUS_DOC, _PREVIOUS_DOC.replace("\n\n", "\n").replace("api ", "api   ")) == ("", 0.0)
+
+
+def test_diff_lists_changed_lines_and_their_share():
+    diff, ratio = diff_documents(_PREVIOUS_DOC, _PREVIOUS_DOC.replace("TLS everywhere.", "mTLS between services."))
+
+    assert "-TLS everywhere." in diff and "+mTLS between services." in diff
+    assert 0 < ratio < 0.5
+
+
+def test_nested_blueprint_fields_are_compared_one_by_one(stored_blueprint):
+    previous = stored_blueprint["output"]
+    current = _edited(previous, "security_requirements", "mTLS")
+    current["component_registry"] = []
+
+    assert changed_blueprint_fields(previous, current) == {
+        "component_registry", "technical_constraints.security_requirements",
+    }
+
+
+@pytest.mark.parametrize("constraint, performance_reused, security_reused", [
+    ("security_requirements", True, False),
+    ("traffic_expectations", False, True),
+])
+def test_a_specialist_review_is_reused_only_when_its_fields_are_unchanged(
+    stored_blueprint, constraint, performance_reused, security_reused,
+):
+    previous = DocBlueprint.model_validate(stored_blueprint["output"]).model_dump()
+    current = _edited(previous, constraint, "changed")
+    stored = {"raw": "{}", "output": {}}
+
+    for name, reused in (("performance_review_task", performance_reused), ("security_review_task", security_reused)):
+        resolve = reuse_if_unaffected(previous, stored, SPECIALIST_IGNORED_FIELDS[name])
+        assert (resolve(_task(name, current)) is stored) is reused
+        assert resolve(_task(name, previous)) is stored
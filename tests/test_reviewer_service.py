@@ -0,0 +1,151 @@
+import threading
+import uuid
+
+import pytest
+
+from app.common.crew_pool import CrewWorkerPool
+from app.common.event_dispatcher import EventDispatcher
+from app.common.exception_handlers import CrewPoolFullException
+from app.common.warm_crew_pool import WarmCrewPool
+from app.models.api_schema import ReviewRequest
+from app.services.reviewer import reviewer_service
+from app.services.reviewer.reviewer_service import ReviewerService
+
+
+@pytest.fixture
+def started_runs(monkeypatch):
+    """Record crew runs without executing them; the test finishes them by hand."""
+    runs = []
+    monkeypatch.setattr(reviewer_service, "run_crew_in_thread", lambda **kwargs: runs.append(kwargs))
+    return runs
+
+
+@pytest.fixture
+def service():
+    return ReviewerService(EventDispatcher(), CrewWorkerPool(max_workers=1, max_queue_depth=1), WarmCrewPool(None, size=0))
+
+
+@pytest.fixture
+def full_pool(service):
+    """Occupy the service's only worker and queue slot until the test ends."""
+    release = threading.Event()
+    service._crew_pool.submit(lambda: release.wait(5))
+    service._crew_pool.submit(lambda: release.wait(5))
+    yield service._crew_pool
+    release.set()
+
+
+def _request(design_doc: str) -> ReviewRequest:
+    return ReviewRequest(design_doc=design_doc, correlation_id=f"test-{uuid.uuid4()}")
+
+
+def _finish(run, event):
+    dispatcher, session_id = run["event_dispatcher"], run["correlation_id"]
+    dispatcher.dispatch(session_id, event)
+    run["on_finished"]()
+    dispatcher.close_session(session_id)
+
+
+async def test_identical_submissions_share_one_run(service, started_runs, make_bridge):
+    design_doc = f"# Design {uuid.uuid4()}\nUses Redis."
+    first, duplicate = make_bridge(), make_bridge()
+
+    job_id = await service.run_crew_job(_request(design_doc), first, use_cache=False)
+    assert await service.run_crew_job(_request(design_doc + "\n\n"), duplicate) == job_id
+    assert len(started_runs) == 1
+
+    _finish(started_runs[0], {"status": "complete"})
+    assert first.events == duplicate.events == [{"status": "complete"}]
+    assert first.closed.is_set() and duplicate.closed.is_set()
+
+
+async def test_a_retry_with_the_same_correlation_id_rejoins_the_run(service, started_runs, make_bridge):
+    request = _request(f"Design {uuid.uuid4()}")
+    first, retry = make_bridge(), make_bridge()
+
+    await service.run_crew_job(request, first, use_cache=False)
+    started_runs[0]["event_dispatcher"].dispatch(request.correlation_id, "thinking")
+    assert await service.run_crew_job(request, retry) == request.correlation_id
+
+    _finish(started_runs[0], {"status": "complete"})
+    assert len(started_runs) == 1
+    assert retry.events == ["thinking", {"status": "complete"}]
+
+
+async def test_a_finished_run_is_not_joined(service, started_runs, make_bridge):
+    design_doc = f"Design {uuid.uuid4()}"
+
+    await service.run_crew_job(_request(design_doc), make_bridge(), use_cache=False)
+    _finish(started_runs[0], {"status": "error"})
+    await service.run_crew_job(_request(design_doc), make_bridge())
+
+    assert len(started_runs) == 2
+
+
+async def test_the_run_is_cancelled_when_its_last_client_leaves(service, started_runs, make_bridge):
+    request = _request(f"Design {uuid.uuid4()}")
+    first, duplicate = make_bridge(), make_bridge()
+    job_id = await service.run_crew_job(request, first, use_cache=False)
+    await service.run_crew_job(_request(request.design_doc), duplicate)
+    cancel_token = started_runs[0]["cancel_token"]
+
+    service.leave_job(job_id, first)
+    assert not cancel_token.cancelled
+
+    service.leave_job(job_id, duplicate)
+    assert cancel_token.cancelled
+    await service.run_crew_job(_request(request.design_doc), make_bridge())
+    assert len(started_runs) == 2
+
+
+async def test_a_new_run_reuses_the_stored_blueprint(service, started_runs, stored_blueprint, make_bridge):
+    design_doc = f"Design {uuid.uuid4()}"
+    service._review_cache.put_task_output(
+        service._review_cache.make_doc_key(design_doc), "extract_blueprint_task",
+        stored_blueprint["raw"], stored_blueprint["output"],
+    )
+
+    await service.run_crew_job(_request(design_doc), make_bridge())
+    _finish(started_runs[0], {"status": "complete"})
+    await service.run_crew_job(_request(design_doc), make_bridge(), use_cache=False)
+
+    assert started_runs[0]["reused_outputs"] == {"extract_blueprint_task": stored_blueprint}
+    assert started_runs[1]["reused_outputs"] == {}
+
+
+async def test_a_new_run_is_rejected_while_the_pool_is_full(service, started_runs, full_pool, make_bridge):
+    request = _request(f"Design {uuid.uuid4()}")
+
+    with pytest.raises(CrewPoolFullException):
+        await service.run_crew_job(request, make_bridge(), use_cache=False)
+    assert not started_runs
+    assert not service._event_dispatcher.has_session(request.correlation_id)
+
+
+async def test_a_cached_report_is_served_while_the_pool_is_full(service, started_runs, full_pool, make_bridge):
+    request = _request(f"Design {uuid.uuid4()}")
+    service._review_cache.put(
+        service._review_cache.make_key(request.design_doc, request.output_format),
+        {"executive_summary": "Cached verdict", "recommendations": []},
+    )
+    stream = make_bridge()
+
+    await service.run_crew_job(request, stream)
+
+    assert not started_runs
+    assert [event.status for event in stream.events] == ["executed", "complete"]
+    assert stream.closed.is_set()
+
+
+async def test_a_running_review_is_joined_while_the_pool_is_full(started_runs, make_bridge):
+    pool = CrewWorkerPool(max_workers=1, max_queue_depth=0)
+    service = ReviewerService(EventDispatcher(), pool, WarmCrewPool(None, size=0))
+    request = _request(f"Design {uuid.uuid4()}")
+    job_id = await service.run_crew_job(request, make_bridge(), use_cache=False)
+    release = threading.Event()
+    pool.submit(lambda: release.wait(5))
+    try:
+        assert await service.run_crew_job(_request(request.design_doc), make_bridge()) == job_id
+    finally:
+        release.set()
+    assert len(started_runs) == 1
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+from pydantic import BaseModel
+from starlette.requests import ClientDisconnect
+
+from app.common.streaming import (
+    ClosingStreamingResponse, StreamBridge, StreamSubscription, serialize_event, stream_queue,
+)
+
+
+class _Event(BaseModel):
+    status: str
+    message: str = ""
+
+
+async def _collect(bridge: StreamBridge) -> list:
+    return [chunk async for chunk in stream_queue(bridge)]
+
+
+async def test_events_from_a_worker_thread_arrive_in_order():
+    bridge = StreamBridge()
+
+    def worker():
+        for index in range(50):
+            bridge.put({"status": "executing", "index": index})
+        bridge.close()
+
+    threading.Thread(target=worker).start()
+    chunks = await asyncio.wait_for(_collect(bridge), timeout=5)
+
+    assert chunks == [serialize_event({"status": "executing", "index": index}) + "\n\n" for index in range(50)]
+
+
+async def test_stream_ends_on_a_terminal_status():
+    bridge = StreamBridge()
+    bridge.put(_Event(status="executing", message="thinking"))
+    bridge.put(_Event(status="complete"))
+    bridge.put(_Event(status="executing", message="never sent"))
+
+    chunks = await asyncio.wait_for(_collect(bridge), timeout=5)
+    assert chunks == ['{"status":"executing","message":"thinking"}\n\n', '{"status":"complete","message":""}\n\n']
+
+
+def test_put_after_the_loop_closed_is_dropped():
+    loop = asyncio.new_event_loop()
+    bridge = StreamBridge(loop)
+    loop.close()
+    bridge.put({"status": "executing"})
+
+
+def test_serialize_event():
+    assert serialize_event({"a": 1}) == '{"a": 1}'
+    assert serialize_event("text") == '{"data": "text"}'
+
+
+async def _chunks(*chunks: str):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_a_subscription_closes_once_when_its_chunks_end():
+    closed = []
+    subscription = StreamSubscription(_chunks("a", "b"), on_close=lambda: closed.append(True))
+
+    assert [chunk async for chunk in subscription] == ["a", "b"]
+    await subscription.aclose()
+    assert closed == [True]
+
+
+async def test_a_response_whose_client_left_before_the_first_chunk_closes_its_body():
+    closed = []
+    subscription = StreamSubscription(_chunks("never read"), on_close=lambda: closed.append(True))
+
+    async def send(message):
+        raise OSError("client disconnected")
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    with pytest.raises(ClientDisconnect):
+        await ClosingStreamingResponse(subscription)({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+    assert closed == [True]
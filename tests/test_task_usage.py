@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from crewai import LLM
+
+from app.services.review_store import get_task_usage
+from app.services.task_usage import TaskUsageTracker
+
+
+@pytest.fixture
+def tracker():
+    return TaskUsageTracker(retention_days=1)
+
+
+def _task(llm):
+    agent = SimpleNamespace(llm=llm, role="Performance Engineer", fingerprint=SimpleNamespace(metadata={}))
+    return SimpleNamespace(id=uuid.uuid4(), name="performance_review_task", agent=agent)
+
+
+def test_a_task_is_charged_the_growth_of_its_llm_counters(tracker):
+    cid = f"test-{uuid.uuid4()}"
+    llm = LLM(model="gpt-4o-mini")
+    llm._token_usage.update(prompt_tokens=500, completion_tokens=50, successful_requests=2)
+    task, started = _task(llm), datetime.now()
+
+    tracker.start(cid, task, started)
+    llm._token_usage.update(prompt_tokens=1700, completion_tokens=350, successful_requests=4)
+    tracker.failed_call(cid, str(task.id))
+    usage = tracker.finish(cid, task, started + timedelta(seconds=2))
+
+    assert (usage.status, usage.prompt_tokens, usage.completion_tokens, usage.llm_calls, usage.retries) == (
+        "completed", 1200, 300, 2, 1,
+    )
+    assert usage.wall_ms == 2000.0
+    assert usage.cost_usd > 0
+    assert [row["task_name"] for row in get_task_usage(cid)] == ["performance_review_task"]
+
+
+def test_a_task_that_never_started_is_recorded_as_reused(tracker):
+    cid = f"test-{uuid.uuid4()}"
+    llm = LLM(model="gpt-4o-mini")
+    llm._token_usage.update(prompt_tokens=900)
+
+    usage = tracker.finish(cid, _task(llm), datetime.now())
+
+    assert (usage.status, usage.prompt_tokens, usage.llm_calls, usage.wall_ms) == ("reused", 0, 0, 0.0)
+    assert get_task_usage(cid)[0]["status"] == "reused"
+
+
+def test_a_failed_task_keeps_its_usage(tracker):
+    cid = f"test-{uuid.uuid4()}"
+    llm = LLM(model="gpt-4o-mini")
+    task, started = _task(llm), datetime.now()
+
+    tracker.start(cid, task, started)
+    llm._token_usage["prompt_tokens"] += 100
+    usage = tracker.finish(cid, task, started, failed=True)
+
+    assert (usage.status, usage.prompt_tokens) == ("failed", 100)
+
+
+def test_an_llm_without_token_counters_is_recorded_as_zero_and_logged_once(tracker, caplog, monkeypatch):
+    from app.common import util
+
+    monkeypatch.setattr(util, "_token_usage_warning", util.threading.Event())
+    cid = f"test-{uuid.uuid4()}"
+    llm = LLM(model="gpt-4o-mini")
+    del llm._token_usage
+
+    for _ in range(2):
+        task = _task(llm)
+        tracker.start(cid, task, datetime.now())
+        usage = tracker.finish(cid, task, datetime.now())
+        assert (usage.status, usage.prompt_tokens, usage.llm_calls) == ("completed", 0, 0)
+    assert sum("no _token_usage dict" in record.message for record in caplog.records) == 1
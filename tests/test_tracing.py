@@ -0,0 +1,96 @@
+import json
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.common.tracing import ReviewTracer, review_tracer, trace_id_for
+
+
+@pytest.fixture
+def tracer():
+    return ReviewTracer(enabled=True, max_reviews=2)
+
+
+def _cid() -> str:
+    return str(uuid.uuid4())
+
+
+def test_nested_spans_form_one_timeline(tracer):
+    cid = _cid()
+    with tracer.span("crew_job", correlation_id=cid):
+        with tracer.span("persist", correlation_id=cid, rows=1):
+            pass
+
+    timeline = tracer.timeline(cid)
+    job, persist = timeline["spans"]
+    assert (job["name"], persist["name"]) == ("crew_job", "persist")
+    assert job["parent_id"] is None and persist["parent_id"] == job["span_id"]
+    assert persist["attributes"] == {"rows": 1}
+    assert timeline["trace_id"] == f"{uuid.UUID(cid).int:032x}"
+
+
+def test_spans_started_and_ended_on_different_calls(tracer):
+    cid = _cid()
+    tracer.start(("task", 1), "task", cid, agent="Librarian")
+    tracer.end(("task", 1), error="boom")
+    start_ns = time.time_ns()
+    tracer.record("queued", cid, start_ns, start_ns + 5_000_000)
+
+    spans = {span["name"]: span for span in tracer.timeline(cid)["spans"]}
+    assert (spans["task"]["status"], spans["task"]["error"]) == ("error", "boom")
+    assert spans["queued"]["duration_ms"] == 5.0
+
+
+def test_an_exception_marks_the_span_failed(tracer):
+    cid = _cid()
+    with pytest.raises(ValueError):
+        with tracer.span("extract", correlation_id=cid):
+            raise ValueError("bad pdf")
+
+    assert tracer.timeline(cid)["spans"][0]["status"] == "error"
+
+
+def test_only_the_most_recent_reviews_are_kept(tracer):
+    cids = [_cid() for _ in range(3)]
+    for cid in cids:
+        with tracer.span("crew_job", correlation_id=cid):
+            pass
+
+    assert tracer.timeline(cids[0]) is None
+    assert all(tracer.timeline(cid) for cid in cids[1:])
+
+
+def test_a_disabled_tracer_records_nothing():
+    tracer, cid = ReviewTracer(enabled=False, max_reviews=2), _cid()
+    with tracer.span("crew_job", correlation_id=cid):
+        pass
+    assert tracer.timeline(cid) is None
+
+
+def test_non_uuid_ids_get_a_stable_trace_id():
+    assert trace_id_for("review-1") == trace_id_for("review-1") != trace_id_for("review-2")
+
+
+def test_spans_are_exported_as_json_lines(tmp_path):
+    export_path, cid = tmp_path / "spans.jsonl", _cid()
+    tracer = ReviewTracer(enabled=True, max_reviews=2, export_path=str(export_path))
+    with tracer.span("crew_job", correlation_id=cid):
+        pass
+    tracer.shutdown()
+
+    assert json.loads(export_path.read_text().splitlines()[0])["name"] == "crew_job"
+
+
+def test_trace_endpoint_serves_the_timeline_or_404():
+    from main import app
+
+    client, cid = TestClient(app), _cid()
+    with review_tracer.span("crew_job", correlation_id=cid):
+        pass
+
+    assert client.get(f"/api/v1/traces/{cid}").json()["spans"][0]["name"] == "crew_job"
+    missing = client.get(f"/api/v1/traces/{_cid()}")
+    assert missing.status_code == 404
+    assert missing.json()["error_type"] == "REVIEW_TRACE_NOT_FOUND"
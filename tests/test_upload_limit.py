@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+
+_UPLOAD = "/api/v1/review/upload"
+
+
+@pytest.fixture
+def client():
+    from main import app
+
+    return TestClient(app)
+
+
+def _assert_rejected(response):
+    assert response.status_code == 413
+    assert response.json()["message"] == "File exceeds maximum size of 5MB"
+
+
+def test_declared_oversized_upload_is_rejected_before_reading(client):
+    files = {"file": ("design.txt", b"x" * (7 * 1024 * 1024), "text/plain")}
+    _assert_rejected(client.post(_UPLOAD, files=files))
+
+
+def test_chunked_upload_is_rejected_once_it_crosses_the_limit(client):
+    def body():
+        for _ in range(64):
+            yield b"x" * (256 * 1024)
+
+    response = client.post(_UPLOAD, content=body(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    _assert_rejected(response)
+
+
+def test_file_within_the_multipart_allowance_but_over_the_limit_is_rejected(client):
+    files = {"file": ("design.txt", b"x" * (5 * 1024 * 1024 + 900 * 1024), "text/plain")}
+    _assert_rejected(client.post(_UPLOAD, files=files))
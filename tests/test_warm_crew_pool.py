@@ -0,0 +1,41 @@
+import pytest
+
+from app.common.warm_crew_pool import WarmCrewPool
+from app.services.reviewer.reviewer_crew import DesignReviewerCrew
+
+
+@pytest.fixture(scope="module")
+def pool():
+    return WarmCrewPool(lambda: DesignReviewerCrew().crew(), size=1)
+
+
+def test_leases_prebuilt_crews_and_builds_on_a_miss(pool):
+    before = pool.stats()
+    first = pool.acquire()
+    second = pool.acquire()
+    try:
+        assert first is not second
+        stats = pool.stats()
+        assert (stats["hits"], stats["misses"], stats["leased"]) == (before["hits"] + 1, before["misses"] + 1, 2)
+    finally:
+        pool.release(first)
+        pool.release(second)
+    assert pool.stats()["idle"] == 2
+
+
+def test_a_returned_crew_carries_no_state_from_its_run(pool):
+    crew = pool.acquire()
+    for agent in crew.agents:
+        agent.fingerprint.metadata["correlation_id"] = "test-previous-run"
+        agent.llm._token_usage["total_tokens"] = 1234
+    for task in crew.tasks:
+        task.output = "previous output"
+    pool.release(crew)
+
+    crew = pool.acquire()
+    try:
+        assert all("correlation_id" not in agent.fingerprint.metadata for agent in crew.agents)
+        assert all(not any(agent.llm._token_usage.values()) for agent in crew.agents)
+        assert all(task.output is None for task in crew.tasks)
+    finally:
+        pool.release(crew)